@@ -7,24 +7,15 @@ Kept for backward compatibility.
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
-
-
-def detect_framework(path: str) -> Optional[str]:
-    """Detect which framework a given path belongs to.
+from backend.adapters.registry import registry
 
-    Returns the framework name as a string, or None.
-    """
-    from backend.adapters.registry import registry
-    return registry.detect_framework(path)
-
-
-def discover_experiments(base_dir: str) -> List[Tuple[str, str]]:
-    """Scan base_dir for all experiment directories / SQLite files.
+logger = logging.getLogger(__name__)
 
-    Returns list of (path, framework_name) tuples.
-    """
-    from backend.adapters.registry import registry
-    return registry.discover_experiments(base_dir)
+# Bound once at import so callers go straight to the registry methods
+# instead of re-running the import statement on every call.
+#
+# detect_framework(path) -> Optional[str]: framework name for a path, or None.
+# discover_experiments(base_dir) -> List[Tuple[str, str]]: (path, framework_name) pairs.
+detect_framework = registry.detect_framework
+discover_experiments = registry.discover_experiments
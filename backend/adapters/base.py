@@ -1,27 +1,136 @@
-"""Abstract base class for framework adapters."""
+"""Base class for framework adapters."""
 
 from __future__ import annotations
 
 import abc
-from typing import Any, Dict, List, Optional
+import base64
+import itertools
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from backend.config import STATUS_PAUSED_THRESHOLD, STATUS_RUNNING_THRESHOLD
 from backend.models.unified import (
     AnalyticsSummary,
     ConversationEntry,
+    ExperimentStatus,
     IslandState,
     LineageTree,
     MetricsSummary,
     MigrationEvent,
     UnifiedExperiment,
     UnifiedProgram,
+    UnifiedProgramSummary,
 )
 
 
-class FrameworkAdapter(abc.ABC):
-    """Read-only adapter that reads experiment data from a framework's storage."""
+# Process-wide source of adapter data versions, so a re-created adapter never
+# reuses a version its predecessor already handed out
+_versions = itertools.count(1)
+
+
+def infer_status(last_modified: float) -> ExperimentStatus:
+    """Experiment status from the time of its last modification (0: unknown)."""
+    if last_modified == 0:
+        return ExperimentStatus.UNKNOWN
+    age = time.time() - last_modified
+    if age < STATUS_RUNNING_THRESHOLD:
+        return ExperimentStatus.RUNNING
+    if age < STATUS_PAUSED_THRESHOLD:
+        return ExperimentStatus.PAUSED
+    return ExperimentStatus.COMPLETED
+
+
+def encode_cursor(*parts: Any) -> str:
+    """Opaque, URL-safe pagination cursor carrying JSON-serializable parts."""
+    raw = json.dumps(parts, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Parts of a cursor made by encode_cursor(); ValueError if it isn't one."""
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    parts = json.loads(raw)
+    if not isinstance(parts, list) or not parts:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return parts
+
+
+def _offset_page_after(
+    fetch: Callable[[int, int], Tuple[list, int]], after: Optional[str], page_size: int,
+) -> Tuple[list, Optional[str]]:
+    """Cursor paging on top of a page-numbered fetch(page, page_size).
+
+    The cursor is the offset reached so far. Pages of one size stay aligned,
+    so each call is a single fetch; after a size change it takes two.
+    """
+    offset = 0
+    if after:
+        parts = decode_cursor(after)
+        if len(parts) != 2 or parts[0] != "o" or not isinstance(parts[1], int) or parts[1] < 0:
+            raise ValueError(f"Invalid cursor: {after!r}")
+        offset = parts[1]
+    page, skip = divmod(offset, page_size)
+    items, total = fetch(page + 1, page_size)
+    items = items[skip:]
+    if skip and offset + len(items) < total:
+        more, total = fetch(page + 2, page_size)
+        items = items + more[: page_size - len(items)]
+    end = offset + len(items)
+    return items, (encode_cursor("o", end) if end < total else None)
+
+
+def _abstract_names(cls: type) -> frozenset:
+    """Names of methods on cls still marked with @abc.abstractmethod."""
+    return frozenset(
+        name for name in dir(cls)
+        if getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+    )
+
+
+class FrameworkAdapter:
+    """Read-only adapter that reads experiment data from a framework's storage.
+
+    This is a plain class rather than an ``abc.ABC``: ``isinstance`` checks
+    and construction skip ABCMeta. ``__init_subclass__`` records which
+    ``@abc.abstractmethod`` methods each subclass leaves unimplemented, and
+    ``__new__`` raises TypeError for a class that has any, as ABCMeta would.
+
+    Adapters are created per experiment and carry only a few fields, so the
+    built-in adapters declare ``__slots__``. Subclasses that don't declare
+    their own still get a regular ``__dict__``.
+    """
+
+    __slots__ = ("experiment_path", "_version")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._abstract_methods = _abstract_names(cls)
+
+    def __new__(cls, *args, **kwargs):
+        # FrameworkAdapter itself never passes through __init_subclass__
+        abstract = cls.__dict__.get("_abstract_methods")
+        if abstract is None:
+            abstract = _abstract_names(cls)
+        if abstract:
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} "
+                f"with abstract methods {', '.join(sorted(abstract))}"
+            )
+        return super().__new__(cls)
 
     def __init__(self, experiment_path: str):
         self.experiment_path = experiment_path
+        self._version = next(_versions)
+
+    @property
+    def version(self) -> int:
+        """Opaque data version; changes whenever bump_version() is called."""
+        return self._version
+
+    def bump_version(self) -> None:
+        """Mark the experiment's data as changed (called on change events)."""
+        self._version = next(_versions)
 
     @abc.abstractmethod
     def get_experiment_info(self) -> UnifiedExperiment:
@@ -40,17 +149,74 @@ class FrameworkAdapter(abc.ABC):
         score_min: Optional[float] = None,
         archive_only: bool = False,
         correct_only: bool = False,
-    ) -> tuple[List[UnifiedProgram], int]:
-        """Return paginated, filtered list of programs and total count."""
+    ) -> tuple[List[UnifiedProgramSummary], int]:
+        """Return paginated, filtered list of program summaries and total count.
+
+        Summaries leave out code, prompts and the other large fields, so
+        adapters need not load them for a page; get_program() has them.
+        """
+
+    def get_programs_after(
+        self,
+        after: Optional[str] = None,
+        page_size: int = 50,
+        sort_by: str = "generation",
+        sort_desc: bool = True,
+        island_id: Optional[int] = None,
+        generation_min: Optional[int] = None,
+        generation_max: Optional[int] = None,
+        score_min: Optional[float] = None,
+        archive_only: bool = False,
+        correct_only: bool = False,
+    ) -> tuple[List[UnifiedProgramSummary], Optional[str]]:
+        """Page of program summaries following cursor ``after``, and the next cursor.
+
+        ``after`` is None (or empty) for the first page; the returned cursor
+        is None on the last page. Cursors are opaque and only valid with the
+        same sort and filters; a malformed one raises ValueError. No total is
+        computed. The default pages through get_programs() by offset;
+        override in adapters that can resume from the last row's sort key.
+        """
+        def fetch(page: int, size: int):
+            return self.get_programs(
+                page=page, page_size=size, sort_by=sort_by, sort_desc=sort_desc,
+                island_id=island_id, generation_min=generation_min,
+                generation_max=generation_max, score_min=score_min,
+                archive_only=archive_only, correct_only=correct_only,
+            )
+        return _offset_page_after(fetch, after, page_size)
 
     @abc.abstractmethod
     def get_program(self, program_id: str) -> Optional[UnifiedProgram]:
         """Return a single program by ID."""
 
+    def get_programs_by_ids(self, program_ids: List[str]) -> List[UnifiedProgram]:
+        """Return the programs with the given IDs, in the order given.
+
+        Unknown IDs are skipped. Override in adapters that can fetch them in
+        one pass instead of one get_program() call each.
+        """
+        programs = []
+        for pid in program_ids:
+            prog = self.get_program(pid)
+            if prog is not None:
+                programs.append(prog)
+        return programs
+
     @abc.abstractmethod
     def get_all_programs_brief(self) -> List[Dict[str, Any]]:
         """Return minimal data for all programs (for genealogy/metrics)."""
 
+    def get_all_programs_columns(self) -> Dict[str, List[Any]]:
+        """get_all_programs_brief() as one list per field instead of one dict per program.
+
+        Override in adapters that can build the columns without the dicts.
+        """
+        briefs = self.get_all_programs_brief()
+        if not briefs:
+            return {}
+        return {key: [b[key] for b in briefs] for key in briefs[0]}
+
     @abc.abstractmethod
     def get_conversations(
         self,
@@ -61,6 +227,21 @@ class FrameworkAdapter(abc.ABC):
     ) -> tuple[List[ConversationEntry], int]:
         """Return paginated conversations."""
 
+    def get_conversations_after(
+        self,
+        after: Optional[str] = None,
+        page_size: int = 50,
+        improvements_only: bool = False,
+        island_id: Optional[int] = None,
+    ) -> tuple[List[ConversationEntry], Optional[str]]:
+        """Cursor-paged conversations; see get_programs_after()."""
+        def fetch(page: int, size: int):
+            return self.get_conversations(
+                page=page, page_size=size,
+                improvements_only=improvements_only, island_id=island_id,
+            )
+        return _offset_page_after(fetch, after, page_size)
+
     @abc.abstractmethod
     def get_metrics(self) -> MetricsSummary:
         """Return aggregated metrics."""
@@ -88,3 +269,22 @@ class FrameworkAdapter(abc.ABC):
     def get_embeddings(self, max_programs: int = 200) -> Dict[str, Any]:
         """Return embedding similarity data. Override in adapters that support it."""
         return {}
+
+    def get_meta_files(self) -> List[Dict[str, Any]]:
+        """List meta-summary files. Override in adapters that support it."""
+        return []
+
+    def get_meta_content(self, generation: int) -> Optional[str]:
+        """Return a meta-summary file's content. Override in adapters that support it."""
+        return None
+
+    def start_watching(self) -> bool:
+        """Invalidate caches from filesystem events instead of per-call stats.
+
+        Returns True if the adapter is now watching. Override in adapters that
+        support it; the default leaves change checks as they are.
+        """
+        return False
+
+    def stop_watching(self) -> None:
+        """Undo start_watching(), e.g. once the experiment is no longer discovered."""
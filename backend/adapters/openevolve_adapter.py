@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-import glob
+import hashlib
+import itertools
 import json
 import logging
 import math
 import os
+import pickle
+import re
 import statistics
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from backend.adapters.base import FrameworkAdapter
+from backend.adapters.base import FrameworkAdapter, infer_status
+from backend.config import LOAD_THREADS, PARSED_CACHE_DIR
 from backend.models.unified import (
     ConversationEntry,
     ExperimentStatus,
@@ -23,10 +30,234 @@ from backend.models.unified import (
     TimeSeriesPoint,
     UnifiedExperiment,
     UnifiedProgram,
+    UnifiedProgramSummary,
 )
 
 logger = logging.getLogger(__name__)
 
+# Optional orjson import — decodes large checkpoints several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional watchdog import — lets running adapters skip the per-call stat
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+
+def _json_loads(data):
+    """Decode JSON from str or bytes, preferring orjson when installed.
+
+    orjson rejects the NaN/Infinity literals that Python's json module writes
+    for non-finite metrics, so such documents fall back to json.loads.
+    Raises json.JSONDecodeError (which orjson's error subclasses) on bad input.
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _read_json(path: str):
+    # Read into bytes rather than mmap: a live run truncating or rewriting a
+    # mapped program file in place would SIGBUS the whole server, whereas a
+    # short read only fails to parse and the file is skipped
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def _read_jsonl(path: str, chunk_size: int = 1 << 20) -> List[Dict]:
+    """Decode a JSONL file read in large binary chunks; bad lines are skipped.
+
+    Lines are split on b"\n" without strip(): the decoders already ignore
+    surrounding whitespace, and blank lines are dropped as empty or failing.
+    """
+    records: List[Dict] = []
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            cut = chunk.rfind(b"\n")
+            if cut == -1:
+                tail += chunk
+                continue
+            lines = (tail + chunk[:cut]).split(b"\n") if tail else chunk[:cut].split(b"\n")
+            tail = chunk[cut + 1:]
+            for line in lines:
+                if line:
+                    try:
+                        records.append(_json_loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    if tail:
+        try:
+            records.append(_json_loads(tail))
+        except json.JSONDecodeError:
+            pass
+    return records
+
+
+def _read_program_file(fpath: str) -> Optional[Dict]:
+    try:
+        return _read_json(fpath)
+    except (json.JSONDecodeError, IOError):
+        logger.debug(f"Skipping corrupt program file: {fpath}")
+        return None
+
+
+# Bump when the shape of cached program dicts changes (e.g. new derived keys)
+_PARSED_CACHE_VERSION = 1
+
+
+def _parsed_cache_path(cp: str) -> Optional[str]:
+    if not PARSED_CACHE_DIR:
+        return None
+    digest = hashlib.sha1(os.path.abspath(cp).encode("utf-8")).hexdigest()
+    return os.path.join(PARSED_CACHE_DIR, f"oe_{digest}.pickle")
+
+
+def _private_to_us(st: os.stat_result) -> bool:
+    """True if st is owned by this process's user and not group/other writable.
+
+    Always False where there are no POSIX user ids (Windows), which leaves
+    the parsed cache disabled there.
+    """
+    geteuid = getattr(os, "geteuid", None)
+    return geteuid is not None and st.st_uid == geteuid() and not st.st_mode & 0o022
+
+
+def _load_parsed_cache(cp: str, stamp: Optional[int]) -> Optional[Tuple[Dict, Dict]]:
+    """Return (meta, programs) pickled for this checkpoint at the given metadata mtime."""
+    path = _parsed_cache_path(cp)
+    if path is None or stamp is None:
+        return None
+    try:
+        dir_st = os.stat(PARSED_CACHE_DIR)
+        with open(path, "rb") as f:
+            # Unpickling runs code from the file, so it and its directory
+            # must be ours and writable by nobody else
+            if not (_private_to_us(dir_st) and _private_to_us(os.fstat(f.fileno()))):
+                logger.warning(f"Ignoring parsed-checkpoint cache {path}: writable by other users")
+                return None
+            payload = pickle.load(f)
+        # Anything not shaped like a current entry is a miss, not an error
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != _PARSED_CACHE_VERSION
+            or payload.get("stamp") != stamp
+        ):
+            return None
+        meta, programs = payload["meta"], payload["programs"]
+        if not isinstance(meta, dict) or not isinstance(programs, dict):
+            return None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable parsed-checkpoint cache {path}: {e}")
+        return None
+    return meta, programs
+
+
+def _save_parsed_cache(cp: str, stamp: Optional[int], meta: Dict, programs: Dict):
+    path = _parsed_cache_path(cp)
+    if path is None or stamp is None:
+        return
+    payload = {
+        "version": _PARSED_CACHE_VERSION,
+        "stamp": stamp,
+        "meta": meta,
+        "programs": programs,
+    }
+    try:
+        # Owner-only: the files are unpickled on load, which runs code
+        os.makedirs(PARSED_CACHE_DIR, mode=0o700, exist_ok=True)
+        # makedirs leaves an existing directory's mode alone, and
+        # _load_parsed_cache would ignore anything written to an unsafe one
+        if not _private_to_us(os.stat(PARSED_CACHE_DIR)):
+            logger.debug(f"Not writing parsed-checkpoint cache to unsafe dir {PARSED_CACHE_DIR}")
+            return
+        # Write-then-rename so a concurrent reader never sees a partial file
+        fd, tmp = tempfile.mkstemp(dir=PARSED_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception as e:
+        logger.debug(f"Could not write parsed-checkpoint cache {path}: {e}")
+
+
+def _read_programs(programs_dir: str) -> Dict[str, Dict]:
+    """Decode every programs/*.json file, keyed by program id."""
+    programs: Dict[str, Dict] = {}
+    if not os.path.exists(programs_dir):
+        return programs
+    fnames = [f for f in os.listdir(programs_dir) if f.endswith(".json")]
+    paths = [os.path.join(programs_dir, f) for f in fnames]
+    # Reads are independent; fan them out, then merge in listing order
+    workers = min(LOAD_THREADS, len(paths))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(_read_program_file, paths))
+    else:
+        loaded = [_read_program_file(p) for p in paths]
+
+    for fname, prog in zip(fnames, loaded):
+        if prog is None:
+            continue
+        pid = prog.get("id", fname.replace(".json", ""))
+        # Score and sanitized metrics are read by nearly every
+        # query, so derive them once per load
+        metrics = prog.get("metrics") or {}
+        prog["_score"] = _safe_sum_metrics(metrics)
+        prog["_metrics"] = _sanitize_metrics(metrics)
+        programs[pid] = prog
+    return programs
+
+
+def _aggregate_by_generation(
+    scores: List[float], generations: List[int], islands: List[Optional[int]]
+) -> Tuple[Dict[int, float], Dict[int, float], Dict[int, int], Dict[int, Dict[int, float]]]:
+    """Per-generation best/sum/count and per-island per-generation best, in one pass.
+
+    Bests are floored at 0, as the dashboard has always reported them.
+    """
+    gen_best: Dict[int, float] = {}
+    gen_sum: Dict[int, float] = {}
+    gen_count: Dict[int, int] = {}
+    island_best: Dict[int, Dict[int, float]] = {}
+    for g, s, isl in zip(generations, scores, islands):
+        b = gen_best.get(g, 0)
+        gen_best[g] = s if s > b else b
+        gen_sum[g] = gen_sum.get(g, 0.0) + s
+        gen_count[g] = gen_count.get(g, 0) + 1
+        if isl is not None:
+            ib = island_best.get(isl)
+            if ib is None:
+                ib = island_best[isl] = {}
+            b = ib.get(g, 0)
+            ib[g] = s if s > b else b
+    return gen_best, gen_sum, gen_count, island_best
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 
 def _safe_json_float(v):
     """Return True if v is a finite number safe for JSON."""
@@ -44,20 +275,171 @@ def _safe_sum_metrics(metrics: Dict[str, Any]) -> float:
     return sum(vals) if vals else 0.0
 
 
+def _trace_to_entry(t: Dict) -> ConversationEntry:
+    """ConversationEntry for an evolution trace record loaded by _load_checkpoint."""
+    prompt_data = t.get("prompt", {}) or {}
+    return ConversationEntry(
+        program_id=t.get("child_id", ""),
+        parent_id=t.get("parent_id", ""),
+        iteration=t.get("iteration", 0),
+        generation=t.get("generation", 0),
+        island_id=t.get("island_id"),
+        timestamp=t.get("timestamp", 0.0),
+        system_prompt=prompt_data.get("system"),
+        user_prompt=prompt_data.get("user"),
+        llm_response=t.get("llm_response"),
+        score=t["_child_score"],
+        parent_score=t["_parent_score"],
+        improvement_delta=t["_delta"],
+        mutation_type=t.get("metadata", {}).get("mutation_type", "diff") if t.get("metadata") else "diff",
+        code_diff=t.get("code_diff"),
+    )
+
+
 def _sanitize_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
     return {k: (v if _safe_json_float(v) else None) for k, v in metrics.items()}
 
 
+# Identifier-like tokens indexed for code search (lowercased code)
+_TOKEN_RE = re.compile(r"[a-z_][a-z0-9_]{2,}")
+_IDENT_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_")
+
+
+def _code_lower(prog: Dict) -> str:
+    # Lowercased once per load, on first use, instead of on every query
+    code_lower = prog.get("_code_lower")
+    if code_lower is None:
+        code_lower = prog["_code_lower"] = (prog.get("code") or "").lower()
+    return code_lower
+
+
+def _complete_tokens(query_lower: str) -> List[str]:
+    """Tokens of the query that any matching code must contain whole.
+
+    A token touching either end of the query may continue in the code
+    ("pars" matches "parser"), so only tokens with a non-identifier
+    character on both sides qualify.
+    """
+    tokens = []
+    for m in _TOKEN_RE.finditer(query_lower):
+        start, end = m.span()
+        if start == 0 or end == len(query_lower):
+            continue
+        if query_lower[start - 1] in _IDENT_CHARS or query_lower[end] in _IDENT_CHARS:
+            continue
+        tokens.append(m.group())
+    return tokens
+
+
+def _build_search_index(programs: Dict[str, Dict]) -> Tuple[Dict[str, set], Dict[str, int]]:
+    postings: Dict[str, set] = {}
+    order: Dict[str, int] = {}
+    for i, (pid, prog) in enumerate(programs.items()):
+        order[pid] = i
+        for token in set(_TOKEN_RE.findall(_code_lower(prog))):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = {pid}
+            else:
+                ids.add(pid)
+    return postings, order
+
+
+class _Snapshot:
+    """Everything derived from one checkpoint load.
+
+    _load_checkpoint publishes a new snapshot with a single attribute store
+    and every reader takes one reference to it on entry, so a reload on
+    another thread can never pair rows from one load with columns or sort
+    keys from the next. The loaded fields are not reassigned after
+    construction; the views built on first use (columns, sort keys,
+    converted summaries, metrics, search index) live on the snapshot too,
+    so a late fill only ever lands in the load it was computed from.
+    """
+
+    __slots__ = (
+        "checkpoint_dir",
+        "stamp",
+        "metadata",
+        "programs",
+        "rows",
+        "children_index",
+        "archive_set",
+        "islands_meta",
+        "traces",
+        "trace_by_child",
+        "unified",
+        "columns",
+        "sort_columns",
+        "metrics",
+        "search_index",
+    )
+
+    def __init__(
+        self,
+        checkpoint_dir: Optional[str] = None,
+        stamp: Optional[int] = None,
+        metadata: Optional[Dict] = None,
+        programs: Optional[Dict[str, Dict]] = None,
+        children_index: Optional[Dict[str, List[str]]] = None,
+        traces: Optional[List[Dict]] = None,
+        trace_by_child: Optional[Dict[str, Dict]] = None,
+    ):
+        self.checkpoint_dir = checkpoint_dir
+        # metadata.json st_mtime_ns the snapshot was loaded from
+        self.stamp = stamp
+        self.metadata: Dict = metadata or {}
+        self.programs: Dict[str, Dict] = programs or {}
+        # Program dicts in load order; the columns, sort keys and converted
+        # summaries below are all indexed like it
+        self.rows: List[Dict] = list(self.programs.values())
+        # parent_id -> child program ids
+        self.children_index: Dict[str, List[str]] = children_index or {}
+        # metadata.json "archive" and "islands", materialized once per load
+        self.archive_set: FrozenSet[str] = frozenset(self.metadata.get("archive", []))
+        self.islands_meta: List[List[str]] = self.metadata.get("islands", [])
+        self.traces: List[Dict] = traces or []
+        # child_id -> first trace producing it
+        self.trace_by_child: Dict[str, Dict] = trace_by_child or {}
+        # Converted programs with children_count filled in; entries are
+        # converted the first time a get_programs() page includes them
+        self.unified: List[Optional[UnifiedProgramSummary]] = [None] * len(self.rows)
+        # (scores, generations, timestamps, islands) for aggregation, and
+        # get_programs() sort keys per sort_by, both built on first use
+        self.columns: Optional[Tuple[List[float], List[int], List[float], List[Optional[int]]]] = None
+        self.sort_columns: Dict[str, List[Any]] = {}
+        # get_metrics() result
+        self.metrics: Optional[MetricsSummary] = None
+        # (token -> program ids, id -> position), built on the first
+        # indexable search
+        self.search_index: Optional[Tuple[Dict[str, set], Dict[str, int]]] = None
+
+
 class OpenEvolveAdapter(FrameworkAdapter):
     """Reads OpenEvolve checkpoint directories."""
 
+    __slots__ = (
+        "_snapshot",
+        "_checkpoint_scan",
+        "_watching",
+        "_dirty",
+        "_load_lock",
+        "_watch",
+    )
+
     def __init__(self, experiment_path: str):
         super().__init__(experiment_path)
-        self._checkpoint_dir: Optional[str] = None
-        self._programs_cache: Optional[Dict[str, Dict]] = None
-        self._metadata_cache: Optional[Dict] = None
-        self._trace_cache: Optional[List[Dict]] = None
-        self._cache_mtime: float = 0
+        # Current load; replaced wholesale, never updated in place
+        self._snapshot: Optional[_Snapshot] = None
+        # Set by start_watching(); while watching, _ensure_cache only re-checks
+        # the checkpoint after a watchdog event has set _dirty
+        self._watching = False
+        self._dirty = True
+        self._load_lock = threading.Lock()
+        # (ObservedWatch, handler) registered by start_watching()
+        self._watch: Optional[Tuple[Any, Any]] = None
+        # (mtime_ns of the scanned dirs, latest checkpoint found there)
+        self._checkpoint_scan: Optional[Tuple[Tuple[Optional[int], ...], Optional[str]]] = None
 
     # ── internal helpers ────────────────────────────────────────────
 
@@ -67,57 +449,116 @@ class OpenEvolveAdapter(FrameworkAdapter):
         if os.path.basename(base).startswith("checkpoint_"):
             return base
 
-        pattern = os.path.join(base, "**", "checkpoint_*")
-        folders = glob.glob(pattern, recursive=True)
-        folders = [f for f in folders if os.path.isdir(f)]
-        if not folders:
-            return None
-        folders.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return folders[0]
-
-    def _ensure_cache(self):
+        # Checkpoints live directly under the experiment root or under its
+        # checkpoints/ dir (that is how discovery resolves roots), so only
+        # those two dirs are listed, and only again once one has changed
+        scan_dirs = (base, os.path.join(base, "checkpoints"))
+        stamp = tuple(_mtime_ns(d) for d in scan_dirs)
+        if self._checkpoint_scan is not None and self._checkpoint_scan[0] == stamp:
+            return self._checkpoint_scan[1]
+
+        latest: Optional[str] = None
+        latest_mtime = float("-inf")
+        for d, d_mtime in zip(scan_dirs, stamp):
+            if d_mtime is None:
+                continue
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.name.startswith("checkpoint_") and entry.is_dir():
+                            mtime = entry.stat().st_mtime
+                            if mtime > latest_mtime:
+                                latest, latest_mtime = entry.path, mtime
+            except OSError:
+                continue
+        self._checkpoint_scan = (stamp, latest)
+        return latest
+
+    def start_watching(self) -> bool:
+        if self._watching:
+            return True
+        observer = _shared_observer()
+        if observer is None:
+            return False
+        handler = _CheckpointEventHandler(self)
+        try:
+            with _observer_lock:
+                watch = observer.schedule(handler, self.experiment_path, recursive=True)
+                _watch_users[watch] = _watch_users.get(watch, 0) + 1
+        except Exception as e:
+            logger.warning(f"Failed to watch {self.experiment_path}: {e}")
+            return False
+        self._watch = (watch, handler)
+        self._watching = True
+        return True
+
+    def stop_watching(self) -> None:
+        if not self._watching:
+            return
+        watch, handler = self._watch
+        self._watch = None
+        self._watching = False
+        self._dirty = True
+        observer = _shared_observer()
+        with _observer_lock:
+            users = _watch_users.pop(watch, 1) - 1
+            try:
+                if users:
+                    _watch_users[watch] = users
+                    observer.remove_handler_for_watch(handler, watch)
+                else:
+                    observer.unschedule(watch)
+            except Exception as e:  # e.g. the emitter already gone with its dir
+                logger.debug(f"Failed to unwatch {self.experiment_path}: {e}")
+
+    def _ensure_cache(self) -> _Snapshot:
+        """The current snapshot, after reloading it if the checkpoint changed.
+
+        Callers use the returned snapshot for the whole call rather than
+        re-reading self._snapshot, which another thread may replace.
+        """
+        snap = self._snapshot
+        if self._watching and not self._dirty and snap is not None:
+            return snap
+        # Endpoints run adapter calls on a thread pool; one thread loads a
+        # changed checkpoint while the others wait for it instead of reloading
+        with self._load_lock:
+            return self._ensure_cache_locked()
+
+    def _ensure_cache_locked(self) -> _Snapshot:
+        snap = self._snapshot
+        if self._watching:
+            if not self._dirty and snap is not None:
+                return snap
+            # Cleared before the checks below so an event that arrives while
+            # loading marks the cache dirty again
+            self._dirty = False
         cp = self._find_latest_checkpoint()
+        # One stat serves both the staleness check and the parsed-cache stamp
+        stamp = _mtime_ns(os.path.join(cp, "metadata.json")) if cp is not None else None
+        if snap is not None and cp == snap.checkpoint_dir and stamp == snap.stamp:
+            return snap
         if cp is None:
-            self._programs_cache = {}
-            self._metadata_cache = {}
-            self._trace_cache = []
-            return
+            snap = self._snapshot = _Snapshot()
+            return snap
+        return self._load_checkpoint(cp, stamp)
 
-        meta_path = os.path.join(cp, "metadata.json")
-        mtime = os.path.getmtime(meta_path) if os.path.exists(meta_path) else 0
-        if mtime == self._cache_mtime and self._programs_cache is not None:
-            return
-
-        self._checkpoint_dir = cp
-        self._cache_mtime = mtime
-        self._load_checkpoint(cp)
-
-    def _load_checkpoint(self, cp: str):
+    def _load_checkpoint(self, cp: str, stamp: Optional[int]) -> _Snapshot:
         meta_path = os.path.join(cp, "metadata.json")
         programs_dir = os.path.join(cp, "programs")
 
-        meta: Dict[str, Any] = {}
-        if os.path.exists(meta_path):
-            try:
-                with open(meta_path) as f:
-                    meta = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                logger.warning(f"Failed to read metadata: {meta_path}")
-        self._metadata_cache = meta
-
-        programs: Dict[str, Dict] = {}
-        if os.path.exists(programs_dir):
-            for fname in os.listdir(programs_dir):
-                if not fname.endswith(".json"):
-                    continue
-                fpath = os.path.join(programs_dir, fname)
+        cached = _load_parsed_cache(cp, stamp)
+        if cached is not None:
+            meta, programs = cached
+        else:
+            meta: Dict[str, Any] = {}
+            if stamp is not None:
                 try:
-                    with open(fpath) as f:
-                        prog = json.load(f)
-                    pid = prog.get("id", fname.replace(".json", ""))
-                    programs[pid] = prog
+                    meta = _read_json(meta_path)
                 except (json.JSONDecodeError, IOError):
-                    logger.debug(f"Skipping corrupt program file: {fpath}")
+                    logger.warning(f"Failed to read metadata: {meta_path}")
+            programs = _read_programs(programs_dir)
+            _save_parsed_cache(cp, stamp, meta, programs)
 
         # Assign island info from metadata
         for island_idx, id_list in enumerate(meta.get("islands", [])):
@@ -125,57 +566,85 @@ class OpenEvolveAdapter(FrameworkAdapter):
                 if pid in programs:
                     programs[pid].setdefault("metadata", {})["island"] = island_idx
 
-        self._programs_cache = programs
+        children_index: Dict[str, List[str]] = {}
+        for pid, prog in programs.items():
+            parent = prog.get("parent_id")
+            if parent:
+                children_index.setdefault(parent, []).append(pid)
 
         # Load evolution trace
-        self._trace_cache = self._load_traces()
+        traces = self._load_traces(cp)
+        by_child: Dict[str, Dict] = {}
+        for t in traces:
+            t["_child_score"] = child_score = _safe_sum_metrics(t.get("child_metrics") or {})
+            t["_parent_score"] = parent_score = _safe_sum_metrics(t.get("parent_metrics") or {})
+            t["_delta"] = child_score - parent_score
+            by_child.setdefault(t.get("child_id"), t)
 
-    def _load_traces(self) -> List[Dict]:
+        snap = self._snapshot = _Snapshot(cp, stamp, meta, programs, children_index, traces, by_child)
+        return snap
+
+    def _load_traces(self, cp: str) -> List[Dict]:
         """Load evolution_trace.jsonl from various locations."""
         traces = []
         base = self.experiment_path
         candidates = [
             os.path.join(base, "evolution_trace.jsonl"),
             os.path.join(base, "traces", "evolution_trace.jsonl"),
+            os.path.join(os.path.dirname(os.path.dirname(cp)), "evolution_trace.jsonl"),
         ]
-        if self._checkpoint_dir:
-            candidates.append(os.path.join(
-                os.path.dirname(os.path.dirname(self._checkpoint_dir)),
-                "evolution_trace.jsonl",
-            ))
 
         for path in candidates:
             if os.path.exists(path):
                 try:
-                    with open(path) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    traces.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    continue
+                    traces = _read_jsonl(path)
                 except IOError:
                     continue
                 break
         return traces
 
-    def _prog_to_unified(self, prog: Dict, archive_set: set) -> UnifiedProgram:
-        metrics_raw = prog.get("metrics", {})
-        metrics = _sanitize_metrics(metrics_raw)
-        score = _safe_sum_metrics(metrics_raw)
+    def _summary_fields(self, prog: Dict, archive_set: FrozenSet[str]) -> Dict[str, Any]:
+        """UnifiedProgramSummary fields of a program dict; children_count is left 0."""
         meta = prog.get("metadata", {}) or {}
+        pid = prog.get("id", "")
+        return dict(
+            id=pid,
+            language=prog.get("language", "python"),
+            parent_id=prog.get("parent_id"),
+            generation=prog.get("generation", 0),
+            island_id=meta.get("island"),
+            timestamp=prog.get("timestamp", 0.0),
+            iteration_found=prog.get("iteration_found", 0),
+            score=prog["_score"],
+            metrics=prog["_metrics"],
+            correct=True,  # OpenEvolve doesn't track correctness separately
+            complexity=prog.get("complexity", 0.0),
+            diversity=prog.get("diversity", 0.0),
+            changes_description=prog.get("changes_description", ""),
+            embedding_2d=None,
+            children_count=0,  # computed by the caller
+            in_archive=pid in archive_set,
+            metadata=meta,
+        )
+
+    def _prog_to_unified_light(self, prog: Dict, archive_set: FrozenSet[str]) -> UnifiedProgram:
+        """UnifiedProgram for search results: prompts, llm_response and artifacts are left unset."""
+        return UnifiedProgram(
+            **self._summary_fields(prog, archive_set),
+            code=prog.get("code", ""),
+            code_diff=None,  # diffs are in traces
+        )
+
+    def _prog_to_unified(self, prog: Dict, archive_set: FrozenSet[str]) -> UnifiedProgram:
+        """Full UnifiedProgram for the detail view, with prompts and artifacts."""
+        unified = self._prog_to_unified_light(prog, archive_set)
 
         # Extract prompts
         prompts_raw = prog.get("prompts")
-        system_prompt = None
-        user_prompt = None
         llm_response = None
         if isinstance(prompts_raw, dict):
             for key, val in prompts_raw.items():
                 if isinstance(val, dict):
-                    system_prompt = system_prompt or val.get("system")
-                    user_prompt = user_prompt or val.get("user")
                     responses = val.get("responses", [])
                     if responses and isinstance(responses, list):
                         llm_response = llm_response or responses[0]
@@ -185,48 +654,80 @@ class OpenEvolveAdapter(FrameworkAdapter):
         arts_json = prog.get("artifacts_json")
         if arts_json:
             try:
-                artifacts = json.loads(arts_json) if isinstance(arts_json, str) else arts_json
+                artifacts = _json_loads(arts_json) if isinstance(arts_json, str) else arts_json
             except (json.JSONDecodeError, TypeError):
                 artifacts = {"raw": str(arts_json)}
 
-        pid = prog.get("id", "")
-        return UnifiedProgram(
-            id=pid,
-            code=prog.get("code", ""),
-            language=prog.get("language", "python"),
-            parent_id=prog.get("parent_id"),
-            generation=prog.get("generation", 0),
-            island_id=meta.get("island"),
-            timestamp=prog.get("timestamp", 0.0),
-            iteration_found=prog.get("iteration_found", 0),
-            score=score,
-            metrics=metrics,
-            correct=True,  # OpenEvolve doesn't track correctness separately
-            complexity=prog.get("complexity", 0.0),
-            diversity=prog.get("diversity", 0.0),
-            code_diff=None,  # diffs are in traces
-            changes_description=prog.get("changes_description", ""),
-            prompts=prompts_raw,
-            llm_response=llm_response,
-            artifacts=artifacts,
-            embedding_2d=None,
-            children_count=0,  # computed below
-            in_archive=pid in archive_set,
-            migration_history=[],
-            metadata=meta,
-        )
+        unified.prompts = prompts_raw
+        unified.llm_response = llm_response
+        unified.artifacts = artifacts
+        return unified
+
+    def _unified_rows(self, snap: _Snapshot, indices: List[int]) -> List[UnifiedProgramSummary]:
+        """UnifiedProgramSummary for each row index, converting each row at most once per load."""
+        cache = snap.unified
+        rows = snap.rows
+        archive_set = snap.archive_set
+        children = snap.children_index
+
+        out = []
+        for i in indices:
+            unified = cache[i]
+            if unified is None:
+                unified = UnifiedProgramSummary(**self._summary_fields(rows[i], archive_set))
+                unified.children_count = len(children.get(unified.id, ()))
+                cache[i] = unified
+            out.append(unified)
+        return out
+
+    def _program_columns(self, snap: _Snapshot) -> Tuple[List[float], List[int], List[float], List[Optional[int]]]:
+        """Scores, generations, timestamps and islands as parallel lists."""
+        columns = snap.columns
+        if columns is None:
+            rows = snap.rows
+            columns = snap.columns = (
+                [p["_score"] for p in rows],
+                [p.get("generation", 0) for p in rows],
+                [p.get("timestamp", 0) for p in rows],
+                [(p.get("metadata") or {}).get("island") for p in rows],
+            )
+        return columns
+
+    def _sort_column(self, snap: _Snapshot, sort_by: str) -> List[Any]:
+        """Sort key per row for get_programs(); unknown keys sort by generation."""
+        if sort_by not in ("score", "timestamp", "complexity", "island_id", "children_count"):
+            sort_by = "generation"
+        column = snap.sort_columns.get(sort_by)
+        if column is not None:
+            return column
+        scores, generations, timestamps, islands = self._program_columns(snap)
+        if sort_by == "score":
+            column = scores
+        elif sort_by == "timestamp":
+            column = timestamps
+        elif sort_by == "complexity":
+            column = [r.get("complexity", 0.0) for r in snap.rows]
+        elif sort_by == "island_id":
+            column = [isl or 0 for isl in islands]
+        elif sort_by == "children_count":
+            children = snap.children_index
+            column = [len(children.get(r.get("id", ""), ())) for r in snap.rows]
+        else:
+            column = generations
+        snap.sort_columns[sort_by] = column
+        return column
 
     # ── public API ──────────────────────────────────────────────────
 
     def get_experiment_info(self) -> UnifiedExperiment:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        programs = self._programs_cache or {}
+        snap = self._ensure_cache()
+        meta = snap.metadata
+        programs = snap.programs
 
         best_id = meta.get("best_program_id")
         best_score = 0.0
         if best_id and best_id in programs:
-            best_score = _safe_sum_metrics(programs[best_id].get("metrics", {}))
+            best_score = programs[best_id]["_score"]
 
         return UnifiedExperiment(
             id=self._make_id(),
@@ -240,9 +741,9 @@ class OpenEvolveAdapter(FrameworkAdapter):
             current_generation=max(
                 (p.get("generation", 0) for p in programs.values()), default=0
             ),
-            num_islands=len(meta.get("islands", [])),
+            num_islands=len(snap.islands_meta),
             last_iteration=meta.get("last_iteration", 0),
-            config=self._load_config(),
+            config=self._load_config(snap.checkpoint_dir),
         )
 
     def get_programs(
@@ -257,78 +758,66 @@ class OpenEvolveAdapter(FrameworkAdapter):
         score_min: Optional[float] = None,
         archive_only: bool = False,
         correct_only: bool = False,
-    ) -> Tuple[List[UnifiedProgram], int]:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        archive_set = set(meta.get("archive", []))
-        programs = self._programs_cache or {}
-
-        # Convert all
-        all_progs = [self._prog_to_unified(p, archive_set) for p in programs.values()]
-
-        # Compute children counts
-        parent_counts: Dict[str, int] = {}
-        for p in all_progs:
-            if p.parent_id:
-                parent_counts[p.parent_id] = parent_counts.get(p.parent_id, 0) + 1
-        for p in all_progs:
-            p.children_count = parent_counts.get(p.id, 0)
+    ) -> Tuple[List[UnifiedProgramSummary], int]:
+        snap = self._ensure_cache()
 
-        # Filter
-        filtered = all_progs
+        rows = snap.rows
+        scores, generations, timestamps, islands = self._program_columns(snap)
+
+        # Filter and sort row indices on the plain columns; only the requested
+        # page is turned into UnifiedProgram objects
+        idx = range(len(rows))
         if island_id is not None:
-            filtered = [p for p in filtered if p.island_id == island_id]
+            idx = [i for i in idx if islands[i] == island_id]
         if generation_min is not None:
-            filtered = [p for p in filtered if p.generation >= generation_min]
+            idx = [i for i in idx if generations[i] >= generation_min]
         if generation_max is not None:
-            filtered = [p for p in filtered if p.generation <= generation_max]
+            idx = [i for i in idx if generations[i] <= generation_max]
         if score_min is not None:
-            filtered = [p for p in filtered if p.score >= score_min]
+            idx = [i for i in idx if scores[i] >= score_min]
         if archive_only:
-            filtered = [p for p in filtered if p.in_archive]
-
-        # Sort
-        sort_key_map = {
-            "generation": lambda p: p.generation,
-            "score": lambda p: p.score,
-            "timestamp": lambda p: p.timestamp,
-            "complexity": lambda p: p.complexity,
-            "island_id": lambda p: p.island_id or 0,
-            "children_count": lambda p: p.children_count,
-        }
-        key_fn = sort_key_map.get(sort_by, lambda p: p.generation)
-        filtered.sort(key=key_fn, reverse=sort_desc)
+            archive_set = snap.archive_set
+            idx = [i for i in idx if rows[i].get("id", "") in archive_set]
+        idx = list(idx)
+
+        idx.sort(key=self._sort_column(snap, sort_by).__getitem__, reverse=sort_desc)
 
-        total = len(filtered)
+        total = len(idx)
         start = (page - 1) * page_size
         end = start + page_size
-        return filtered[start:end], total
+        return self._unified_rows(snap, idx[start:end]), total
 
     def get_program(self, program_id: str) -> Optional[UnifiedProgram]:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        archive_set = set(meta.get("archive", []))
-        programs = self._programs_cache or {}
-
-        prog = programs.get(program_id)
+        snap = self._ensure_cache()
+        prog = snap.programs.get(program_id)
         if prog is None:
             return None
 
-        unified = self._prog_to_unified(prog, archive_set)
+        return self._detail_to_unified(snap, program_id, prog)
+
+    def get_programs_by_ids(self, program_ids: List[str]) -> List[UnifiedProgram]:
+        snap = self._ensure_cache()
+        programs = snap.programs
+        return [
+            self._detail_to_unified(snap, pid, programs[pid])
+            for pid in program_ids if pid in programs
+        ]
+
+    def _detail_to_unified(self, snap: _Snapshot, program_id: str, prog: Dict) -> UnifiedProgram:
+        """Full program plus its code diff from the evolution trace."""
+        unified = self._prog_to_unified(prog, snap.archive_set)
 
         # Attach diff from traces
-        for trace in (self._trace_cache or []):
-            if trace.get("child_id") == program_id:
-                unified.code_diff = trace.get("code_diff")
-                break
+        trace = snap.trace_by_child.get(program_id)
+        if trace is not None:
+            unified.code_diff = trace.get("code_diff")
 
         return unified
 
     def get_all_programs_brief(self) -> List[Dict[str, Any]]:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        programs = self._programs_cache or {}
-        archive_set = set(meta.get("archive", []))
+        snap = self._ensure_cache()
+        programs = snap.programs
+        archive_set = snap.archive_set
 
         result = []
         for pid, prog in programs.items():
@@ -338,7 +827,7 @@ class OpenEvolveAdapter(FrameworkAdapter):
                 "parent_id": prog.get("parent_id"),
                 "generation": prog.get("generation", 0),
                 "island_id": pm.get("island"),
-                "score": _safe_sum_metrics(prog.get("metrics", {})),
+                "score": prog["_score"],
                 "in_archive": pid in archive_set,
                 "changes_description": prog.get("changes_description", ""),
             })
@@ -351,73 +840,55 @@ class OpenEvolveAdapter(FrameworkAdapter):
         improvements_only: bool = False,
         island_id: Optional[int] = None,
     ) -> Tuple[List[ConversationEntry], int]:
-        self._ensure_cache()
-        traces = self._trace_cache or []
-        programs = self._programs_cache or {}
+        snap = self._ensure_cache()
+        traces = snap.traces
+        programs = snap.programs
 
-        entries: List[ConversationEntry] = []
-        for t in traces:
-            child_id = t.get("child_id", "")
-            parent_id = t.get("parent_id", "")
-            child_prog = programs.get(child_id, {})
-            parent_prog = programs.get(parent_id, {})
-
-            child_score = _safe_sum_metrics(t.get("child_metrics", {}))
-            parent_score = _safe_sum_metrics(t.get("parent_metrics", {}))
-            delta = child_score - parent_score
-
-            prompt_data = t.get("prompt", {}) or {}
-            entry = ConversationEntry(
-                program_id=child_id,
-                parent_id=parent_id,
-                iteration=t.get("iteration", 0),
-                generation=t.get("generation", 0),
-                island_id=t.get("island_id"),
-                timestamp=t.get("timestamp", 0.0),
-                system_prompt=prompt_data.get("system"),
-                user_prompt=prompt_data.get("user"),
-                llm_response=t.get("llm_response"),
-                score=child_score,
-                parent_score=parent_score,
-                improvement_delta=delta,
-                mutation_type=t.get("metadata", {}).get("mutation_type", "diff") if t.get("metadata") else "diff",
-                code_diff=t.get("code_diff"),
-            )
-            entries.append(entry)
+        start = (page - 1) * page_size
+
+        if traces:
+            # Filter and sort the trace records on their precomputed scores;
+            # only the requested page becomes ConversationEntry objects
+            selected = traces
+            if improvements_only:
+                selected = [t for t in selected if t["_delta"] > 0]
+            if island_id is not None:
+                selected = [t for t in selected if t.get("island_id") == island_id]
+            selected = sorted(selected, key=lambda t: t.get("timestamp", 0.0), reverse=True)
+            page_traces = selected[start:start + page_size]
+            return [_trace_to_entry(t) for t in page_traces], len(selected)
 
         # Also build conversations from program prompts if no traces
-        if not entries:
-            meta = self._metadata_cache or {}
-            archive_set = set(meta.get("archive", []))
-            for pid, prog in programs.items():
-                prompts_raw = prog.get("prompts")
-                if not isinstance(prompts_raw, dict):
-                    continue
-                pm = prog.get("metadata", {}) or {}
-                parent_metrics = pm.get("parent_metrics", {})
-                parent_score = _safe_sum_metrics(parent_metrics) if parent_metrics else 0.0
-                child_score = _safe_sum_metrics(prog.get("metrics", {}))
+        entries: List[ConversationEntry] = []
+        for pid, prog in programs.items():
+            prompts_raw = prog.get("prompts")
+            if not isinstance(prompts_raw, dict):
+                continue
+            pm = prog.get("metadata", {}) or {}
+            parent_metrics = pm.get("parent_metrics", {})
+            parent_score = _safe_sum_metrics(parent_metrics) if parent_metrics else 0.0
+            child_score = prog["_score"]
 
-                for key, val in prompts_raw.items():
-                    if not isinstance(val, dict):
-                        continue
-                    responses = val.get("responses", [])
-                    entry = ConversationEntry(
-                        program_id=pid,
-                        parent_id=prog.get("parent_id"),
-                        iteration=prog.get("iteration_found", 0),
-                        generation=prog.get("generation", 0),
-                        island_id=pm.get("island"),
-                        timestamp=prog.get("timestamp", 0.0),
-                        system_prompt=val.get("system"),
-                        user_prompt=val.get("user"),
-                        llm_response=responses[0] if responses else None,
-                        score=child_score,
-                        parent_score=parent_score,
-                        improvement_delta=child_score - parent_score,
-                        mutation_type=key,
-                    )
-                    entries.append(entry)
+            for key, val in prompts_raw.items():
+                if not isinstance(val, dict):
+                    continue
+                responses = val.get("responses", [])
+                entry = ConversationEntry(
+                    program_id=pid,
+                    parent_id=prog.get("parent_id"),
+                    iteration=prog.get("iteration_found", 0),
+                    generation=prog.get("generation", 0),
+                    island_id=pm.get("island"),
+                    timestamp=prog.get("timestamp", 0.0),
+                    system_prompt=val.get("system"),
+                    user_prompt=val.get("user"),
+                    llm_response=responses[0] if responses else None,
+                    score=child_score,
+                    parent_score=parent_score,
+                    improvement_delta=child_score - parent_score,
+                    mutation_type=key,
+                )
+                entries.append(entry)
 
         # Filter
         if improvements_only:
@@ -427,24 +898,34 @@ class OpenEvolveAdapter(FrameworkAdapter):
 
         entries.sort(key=lambda e: e.timestamp, reverse=True)
         total = len(entries)
-        start = (page - 1) * page_size
         return entries[start:start + page_size], total
 
     def get_metrics(self) -> MetricsSummary:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        programs = self._programs_cache or {}
+        snap = self._ensure_cache()
+        metrics = snap.metrics
+        if metrics is None:
+            metrics = snap.metrics = self._compute_metrics(snap)
+        return metrics
+
+    def _compute_metrics(self, snap: _Snapshot) -> MetricsSummary:
+        meta = snap.metadata
+        programs = snap.programs
 
         if not programs:
             return MetricsSummary()
 
-        scores = [_safe_sum_metrics(p.get("metrics", {})) for p in programs.values()]
-        timestamps = [p.get("timestamp", 0) for p in programs.values()]
-        generations = [p.get("generation", 0) for p in programs.values()]
-
-        best_score = max(scores) if scores else 0.0
-        mean_score = statistics.mean(scores) if scores else 0.0
-        median_score = statistics.median(scores) if scores else 0.0
+        scores, generations, timestamps, islands = self._program_columns(snap)
+
+        # fmean sums with fsum rather than statistics.mean's exact fractions;
+        # the median is read off the sorted copy the distribution needs anyway
+        sorted_scores = sorted(scores)
+        n = len(sorted_scores)
+        best_score = sorted_scores[-1]
+        mean_score = statistics.fmean(sorted_scores)
+        mid = n // 2
+        median_score = (
+            sorted_scores[mid] if n % 2 else (sorted_scores[mid - 1] + sorted_scores[mid]) / 2
+        )
 
         time_min = min(timestamps) if timestamps else 0
         time_max = max(timestamps) if timestamps else 0
@@ -452,39 +933,22 @@ class OpenEvolveAdapter(FrameworkAdapter):
 
         ppm = len(programs) / (elapsed / 60) if elapsed > 0 else 0
 
-        # Best score by generation
-        gen_best: Dict[int, float] = {}
-        gen_scores: Dict[int, List[float]] = {}
-        for p in programs.values():
-            g = p.get("generation", 0)
-            s = _safe_sum_metrics(p.get("metrics", {}))
-            gen_best[g] = max(gen_best.get(g, 0), s)
-            gen_scores.setdefault(g, []).append(s)
+        gen_best, gen_sum, gen_count, island_best = _aggregate_by_generation(
+            scores, generations, islands
+        )
 
+        # Running max (floored at 0), accumulated before building the points
+        gens = sorted(gen_best)
+        running = itertools.accumulate((gen_best[g] for g in gens), max, initial=0.0)
+        next(running)
         best_history = [
-            TimeSeriesPoint(generation=g, value=v) for g, v in sorted(gen_best.items())
+            TimeSeriesPoint(generation=g, value=v) for g, v in zip(gens, running)
         ]
-        # Running max
-        running_max = 0.0
-        for pt in best_history:
-            running_max = max(running_max, pt.value)
-            pt.value = running_max
 
         mean_history = [
-            TimeSeriesPoint(generation=g, value=statistics.mean(ss))
-            for g, ss in sorted(gen_scores.items())
+            TimeSeriesPoint(generation=g, value=gen_sum[g] / gen_count[g]) for g in gens
         ]
 
-        # Per-island best
-        island_best: Dict[int, Dict[int, float]] = {}
-        for p in programs.values():
-            isl = (p.get("metadata") or {}).get("island")
-            if isl is None:
-                continue
-            g = p.get("generation", 0)
-            s = _safe_sum_metrics(p.get("metrics", {}))
-            island_best.setdefault(isl, {})[g] = max(island_best.get(isl, {}).get(g, 0), s)
-
         per_island = {
             isl: [TimeSeriesPoint(generation=g, value=v) for g, v in sorted(gb.items())]
             for isl, gb in island_best.items()
@@ -501,13 +965,13 @@ class OpenEvolveAdapter(FrameworkAdapter):
                     if prog:
                         cells[coord_key] = {
                             "program_id": pid,
-                            "score": _safe_sum_metrics(prog.get("metrics", {})),
+                            "score": prog["_score"],
                         }
             feature_stats = meta.get("feature_stats", {})
             map_grid = {"cells": cells, "feature_stats": feature_stats}
 
-        improvements = sum(1 for t in (self._trace_cache or []) if _safe_sum_metrics(t.get("child_metrics", {})) > _safe_sum_metrics(t.get("parent_metrics", {})))
-        total_traces = len(self._trace_cache or [])
+        improvements = sum(1 for t in snap.traces if t["_child_score"] > t["_parent_score"])
+        total_traces = len(snap.traces)
         imp_rate = improvements / total_traces if total_traces else 0
 
         return MetricsSummary(
@@ -522,23 +986,23 @@ class OpenEvolveAdapter(FrameworkAdapter):
             best_score_history=best_history,
             mean_score_history=mean_history,
             per_island_best=per_island,
-            score_distribution=sorted(scores),
+            score_distribution=sorted_scores,
             map_elites_grid=map_grid,
             total_llm_calls=total_traces,
         )
 
     def get_islands(self) -> Tuple[List[IslandState], List[MigrationEvent]]:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        programs = self._programs_cache or {}
+        snap = self._ensure_cache()
+        meta = snap.metadata
+        programs = snap.programs
 
         islands: List[IslandState] = []
-        for idx, id_list in enumerate(meta.get("islands", [])):
+        for idx, id_list in enumerate(snap.islands_meta):
             best_score = 0.0
             best_pid = None
             for pid in id_list:
                 if pid in programs:
-                    s = _safe_sum_metrics(programs[pid].get("metrics", {}))
+                    s = programs[pid]["_score"]
                     if s > best_score:
                         best_score = s
                         best_pid = pid
@@ -560,76 +1024,100 @@ class OpenEvolveAdapter(FrameworkAdapter):
         return islands, migrations
 
     def get_lineage(self, program_id: Optional[str] = None) -> LineageTree:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        programs = self._programs_cache or {}
-        archive_set = set(meta.get("archive", []))
+        snap = self._ensure_cache()
+        meta = snap.metadata
+        programs = snap.programs
+        children = snap.children_index
 
-        nodes: Dict[str, LineageNode] = {}
-        for pid, prog in programs.items():
+        def make_node(pid: str) -> LineageNode:
+            prog = programs[pid]
             pm = prog.get("metadata", {}) or {}
-            nodes[pid] = LineageNode(
+            return LineageNode(
                 id=pid,
                 parent_id=prog.get("parent_id"),
                 generation=prog.get("generation", 0),
                 island_id=pm.get("island"),
-                score=_safe_sum_metrics(prog.get("metrics", {})),
+                score=prog["_score"],
+                children=list(children.get(pid, ())),
                 changes_description=prog.get("changes_description", ""),
             )
 
-        # Build children lists
-        for pid, node in nodes.items():
-            if node.parent_id and node.parent_id in nodes:
-                nodes[node.parent_id].children.append(pid)
-
-        root_ids = [pid for pid, n in nodes.items() if n.parent_id is None or n.parent_id not in nodes]
-
         # Golden path
         best_pid = meta.get("best_program_id")
         best_path: List[str] = []
-        if best_pid and best_pid in nodes:
+        if best_pid and best_pid in programs:
             curr = best_pid
-            while curr and curr in nodes:
+            on_path = set()
+            while curr and curr in programs and curr not in on_path:
+                on_path.add(curr)
                 best_path.append(curr)
-                curr = nodes[curr].parent_id
+                curr = programs[curr].get("parent_id")
             best_path.reverse()
 
-        # If rooted at specific program, filter to subtree
-        if program_id and program_id in nodes:
-            subtree_ids = set()
+        # If rooted at specific program, only build the nodes reachable from it
+        if program_id and program_id in programs:
+            nodes: Dict[str, LineageNode] = {}
             stack = [program_id]
             while stack:
                 nid = stack.pop()
-                subtree_ids.add(nid)
                 if nid in nodes:
-                    stack.extend(nodes[nid].children)
-            nodes = {k: v for k, v in nodes.items() if k in subtree_ids}
-            root_ids = [program_id]
+                    continue
+                nodes[nid] = make_node(nid)
+                stack.extend(children.get(nid, ()))
+            return LineageTree(nodes=nodes, root_ids=[program_id], best_path=best_path)
 
+        nodes = {pid: make_node(pid) for pid in programs}
+        root_ids = [pid for pid, n in nodes.items() if n.parent_id is None or n.parent_id not in nodes]
         return LineageTree(nodes=nodes, root_ids=root_ids, best_path=best_path)
 
     def search_code(self, query: str, max_results: int = 50) -> List[UnifiedProgram]:
-        self._ensure_cache()
-        meta = self._metadata_cache or {}
-        archive_set = set(meta.get("archive", []))
-        programs = self._programs_cache or {}
+        snap = self._ensure_cache()
+        archive_set = snap.archive_set
+        programs = snap.programs
         query_lower = query.lower()
 
+        candidates = self._search_candidates(snap, query_lower)
+        if candidates is None:
+            scan = programs.values()
+        else:
+            scan = (programs[pid] for pid in candidates)
+
         results = []
-        for pid, prog in programs.items():
-            code = prog.get("code", "")
-            if query_lower in code.lower():
-                results.append(self._prog_to_unified(prog, archive_set))
+        for prog in scan:
+            if query_lower in _code_lower(prog):
+                results.append(self._prog_to_unified_light(prog, archive_set))
                 if len(results) >= max_results:
                     break
         return results
 
+    def _search_candidates(self, snap: _Snapshot, query_lower: str) -> Optional[List[str]]:
+        """IDs of programs that can contain query_lower, in program order.
+
+        Returns None when the query has no whole identifier to look up (e.g.
+        a fragment like "pars"), in which case every program is scanned.
+        """
+        terms = _complete_tokens(query_lower)
+        if not terms:
+            return None
+        index = snap.search_index
+        if index is None:
+            index = snap.search_index = _build_search_index(snap.programs)
+        postings, order = index
+        lists = sorted((postings.get(t, ()) for t in terms), key=len)
+        hits = set(lists[0])
+        for ids in lists[1:]:
+            hits.intersection_update(ids)
+            if not hits:
+                break
+        return sorted(hits, key=order.__getitem__)
+
     def get_last_modified(self) -> float:
         cp = self._find_latest_checkpoint()
         if cp:
-            meta_path = os.path.join(cp, "metadata.json")
-            if os.path.exists(meta_path):
-                return os.path.getmtime(meta_path)
+            try:
+                return os.stat(os.path.join(cp, "metadata.json")).st_mtime
+            except OSError:
+                pass
         return 0.0
 
     # ── helpers ─────────────────────────────────────────────────────
@@ -638,28 +1126,17 @@ class OpenEvolveAdapter(FrameworkAdapter):
         return "oe_" + Path(self.experiment_path).name.replace(" ", "_")
 
     def _infer_status(self) -> ExperimentStatus:
-        import time
-        from backend.config import STATUS_RUNNING_THRESHOLD, STATUS_PAUSED_THRESHOLD
-
-        last_mod = self.get_last_modified()
-        if last_mod == 0:
-            return ExperimentStatus.UNKNOWN
-        age = time.time() - last_mod
-        if age < STATUS_RUNNING_THRESHOLD:
-            return ExperimentStatus.RUNNING
-        if age < STATUS_PAUSED_THRESHOLD:
-            return ExperimentStatus.PAUSED
-        return ExperimentStatus.COMPLETED
-
-    def _load_config(self) -> Optional[Dict[str, Any]]:
+        return infer_status(self.get_last_modified())
+
+    def _load_config(self, checkpoint_dir: Optional[str]) -> Optional[Dict[str, Any]]:
         """Try to find and load the experiment config."""
         candidates = [
             os.path.join(self.experiment_path, "config.yaml"),
             os.path.join(self.experiment_path, "config.yml"),
         ]
-        if self._checkpoint_dir:
+        if checkpoint_dir:
             candidates.append(os.path.join(
-                os.path.dirname(os.path.dirname(self._checkpoint_dir)), "config.yaml"
+                os.path.dirname(os.path.dirname(checkpoint_dir)), "config.yaml"
             ))
 
         for path in candidates:
@@ -675,3 +1152,55 @@ class OpenEvolveAdapter(FrameworkAdapter):
                     except IOError:
                         pass
         return None
+
+
+_observer = None
+_observer_lock = threading.Lock()
+# Watches of the same path are one ObservedWatch shared by their adapters;
+# count them so a watch is only unscheduled when its last adapter stops
+_watch_users: Dict[Any, int] = {}
+
+
+def _shared_observer():
+    """One watchdog observer thread for every watching adapter, started lazily."""
+    global _observer
+    if not HAS_WATCHDOG:
+        return None
+    with _observer_lock:
+        if _observer is None:
+            observer = Observer()
+            observer.daemon = True
+            observer.start()
+            _observer = observer
+        return _observer
+
+
+if HAS_WATCHDOG:
+    class _CheckpointEventHandler(FileSystemEventHandler):
+        """Marks an adapter dirty when a checkpoint or its metadata.json changes.
+
+        Open/close events are ignored, so the adapter's own reads don't
+        invalidate it.
+        """
+
+        def __init__(self, adapter: OpenEvolveAdapter):
+            self._adapter = adapter
+
+        def _check(self, *paths: str):
+            for path in paths:
+                name = os.path.basename(path)
+                if name == "metadata.json" or name.startswith("checkpoint_"):
+                    self._adapter._dirty = True
+                    return
+
+        def on_created(self, event):
+            self._check(event.src_path)
+
+        def on_modified(self, event):
+            self._check(event.src_path)
+
+        def on_deleted(self, event):
+            self._check(event.src_path)
+
+        def on_moved(self, event):
+            self._check(event.src_path, event.dest_path)
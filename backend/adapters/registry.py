@@ -2,32 +2,434 @@
 
 from __future__ import annotations
 
-import glob
+import functools
 import importlib
 import importlib.util
 import logging
 import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Pattern, Tuple, Type
 
 from backend.adapters.base import FrameworkAdapter
+from backend.config import STAT_THREADS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _translate_segment(segment: str) -> str:
+    """Translate one glob path segment into a regex that never crosses '/'."""
+    out: List[str] = []
+    i = 0
+    while i < len(segment):
+        c = segment[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = segment.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _glob_to_regex(pattern: str) -> Pattern[str]:
+    """Compile a recursive glob pattern into a regex over '/'-joined relative paths.
+
+    ``**`` spans zero or more directories, like ``glob(..., recursive=True)``.
+    """
+    parts: List[str] = []
+    for segment in pattern.split("/"):
+        if segment == "**":
+            parts.append("(?:[^/]+/)*")
+        else:
+            parts.append(_translate_segment(segment) + "/")
+    return re.compile("".join(parts).rstrip("/"))
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Leading directory segments of a glob pattern that contain no wildcards.
+
+    ``runs/exp_*/**/*.db`` -> ``runs``; ``**/*.db`` -> ``""`` (anything may match).
+    """
+    literal: List[str] = []
+    for segment in pattern.split("/")[:-1]:
+        if any(c in segment for c in "*?["):
+            break
+        literal.append(segment)
+    return "/".join(literal)
+
+
+def _prefix_filter(prefixes: List[str]) -> Optional[Callable[[str], bool]]:
+    """Build a predicate telling whether a relative dir can hold a match.
+
+    Returns None when some pattern starts with a wildcard, since then every
+    directory has to be listed anyway.
+    """
+    if not prefixes or "" in prefixes:
+        return None
+
+    # Separator-terminated forms, built once rather than per directory
+    dirs = [(p, p + "/") for p in set(prefixes)]
+
+    def can_match_below(rel_dir: str) -> bool:
+        rel_dir_slash = rel_dir + "/"
+        for p, p_slash in dirs:
+            # Inside the literal prefix, or still on the way down to it
+            if rel_dir == p or rel_dir.startswith(p_slash) or p.startswith(rel_dir_slash):
+                return True
+        return False
+
+    return can_match_below
+
+
+# A directory listing as (name, path, is_dir) for each non-hidden entry;
+# is_dir does not follow symlinks
+_Listing = List[Tuple[str, str, bool]]
+
+# Directories never descended into during discovery, on top of hidden ones
+# (.git, .venv, ...), which are always skipped. Large and never experiments.
+EXCLUDED_DIRS = frozenset({"node_modules", "__pycache__"})
+
+
+def _list_dir(
+    path: str,
+    visited: set,
+    dir_mtimes: Optional[Dict[str, int]],
+    previous: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+    listings: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+) -> Optional[_Listing]:
+    """List a directory not seen before in this walk; None if seen or unreadable.
+
+    Hidden entries are dropped here (glob wildcards never match them). If
+    previous holds a listing of path taken at its current mtime, that is
+    returned without reading the directory again; adding, removing or
+    renaming an entry always bumps the mtime. Listings are recorded in
+    listings for the next walk to reuse.
+    """
+    try:
+        st = os.stat(path)
+        dir_key = (st.st_dev, st.st_ino)
+        if dir_key in visited:
+            return None
+        visited.add(dir_key)
+        mtime = st.st_mtime_ns
+        if dir_mtimes is not None:
+            dir_mtimes[path] = mtime
+        cached = previous.get(path) if previous else None
+        if cached is not None and cached[0] == mtime:
+            entries = cached[1]
+        else:
+            entries = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    if is_dir and name in EXCLUDED_DIRS:
+                        continue
+                    entries.append((name, entry.path, is_dir))
+    except OSError:
+        return None
+    if listings is not None:
+        listings[path] = (mtime, entries)
+    return entries
+
+
+def _walk(
+    directory: str,
+    prefix: str = "",
+    dir_mtimes: Optional[Dict[str, int]] = None,
+    descend: Optional[Callable[[str], bool]] = None,
+    visited: Optional[set] = None,
+    accept: Optional[Callable[[str], Any]] = None,
+    previous: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+    listings: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield ``(path, relpath)`` for every entry below directory, in one scandir per dir.
+
+    Hidden entries are skipped (glob wildcards never match them) and symlinked
+    directories are not descended into. Each directory's ``(st_dev, st_ino)``
+    is remembered so a bind-mount loop is listed only once. If dir_mtimes is
+    given, the mtime of every directory listed is recorded in it. If descend
+    is given, only subdirectories whose relpath it accepts are listed. If
+    accept is given, only entries whose relpath it accepts are yielded.
+    previous and listings carry directory listings between walks (see
+    _list_dir), so an unchanged directory is stat'ed but not re-read.
+
+    The walk keeps an explicit stack of open listings rather than recursing,
+    so each yielded entry is handed straight to the caller instead of
+    travelling up one generator per directory level. Entries come out in the
+    same depth-first order as a recursive walk.
+    """
+    if visited is None:
+        visited = set()
+
+    def list_dir(path: str) -> Optional[_Listing]:
+        return _list_dir(path, visited, dir_mtimes, previous, listings)
+
+    entries = list_dir(directory)
+    if entries is None:
+        return
+    yield from _walk_entries(entries, prefix, list_dir, descend, accept)
+
+
+def _walk_entries(
+    entries: _Listing,
+    prefix: str,
+    list_dir: Callable[[str], Optional[_Listing]],
+    descend: Optional[Callable[[str], bool]],
+    accept: Optional[Callable[[str], Any]],
+) -> Iterator[Tuple[str, str]]:
+    """The body of _walk, starting from an already listed directory."""
+    stack = [(iter(entries), prefix)]
+    while stack:
+        it, parent = stack[-1]
+        for name, path, is_dir in it:
+            rel = parent + name
+            if accept is None or accept(rel):
+                yield path, rel
+            if is_dir and (descend is None or descend(rel)):
+                sub = list_dir(path)
+                if sub is not None:
+                    # Descend now; this listing resumes once the subtree is done
+                    stack.append((iter(sub), rel + "/"))
+                    break
+        else:
+            stack.pop()
+
+
+def _walk_parallel(
+    directory: str,
+    workers: int,
+    dir_mtimes: Optional[Dict[str, int]] = None,
+    descend: Optional[Callable[[str], bool]] = None,
+    accept: Optional[Callable[[str], Any]] = None,
+    previous: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+    listings: Optional[Dict[str, Tuple[int, _Listing]]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Like _walk, but each top-level subdirectory is walked on a thread pool.
+
+    Listing is syscall-bound and releases the GIL, so subtrees on slow or
+    network filesystems are read concurrently. Entries are still yielded
+    in _walk's order: each subtree's results are collected by its worker
+    and emitted after its top-level entry. Workers share the visited set,
+    dir_mtimes and listings; a race between them can at worst list a looped
+    directory twice, and callers dedup matches anyway.
+    """
+    visited: set = set()
+
+    def list_dir(path: str) -> Optional[_Listing]:
+        return _list_dir(path, visited, dir_mtimes, previous, listings)
+
+    entries = list_dir(directory)
+    if entries is None:
+        return
+
+    def walk_subtree(path: str, rel: str) -> List[Tuple[str, str]]:
+        sub = list_dir(path)
+        if sub is None:
+            return []
+        return list(_walk_entries(sub, rel + "/", list_dir, descend, accept))
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        plan: List[Tuple[str, str, Optional[Future]]] = []
+        for rel, path, is_dir in entries:
+            future = None
+            if is_dir and (descend is None or descend(rel)):
+                future = pool.submit(walk_subtree, path, rel)
+            plan.append((path, rel, future))
+
+        for path, rel, future in plan:
+            if accept is None or accept(rel):
+                yield path, rel
+            if future is not None:
+                yield from future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Below this many directories the revalidation stats run inline; above it
+# they are spread over STAT_THREADS workers so their latency overlaps
+_PARALLEL_STAT_MIN = 256
+
+
+def _mtimes_match(items: List[Tuple[str, int]]) -> bool:
+    try:
+        return all(os.stat(d).st_mtime_ns == m for d, m in items)
+    except OSError:
+        return False
+
+
+def _tree_unchanged(dir_mtimes: Dict[str, int], workers: int = 1) -> bool:
+    """True if no directory recorded by a previous walk has been modified.
+
+    With workers > 1 and a large tree, the directories are split into one
+    batch per worker and the batches are stat'ed concurrently.
+    """
+    items = list(dir_mtimes.items())
+    if workers <= 1 or len(items) < _PARALLEL_STAT_MIN:
+        return _mtimes_match(items)
+    batches = [items[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return all(pool.map(_mtimes_match, batches))
+
+
+def _path_key(path: str) -> Any:
+    """Identity of a path for dedup: ``(st_dev, st_ino)`` from a single stat.
+
+    The kernel resolves symlinks in that one call, so this matches what
+    ``os.path.realpath`` identifies without an lstat per path component.
+    Paths that cannot be stat'ed fall back to their normalized string, as do
+    paths on Windows or on filesystems that report no inode numbers (FAT,
+    some network mounts), where st_ino can't tell files apart.
+    """
+    if os.name == "nt":
+        return os.path.normcase(os.path.abspath(path))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return os.path.normpath(path)
+    if not st.st_ino:
+        return os.path.normpath(path)
+    return (st.st_dev, st.st_ino)
+
+
+def _safe_detect(config: "ProjectConfig", path: str) -> bool:
+    try:
+        return bool(config.detect(path))
+    except Exception:
+        return False
+
+
+def _resolver(config: "ProjectConfig") -> Callable[[str], Optional[str]]:
+    """Map a pattern match to its experiment path, or None if resolution fails.
+
+    Built once per config so discovery doesn't re-check for a resolver and
+    set up its own error handling on every match.
+    """
+    resolve = config.resolve_experiment_path
+    if resolve is None:
+        return lambda match_path: match_path
+
+    def safe_resolve(match_path: str) -> Optional[str]:
+        try:
+            return resolve(match_path)
+        except Exception:
+            return None
+
+    return safe_resolve
+
+
+# Filesystems where inotify-style watches miss changes made by other hosts
+_NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "fuse.sshfs", "9p", "afs", "ceph",
+})
+
+
+def _unescape_mount_field(field: str) -> str:
+    # mountinfo escapes space, tab, newline and backslash as \ooo octal
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+@functools.lru_cache(maxsize=64)
+def _detect_fs_type(path: str) -> Optional[str]:
+    """Filesystem type of the mount holding path, from /proc/self/mountinfo.
+
+    Returns None where mountinfo is unavailable (non-Linux) or unreadable.
+    """
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best_len = -1
+    fs_type = None
+    for line in lines:
+        pre, sep, post = line.partition(" - ")
+        fields = pre.split()
+        if not sep or len(fields) < 5:
+            continue
+        mount_point = _unescape_mount_field(fields[4])
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            # Later lines win ties: they are mounted on top of earlier ones
+            if len(mount_point) >= best_len:
+                best_len = len(mount_point)
+                fs_type = post.split(" ", 1)[0]
+    return fs_type
+
+
+def _effective_change_detection(mode: str, path: Optional[str]) -> str:
+    """Resolve ``"auto"`` to ``"watchdog"``, or ``"poll"`` on network filesystems."""
+    if mode != "auto":
+        return mode
+    if path and _detect_fs_type(path) in _NETWORK_FS_TYPES:
+        return "poll"
+    return "watchdog"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_project_config(path: str, mtime_ns: int, size: int) -> Optional["ProjectConfig"]:
+    """Execute a project config file and build its ProjectConfig.
+
+    Keyed on the file's mtime and size as well as its path, so an unchanged
+    file is executed once per process and an edited one is loaded afresh.
+    Returns None if the file defines no PROJECT_CONFIG dict; errors propagate
+    and are not cached.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(f"evollm_project_{stem}", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    cfg_dict = getattr(mod, "PROJECT_CONFIG", None)
+    if cfg_dict and isinstance(cfg_dict, dict):
+        return ProjectConfig(**cfg_dict)
+    return None
+
+
+_DETECT_CACHE_SIZE = 1024
+_METADATA_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True, slots=True)
 class ProjectConfig:
+    """A framework's registration; immutable, so it is safe to share across threads."""
+
     name: str
     adapter_class: Type[FrameworkAdapter]
     detect: Callable[[str], bool]
-    glob_patterns: List[str]
+    glob_patterns: Tuple[str, ...]
     resolve_experiment_path: Optional[Callable[[str], str]] = None
     display_name: Optional[str] = None
     description: str = ""
     badge_color: str = "#6366f1"
     badge_bg: str = "rgba(99, 102, 241, 0.15)"
-    change_detection: str = "poll"  # "poll" or "watchdog"
+    change_detection: str = "auto"  # "auto", "poll" or "watchdog"
+
+    def __post_init__(self):
+        # Config files pass a list; store an immutable copy
+        object.__setattr__(self, "glob_patterns", tuple(self.glob_patterns))
 
 
 class ProjectRegistry:
@@ -35,20 +437,115 @@ class ProjectRegistry:
 
     def __init__(self):
         self._configs: Dict[str, ProjectConfig] = {}
+        # Snapshot of _configs.items() in registration order, rebuilt by
+        # register(); loops iterate it while lookups by name use the dict
+        self._config_items: Tuple[Tuple[str, ProjectConfig], ...] = ()
+        # name -> change detection strategy for configs with a fixed one
+        # ("auto" depends on the path), rebuilt by register()
+        self._strategy_index: Mapping[str, str] = MappingProxyType({})
+        # base_dir -> (_config_items it was built from, get_framework_metadata()
+        # result); register() rebinds _config_items, which invalidates it
+        self._metadata_cache: Dict[Optional[str], Tuple[tuple, List[Dict[str, Any]]]] = {}
+        # Detection table: name -> (config, compiled glob_patterns, resolver),
+        # built once at registration so discovery only has to run the regexes
+        self._matchers: Dict[
+            str, Tuple[ProjectConfig, List[Pattern], Callable[[str], Optional[str]]]
+        ] = {}
+        # Union of every pattern above with one named group per config (in
+        # matcher-table order, skipping configs without patterns): a single
+        # fullmatch rejects most walk entries and names the first config
+        # that claims the rest
+        self._prefilter: Optional[Pattern] = None
+        # base_dir -> (mtime_ns of every directory walked, results)
+        self._discovery_cache: Dict[str, Tuple[Dict[str, int], List[Tuple[str, str]]]] = {}
+        # base_dir -> {dir: (mtime_ns, listing)} from the last walk, so a
+        # changed tree only re-reads the directories that changed. Listings
+        # don't depend on the configs, so register() leaves these alone.
+        self._listing_cache: Dict[str, Dict[str, Tuple[int, _Listing]]] = {}
+        # (st_dev, st_ino, st_mtime_ns) -> framework name, least recently used first
+        self._detect_cache: "OrderedDict[Tuple[int, int, int], str]" = OrderedDict()
+        self._detect_lock = threading.Lock()
 
     def register(self, config: ProjectConfig):
-        self._configs[config.name] = config
+        if self._configs.get(config.name) is config:
+            # Reloading an unchanged config file yields the same object
+            return
+        # Copy-on-write, so views handed out by all_configs() never change
+        configs = dict(self._configs)
+        configs[config.name] = config
+        self._configs = configs
+        self._config_items = tuple(configs.items())
+        self._strategy_index = MappingProxyType({
+            name: c.change_detection
+            for name, c in self._config_items
+            if c.change_detection != "auto"
+        })
+        self._matchers[config.name] = (
+            config, [_glob_to_regex(p) for p in config.glob_patterns], _resolver(config)
+        )
+        groups = [
+            f"(?P<_m{i}>{'|'.join(r.pattern for r in regexes)})"
+            for i, regexes in enumerate(
+                regexes for _, regexes, _ in self._matchers.values() if regexes
+            )
+        ]
+        self._prefilter = re.compile("|".join(groups)) if groups else None
+        self._discovery_cache.clear()
+        with self._detect_lock:
+            self._detect_cache.clear()
         logger.info(f"Registered project config: {config.name}")
 
     def get(self, name: str) -> Optional[ProjectConfig]:
         return self._configs.get(name)
 
-    def all_configs(self) -> Dict[str, ProjectConfig]:
-        return dict(self._configs)
+    def all_configs(self) -> Mapping[str, ProjectConfig]:
+        """Read-only snapshot of the registered configs, by name."""
+        return MappingProxyType(self._configs)
+
+    @property
+    def strategy_index(self) -> Mapping[str, str]:
+        """Read-only name -> strategy map of configs that don't use ``"auto"``."""
+        return self._strategy_index
+
+    def matches_glob(self, rel_path: str) -> bool:
+        """True if any config's glob_patterns match a '/'-joined relative path."""
+        return self._prefilter is not None and self._prefilter.fullmatch(rel_path) is not None
+
+    @staticmethod
+    def supports_fs_events(path: str) -> bool:
+        """False where file events may be missed (network filesystems)."""
+        return _effective_change_detection("auto", path) == "watchdog"
 
     def detect_framework(self, path: str) -> Optional[str]:
-        """Return the framework name that matches the given path, or None."""
-        for name, config in self._configs.items():
+        """Return the framework name that matches the given path, or None.
+
+        Matches are cached on the path's identity and mtime, so repeat queries
+        for an unchanged path cost one stat. Misses are not cached: detection
+        can hinge on files deeper in the tree (e.g. a new checkpoint), whose
+        arrival doesn't touch the path's own mtime.
+        """
+        try:
+            st = os.stat(path)
+            key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        except OSError:
+            key = None
+        if key is not None:
+            with self._detect_lock:
+                name = self._detect_cache.get(key)
+                if name is not None:
+                    self._detect_cache.move_to_end(key)
+                    return name
+
+        name = self._detect_uncached(path)
+        if name is not None and key is not None:
+            with self._detect_lock:
+                self._detect_cache[key] = name
+                if len(self._detect_cache) > _DETECT_CACHE_SIZE:
+                    self._detect_cache.popitem(last=False)
+        return name
+
+    def _detect_uncached(self, path: str) -> Optional[str]:
+        for name, config in self._config_items:
             try:
                 if config.detect(path):
                     return name
@@ -66,88 +563,183 @@ class ProjectRegistry:
     def discover_experiments(self, base_dir: str) -> List[Tuple[str, str]]:
         """Scan base_dir using all registered configs' glob patterns.
 
+        The tree is walked once and every entry is matched against the union
+        of all configs' patterns, instead of one recursive glob per pattern.
+        The result is reused while no directory in the tree has been
+        modified, since adding, removing or renaming an entry bumps its
+        parent's mtime. Once something has changed, the walk still reuses
+        the previous listing of every directory whose mtime is the same.
+
         Returns list of (path, framework_name) tuples.
         """
+        cached = self._discovery_cache.get(base_dir)
+        if cached is not None and _tree_unchanged(cached[0], STAT_THREADS):
+            return list(cached[1])
+
         results: List[Tuple[str, str]] = []
         seen_paths: set = set()
+        dir_mtimes: Dict[str, int] = {}
+        listings: Dict[str, Tuple[int, _Listing]] = {}
 
-        for name, config in self._configs.items():
-            for pattern in config.glob_patterns:
-                for match_path in glob.iglob(os.path.join(base_dir, pattern), recursive=True):
-                    # Resolve experiment path if a resolver is provided
-                    if config.resolve_experiment_path:
-                        try:
-                            experiment_path = config.resolve_experiment_path(match_path)
-                        except Exception:
-                            continue
-                    else:
-                        experiment_path = match_path
-
-                    real = os.path.realpath(experiment_path)
-                    if real in seen_paths:
+        matchers = [
+            (name, config, regexes, resolve)
+            for name, (config, regexes, resolve) in self._matchers.items()
+            if regexes
+        ]
+        if not matchers:
+            return results
+
+        # Collect unique (experiment, framework) candidates in walk order;
+        # many glob matches (e.g. one per checkpoint) resolve to the same root.
+        candidates: List[Tuple[str, str, ProjectConfig, Any]] = []
+        queued: set = set()
+        # Directories outside every pattern's literal prefix are never listed
+        descend = _prefix_filter([
+            _literal_prefix(p)
+            for _, config, _, _ in matchers
+            for p in config.glob_patterns
+        ])
+        # detect() probes are independent, so they run on a pool while the
+        # walk continues and their I/O overlaps with listing. The pool starts
+        # at the second candidate; a lone candidate is probed inline.
+        pool: Optional[ThreadPoolExecutor] = None
+        futures: List[Future] = []
+        try:
+            walk_options = dict(
+                dir_mtimes=dir_mtimes,
+                descend=descend,
+                accept=self._prefilter.fullmatch,
+                previous=self._listing_cache.get(base_dir),
+                listings=listings,
+            )
+            if STAT_THREADS > 1:
+                walk = _walk_parallel(base_dir, STAT_THREADS, **walk_options)
+            else:
+                walk = _walk(base_dir, **walk_options)
+            for match_path, rel in walk:
+                # The named group says which config matched first; configs
+                # after it may claim the same entry, so they are still tried
+                first = int(self._prefilter.fullmatch(rel).lastgroup[2:])
+                for i in range(first, len(matchers)):
+                    name, config, regexes, resolve = matchers[i]
+                    if i != first and not any(r.fullmatch(rel) for r in regexes):
                         continue
 
-                    # Confirm with detect()
-                    try:
-                        if config.detect(experiment_path):
-                            seen_paths.add(real)
-                            results.append((experiment_path, name))
-                            logger.debug(f"Discovered {name} experiment: {experiment_path}")
-                    except Exception:
+                    experiment_path = resolve(match_path)
+                    if experiment_path is None:
+                        continue
+
+                    key = _path_key(experiment_path)
+                    if (key, name) in queued:
                         continue
+                    queued.add((key, name))
+                    candidates.append((experiment_path, name, config, key))
+
+                    if pool is not None:
+                        futures.append(pool.submit(_safe_detect, config, experiment_path))
+                    elif STAT_THREADS > 1 and len(candidates) > 1:
+                        pool = ThreadPoolExecutor(max_workers=STAT_THREADS)
+                        futures = [pool.submit(_safe_detect, c, p) for p, _, c, _ in candidates]
 
-        return results
+            if pool is not None:
+                verdicts = [f.result() for f in futures]
+            else:
+                verdicts = [_safe_detect(config, path) for path, _, config, _ in candidates]
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        for (experiment_path, name, _, key), ok in zip(candidates, verdicts):
+            if not ok or key in seen_paths:
+                continue
+            seen_paths.add(key)
+            results.append((experiment_path, name))
+            logger.debug(f"Discovered {name} experiment: {experiment_path}")
 
-    def get_framework_metadata(self) -> List[Dict[str, Any]]:
-        """Return metadata for all registered frameworks (for the frontend)."""
-        return [
+        self._discovery_cache[base_dir] = (dir_mtimes, results)
+        self._listing_cache[base_dir] = listings
+        return list(results)
+
+    def change_detection_for(self, name: str, path: Optional[str] = None) -> str:
+        """Effective change detection strategy for a framework's experiment at path.
+
+        ``"auto"`` becomes ``"watchdog"`` unless path is on a network
+        filesystem, where file events from other hosts are not delivered.
+        """
+        strategy = self._strategy_index.get(name)
+        if strategy is not None:
+            return strategy
+        config = self._configs.get(name)
+        if config is None:
+            return "poll"
+        return _effective_change_detection(config.change_detection, path)
+
+    def get_framework_metadata(self, base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return metadata for all registered frameworks (for the frontend).
+
+        ``change_detection`` is the effective strategy for experiments under
+        base_dir, with ``"auto"`` resolved. The list is built once per
+        base_dir and set of configs and then shared, so callers must not
+        mutate it.
+        """
+        cached = self._metadata_cache.get(base_dir)
+        if cached is not None and cached[0] is self._config_items:
+            return cached[1]
+        metadata = [
             {
                 "name": c.name,
                 "display_name": c.display_name or c.name,
                 "description": c.description,
                 "badge_color": c.badge_color,
                 "badge_bg": c.badge_bg,
-                "change_detection": c.change_detection,
+                "change_detection": _effective_change_detection(c.change_detection, base_dir),
             }
-            for c in self._configs.values()
+            for _, c in self._config_items
         ]
+        if len(self._metadata_cache) >= _METADATA_CACHE_SIZE:
+            self._metadata_cache.clear()
+        self._metadata_cache[base_dir] = (self._config_items, metadata)
+        return metadata
 
     # ── Loading ───────────────────────────────────────────────────────
 
     def load_directory_configs(self, directory: str):
         """Load all PROJECT_CONFIG dicts from .py files in a directory."""
-        dirpath = Path(directory)
-        if not dirpath.is_dir():
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(
+                    (e for e in it if e.name.endswith(".py") and not e.name.startswith("_")),
+                    key=lambda e: e.name,
+                )
+        except OSError:
             logger.debug(f"Project config directory not found: {directory}")
             return
 
-        for py_file in sorted(dirpath.glob("*.py")):
-            if py_file.name.startswith("_"):
-                continue
+        for entry in entries:
             try:
-                spec = importlib.util.spec_from_file_location(
-                    f"evollm_project_{py_file.stem}", str(py_file)
-                )
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                cfg_dict = getattr(mod, "PROJECT_CONFIG", None)
-                if cfg_dict and isinstance(cfg_dict, dict):
-                    self.register(ProjectConfig(**cfg_dict))
+                # One stat per file, following symlinks like the old glob did;
+                # it both filters out directories and keys the load cache
+                st = entry.stat()
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                config = _load_project_config(entry.path, st.st_mtime_ns, st.st_size)
+                if config is not None:
+                    self.register(config)
                 else:
-                    logger.debug(f"No PROJECT_CONFIG in {py_file}")
+                    logger.debug(f"No PROJECT_CONFIG in {entry.path}")
             except Exception as e:
-                logger.warning(f"Failed to load project config {py_file}: {e}")
+                logger.warning(f"Failed to load project config {entry.path}: {e}")
 
     def load_entry_point_configs(self):
         """Load configs from installed packages via entry points."""
         try:
             from importlib.metadata import entry_points
-            eps = entry_points()
-            # Python 3.12+ returns a SelectableGroups, older returns dict
-            if hasattr(eps, "select"):
-                group = eps.select(group="evollm.projects")
-            else:
-                group = eps.get("evollm.projects", [])
+            # The group filter (3.10+) looks up just this group instead of
+            # materializing every installed package's entry points
+            try:
+                group = entry_points(group="evollm.projects")
+            except TypeError:
+                group = entry_points().get("evollm.projects", [])
 
             for ep in group:
                 try:
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import math
+import operator
 import os
 import sqlite3
-import statistics
+import threading
 import time as _time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from backend.adapters.base import FrameworkAdapter
+from backend.adapters.base import FrameworkAdapter, decode_cursor, encode_cursor, infer_status
 from backend.models.unified import (
     AnalyticsSummary,
     ConversationEntry,
@@ -28,30 +31,300 @@ from backend.models.unified import (
     TimeSeriesPoint,
     UnifiedExperiment,
     UnifiedProgram,
+    UnifiedProgramSummary,
 )
 
+# Optional orjson import — the JSON columns are decoded for every row returned
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
 
 def _clean_nan(v):
-    if isinstance(v, float) and (math.isnan(v) or math.isinf(v)):
+    # v - v is 0.0 for finite floats and NaN for NaN/Inf; no function calls
+    if v.__class__ is float and v - v != 0.0:
         return None
     return v
 
 
-def _json_loads_safe(s, default=None):
-    if not s:
-        return default if default is not None else {}
+# combined_score with NULL/NaN/Inf read as 0.0, like _clean_nan(...) or 0.0.
+# SQLite stores NaN as NULL and infinities as +/-9e999.
+_SCORE_OF = "COALESCE(CASE WHEN abs({0}) < 9e999 THEN {0} END, 0.0)"
+_SCORE = _SCORE_OF.format("combined_score")
+
+
+# Prepared statements kept per connection, keyed by SQL text. get_programs
+# alone builds a distinct statement per filter/sort combination, so leave
+# room beyond sqlite3's default of 128 for the ones the dashboard cycles.
+_STATEMENT_CACHE_SIZE = 512
+
+# programs columns read by _row_to_unified. The raw `embedding` vector is
+# left out: only get_embeddings uses it, and it is the widest column.
+_PROGRAM_COLUMNS = (
+    "id", "code", "language", "parent_id", "generation", "island_idx",
+    "timestamp", "combined_score", "public_metrics", "private_metrics",
+    "correct", "complexity", "code_diff", "text_feedback",
+    "embedding_pca_2d", "embedding_pca_3d", "embedding_cluster_id",
+    "children_count", "migration_history", "archive_inspiration_ids",
+    "top_k_inspiration_ids", "metadata",
+)
+
+# The subset _row_to_summary reads: list pages skip the code, diff and
+# feedback text, which are most of a row's bytes
+_SUMMARY_COLUMNS = tuple(
+    c for c in _PROGRAM_COLUMNS
+    if c not in ("code", "code_diff", "text_feedback", "migration_history",
+                 "archive_inspiration_ids", "top_k_inspiration_ids")
+)
+
+# get_programs sort_by -> programs column
+_SORT_COLUMNS = {
+    "generation": "generation",
+    "score": "combined_score",
+    "timestamp": "timestamp",
+    "complexity": "complexity",
+    "island_id": "island_idx",
+    "children_count": "children_count",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _programs_sql(
+    select: str, where_clauses: Tuple[str, ...], sort_col: str, sort_desc: bool,
+) -> Tuple[str, str]:
+    """(count, page) SQL for one get_programs filter/sort shape; values are bound."""
+    where = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    # rowid breaks ties so pages don't overlap
+    order = f"{sort_col} {'DESC' if sort_desc else 'ASC'}, rowid"
+    count_sql = f"SELECT COUNT(*) as cnt FROM programs {where}"
+    # The source database is read-only, so we can't add indexes for these
+    # sorts. Sort (key, rowid) pairs only, then load the full rows (code,
+    # embeddings) for just the requested page.
+    page_sql = (
+        f"SELECT {select} FROM programs WHERE rowid IN ("
+        f"SELECT rowid FROM programs {where} ORDER BY {order} LIMIT ? OFFSET ?"
+        f") ORDER BY {order}"
+    )
+    return count_sql, page_sql
+
+
+# Keyset pagination orders on these; NULLs sort as the lowest value
+_GENERATION_KEY = "IFNULL(generation, -1)"
+_CONVERSATION_KEY = "IFNULL(p.timestamp, 0.0)"
+
+
+def _program_filters(
+    island_id: Optional[int], generation_min: Optional[int], generation_max: Optional[int],
+    score_min: Optional[float], correct_only: bool,
+) -> Tuple[List[str], List[Any]]:
+    """WHERE clauses and bound values for the get_programs filters."""
+    where_clauses: List[str] = []
+    params: List[Any] = []
+    if island_id is not None:
+        where_clauses.append("island_idx = ?")
+        params.append(island_id)
+    if generation_min is not None:
+        where_clauses.append("generation >= ?")
+        params.append(generation_min)
+    if generation_max is not None:
+        where_clauses.append("generation <= ?")
+        params.append(generation_max)
+    if score_min is not None:
+        where_clauses.append("combined_score >= ?")
+        params.append(score_min)
+    if correct_only:
+        where_clauses.append("correct = 1")
+    return where_clauses, params
+
+
+@functools.lru_cache(maxsize=64)
+def _programs_keyset_sql(
+    select: str, where_clauses: Tuple[str, ...], sort_desc: bool, has_cursor: bool,
+) -> str:
+    """Page SQL for get_programs_after, sorted by generation then rowid."""
+    clauses = list(where_clauses)
+    if has_cursor:
+        cmp = "<" if sort_desc else ">"
+        clauses.append(
+            f"({_GENERATION_KEY} {cmp} ? OR ({_GENERATION_KEY} = ? AND rowid > ?))"
+        )
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
+    order = f"{_GENERATION_KEY} {'DESC' if sort_desc else 'ASC'}, rowid"
+    return (
+        f"SELECT {select}, {_GENERATION_KEY} AS _key, rowid AS _rowid FROM programs "
+        f"WHERE rowid IN (SELECT rowid FROM programs {where} ORDER BY {order} LIMIT ?) "
+        f"ORDER BY {order}"
+    )
+
+
+def _cursor_key(after: Optional[str]) -> Optional[List[Any]]:
+    """(sort key, rowid) from a keyset cursor, None for the first page."""
+    if not after:
+        return None
+    parts = decode_cursor(after)
+    # Both values are bound as SQL parameters, so only types SQLite accepts
+    # get through; anything else is a malformed cursor, not a DB error
+    if (
+        len(parts) != 3 or parts[0] != "k"
+        or isinstance(parts[1], bool) or not isinstance(parts[1], (int, float, str, type(None)))
+        or isinstance(parts[2], bool) or not isinstance(parts[2], int)
+    ):
+        raise ValueError(f"Invalid cursor: {after!r}")
+    return parts[1:]
+
+
+_CONVERSATION_FROM = "FROM programs p LEFT JOIN programs parent ON p.parent_id = parent.id"
+_CONVERSATION_SELECT = (
+    "p.id, p.parent_id, p.generation, p.island_idx, p.timestamp, "
+    f"{_SCORE_OF.format('p.combined_score')} AS score, p.code_diff, "
+    f"{_SCORE_OF.format('parent.combined_score')} AS parent_score"
+)
+
+
+def _conversation_filters(
+    improvements_only: bool, island_id: Optional[int],
+) -> Tuple[List[str], List[Any]]:
+    where_parts: List[str] = []
+    params: List[Any] = []
+    if island_id is not None:
+        where_parts.append("p.island_idx = ?")
+        params.append(island_id)
+    if improvements_only:
+        child_score = _SCORE_OF.format("p.combined_score")
+        parent_score = _SCORE_OF.format("parent.combined_score")
+        where_parts.append(f"{child_score} > {parent_score}")
+    return where_parts, params
+
+
+def _conversation_entry(r: sqlite3.Row) -> ConversationEntry:
+    return ConversationEntry(
+        program_id=r["id"],
+        parent_id=r["parent_id"],
+        generation=r["generation"],
+        island_id=r["island_idx"],
+        timestamp=r["timestamp"],
+        score=r["score"],
+        parent_score=r["parent_score"],
+        improvement_delta=r["score"] - r["parent_score"],
+        code_diff=r["code_diff"],
+    )
+
+
+# Config files looked for next to the database, in order of preference
+_CONFIG_CANDIDATES = (
+    "config.yaml",
+    "config.yml",
+    os.path.join(".hydra", "config.yaml"),
+    os.path.join(".hydra", "overrides.yaml"),
+)
+
+# Metadata fields read by get_analytics, in unpacking order.
+_ANALYTICS_PATHS = (
+    "$.api_costs",
+    "$.embed_cost",
+    "$.novelty_cost",
+    "$.meta_cost",
+    "$.llm_result.model_name",
+    "$.model_name",
+    "$.llm_result.model_posteriors",
+    "$.patch_type",
+)
+
+
+def _extract_paths(obj: Any, paths: Tuple[str, ...]) -> List[Any]:
+    """Python equivalent of SQLite's json_extract(obj, *paths) on a decoded value."""
+    values = []
+    for path in paths:
+        v = obj
+        for key in path[2:].split("."):
+            v = v.get(key) if isinstance(v, dict) else None
+        values.append(v)
+    return values
+
+
+def _py_dot(a: List[float], b: List[float]) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+# math.sumprod (3.12+) runs the whole dot product in C
+_dot = getattr(math, "sumprod", _py_dot)
+
+
+def _cosine_matrix(embeddings: List[List[float]]) -> List[List[float]]:
+    """Pairwise cosine similarity, rounded to 4 places."""
+    if HAS_NUMPY:
+        mat = np.asarray(embeddings, dtype=np.float32)
+        mat /= np.linalg.norm(mat, axis=1, keepdims=True).clip(min=1e-10)
+        return (mat @ mat.T).astype(np.float64).round(4).tolist()
+
+    # Normalize each vector once so every pair is a single dot product.
+    unit = []
+    for e in embeddings:
+        norm = max(math.hypot(*e), 1e-10)
+        unit.append([x / norm for x in e])
+    n = len(unit)
+    similarity = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        ui = unit[i]
+        row = similarity[i]
+        for j in range(i, n):
+            sim = round(_dot(ui, unit[j]), 4)
+            row[j] = sim
+            similarity[j][i] = sim
+    return similarity
+
+
+# Short JSON values repeat across rows ("[]", "{}", identical metric or id
+# lists), so their decoded form is shared. Longer blobs are mostly unique
+# and would only pin memory in the cache.
+_INTERN_MAX_LEN = 1024
+_DECODE_FAILED = object()
+
+
+def _json_decode(s):
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity literals or bad input: let json decide
     try:
         return json.loads(s)
     except (json.JSONDecodeError, TypeError):
+        return _DECODE_FAILED
+
+
+_json_decode_interned = functools.lru_cache(maxsize=1024)(_json_decode)
+
+
+def _json_loads_safe(s, default=None):
+    """Decode a JSON column; bad or empty input gives ``default`` (or {}).
+
+    Short strings are decoded once and the result shared between calls,
+    so callers must copy before mutating.
+    """
+    if not s:
+        return default if default is not None else {}
+    if isinstance(s, str) and len(s) <= _INTERN_MAX_LEN:
+        value = _json_decode_interned(s)
+    else:
+        value = _json_decode(s)
+    if value is _DECODE_FAILED:
         return default if default is not None else {}
+    return value
 
 
 def _db_retry(func):
     """Retry decorator for SQLite operations — mirrors ShinkaEvolve's pattern."""
-    import functools
-
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         max_retries = 5
@@ -59,6 +332,9 @@ def _db_retry(func):
         for i in range(max_retries):
             try:
                 return func(*args, **kwargs)
+            except (sqlite3.ProgrammingError, sqlite3.InterfaceError):
+                # Bad SQL or parameter bindings fail the same way every time
+                raise
             except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
                 if i == max_retries - 1:
                     logger.error(f"DB op {func.__name__} failed after {max_retries} retries: {e}")
@@ -70,77 +346,176 @@ def _db_retry(func):
     return wrapper
 
 
+def _stamp_cached(func):
+    """Memoize a whole-database query per argument set until _db_stamp() changes.
+
+    Results are shared between callers and must be treated as read-only.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        stamp = self._db_stamp()
+        cached = self._results
+        if cached is None or cached[0] != stamp:
+            cached = self._results = (stamp, {})
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            return cached[1][key]
+        except KeyError:
+            pass
+        result = cached[1][key] = func(self, *args, **kwargs)
+        return result
+    return wrapper
+
+
 class ShinkaAdapter(FrameworkAdapter):
     """Reads ShinkaEvolve SQLite databases (read-only)."""
 
+    __slots__ = ("_db_path", "_archive_cache", "_local", "_results", "_select_cache",
+                 "_config_cache", "_meta_names_cache")
+
     def __init__(self, experiment_path: str):
         super().__init__(experiment_path)
         self._db_path = experiment_path
+        self._archive_cache: Optional[Tuple[Tuple[int, ...], FrozenSet[str]]] = None
+        # One connection per thread: sqlite3 connections are not shareable
+        # across threads, and reopening per statement re-reads the WAL index.
+        self._local = threading.local()
+        # (db stamp, {(method, args, kwargs): result}) for @_stamp_cached
+        self._results: Optional[Tuple[Tuple[int, ...], Dict[tuple, Any]]] = None
+        self._select_cache: Optional[Tuple[Tuple[int, ...], str, str]] = None
+        self._config_cache: Optional[Tuple[tuple, Optional[Dict[str, Any]]]] = None
+        self._meta_names_cache: Optional[Tuple[int, List[str]]] = None
 
     def _connect(self) -> sqlite3.Connection:
-        """Open a read-only connection (WAL-safe, never holds it)."""
+        """Open a read-only connection (WAL-safe; statements run in autocommit)."""
         db_uri = f"file:{self._db_path}?mode=ro"
-        conn = sqlite3.connect(db_uri, uri=True, timeout=30.0)
+        conn = sqlite3.connect(
+            db_uri, uri=True, timeout=30.0, cached_statements=_STATEMENT_CACHE_SIZE,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA busy_timeout = 10000;")
         conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA cache_size = -20000;")
+        conn.execute("PRAGMA mmap_size = 268435456;")
+        conn.execute("PRAGMA temp_store = MEMORY;")
         return conn
 
-    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
-        """Execute a query and return all rows, closing the connection immediately."""
-        conn = self._connect()
-        try:
-            cur = conn.execute(sql, params)
-            return cur.fetchall()
-        finally:
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use and kept open."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _drop_conn(self) -> None:
+        """Close this thread's connection so the next query reopens it."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
             conn.close()
 
-    def _query_one(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
-        conn = self._connect()
+    @contextmanager
+    def _read_snapshot(self):
+        """Run several queries against one consistent read transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN")
         try:
-            cur = conn.execute(sql, params)
-            return cur.fetchone()
+            yield
         finally:
-            conn.close()
+            # A failed query has already closed and dropped the connection.
+            if self._local.conn is conn:
+                conn.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Execute a query on this thread's connection and return all rows."""
+        try:
+            return self._conn().execute(sql, params).fetchall()
+        except sqlite3.Error:
+            self._drop_conn()
+            raise
 
-    def _row_to_unified(self, row: sqlite3.Row) -> UnifiedProgram:
-        pub_metrics = _json_loads_safe(row["public_metrics"])
-        priv_metrics = _json_loads_safe(row["private_metrics"])
+    def _query_one(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        try:
+            cur = self._conn().execute(sql, params)
+            try:
+                return cur.fetchone()
+            finally:
+                cur.close()  # finalize the statement so no read snapshot lingers
+        except sqlite3.Error:
+            self._drop_conn()
+            raise
+
+    def _program_select(self, summary: bool = False) -> str:
+        """SELECT list of the _PROGRAM_COLUMNS (or _SUMMARY_COLUMNS) this database has.
+
+        Older schemas lack some columns.
+        """
+        stamp = self._db_stamp()
+        cached = self._select_cache
+        if cached is None or cached[0] != stamp:
+            present = {r["name"] for r in self._query("PRAGMA table_info(programs)")}
+            cached = self._select_cache = (
+                stamp,
+                ", ".join(c for c in _PROGRAM_COLUMNS if c in present),
+                ", ".join(c for c in _SUMMARY_COLUMNS if c in present),
+            )
+        return cached[2] if summary else cached[1]
+
+    @staticmethod
+    def _column_index(row: sqlite3.Row) -> Dict[str, int]:
+        """Column name -> position, built once per result set for _row_to_unified."""
+        return {name: i for i, name in enumerate(row.keys())}
+
+    @staticmethod
+    def _summary_fields(row: sqlite3.Row, ix: Dict[str, int]) -> Dict[str, Any]:
+        """UnifiedProgramSummary fields of a programs row."""
+        # Integer indexing: Row's name lookup scans the column list each time.
+        pub_metrics = _json_loads_safe(row[ix["public_metrics"]])
+        priv_metrics = _json_loads_safe(row[ix["private_metrics"]])
         all_metrics = {**pub_metrics, **priv_metrics}
-        embedding_2d = _json_loads_safe(row["embedding_pca_2d"], [])
+        embedding_2d = _json_loads_safe(row[ix["embedding_pca_2d"]], [])
         embedding_3d = None
-        if "embedding_pca_3d" in row.keys():
-            embedding_3d = _json_loads_safe(row["embedding_pca_3d"], [])
+        if "embedding_pca_3d" in ix:
+            embedding_3d = _json_loads_safe(row[ix["embedding_pca_3d"]], [])
             if not embedding_3d or len(embedding_3d) != 3:
                 embedding_3d = None
-        migration_hist = _json_loads_safe(row["migration_history"], [])
-        archive_ids = _json_loads_safe(row["archive_inspiration_ids"], [])
-        top_k_ids = _json_loads_safe(row["top_k_inspiration_ids"], [])
-        meta = _json_loads_safe(row["metadata"])
-
-        return UnifiedProgram(
-            id=row["id"],
-            code=row["code"],
-            language=row["language"] or "python",
-            parent_id=row["parent_id"],
-            generation=row["generation"],
-            island_id=row["island_idx"],
-            timestamp=row["timestamp"],
-            score=_clean_nan(row["combined_score"]) or 0.0,
+        meta = _json_loads_safe(row[ix["metadata"]])
+
+        return dict(
+            id=row[ix["id"]],
+            language=row[ix["language"]] or "python",
+            parent_id=row[ix["parent_id"]],
+            generation=row[ix["generation"]],
+            island_id=row[ix["island_idx"]],
+            timestamp=row[ix["timestamp"]],
+            score=_clean_nan(row[ix["combined_score"]]) or 0.0,
             metrics=all_metrics,
-            correct=bool(row["correct"]),
-            complexity=_clean_nan(row["complexity"]) or 0.0,
+            correct=bool(row[ix["correct"]]),
+            complexity=_clean_nan(row[ix["complexity"]]) or 0.0,
             diversity=0.0,
-            code_diff=row["code_diff"],
-            text_feedback=row["text_feedback"] if "text_feedback" in row.keys() else None,
             embedding_2d=embedding_2d if embedding_2d else None,
             embedding_3d=embedding_3d,
-            embedding_cluster_id=row["embedding_cluster_id"],
-            children_count=row["children_count"],
+            embedding_cluster_id=row[ix["embedding_cluster_id"]],
+            children_count=row[ix["children_count"]],
             in_archive=False,  # will set below
+            metadata=meta,
+        )
+
+    def _row_to_summary(self, row: sqlite3.Row, ix: Dict[str, int]) -> UnifiedProgramSummary:
+        return UnifiedProgramSummary(**self._summary_fields(row, ix))
+
+    def _row_to_unified(self, row: sqlite3.Row, ix: Dict[str, int]) -> UnifiedProgram:
+        migration_hist = _json_loads_safe(row[ix["migration_history"]], [])
+        archive_ids = _json_loads_safe(row[ix["archive_inspiration_ids"]], [])
+        top_k_ids = _json_loads_safe(row[ix["top_k_inspiration_ids"]], [])
+
+        return UnifiedProgram(
+            **self._summary_fields(row, ix),
+            code=row[ix["code"]],
+            code_diff=row[ix["code_diff"]],
+            text_feedback=row[ix["text_feedback"]] if "text_feedback" in ix else None,
             migration_history=migration_hist,
             inspiration_ids=archive_ids + top_k_ids,
-            metadata=meta,
         )
 
     # ── public API ──────────────────────────────────────────────────
@@ -196,94 +571,147 @@ class ShinkaAdapter(FrameworkAdapter):
         score_min: Optional[float] = None,
         archive_only: bool = False,
         correct_only: bool = False,
-    ) -> Tuple[List[UnifiedProgram], int]:
-        where_clauses: List[str] = []
-        params: List[Any] = []
-
-        if island_id is not None:
-            where_clauses.append("island_idx = ?")
-            params.append(island_id)
-        if generation_min is not None:
-            where_clauses.append("generation >= ?")
-            params.append(generation_min)
-        if generation_max is not None:
-            where_clauses.append("generation <= ?")
-            params.append(generation_max)
-        if score_min is not None:
-            where_clauses.append("combined_score >= ?")
-            params.append(score_min)
-        if correct_only:
-            where_clauses.append("correct = 1")
-
-        where = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-
-        # Sort mapping
-        sort_col_map = {
-            "generation": "generation",
-            "score": "combined_score",
-            "timestamp": "timestamp",
-            "complexity": "complexity",
-            "island_id": "island_idx",
-            "children_count": "children_count",
-        }
-        sort_col = sort_col_map.get(sort_by, "generation")
-        direction = "DESC" if sort_desc else "ASC"
+    ) -> Tuple[List[UnifiedProgramSummary], int]:
+        where_clauses, params = _program_filters(
+            island_id, generation_min, generation_max, score_min, correct_only,
+        )
+
+        sort_col = _SORT_COLUMNS.get(sort_by, "generation")
+        count_sql, page_sql = _programs_sql(
+            self._program_select(summary=True), tuple(where_clauses), sort_col, sort_desc,
+        )
         offset = (page - 1) * page_size
 
-        # Count
-        count_row = self._query_one(f"SELECT COUNT(*) as cnt FROM programs {where}", tuple(params))
-        total = count_row["cnt"] if count_row else 0
+        with self._read_snapshot():
+            count_row = self._query_one(count_sql, tuple(params))
+            total = count_row["cnt"] if count_row else 0
+            rows = self._query(page_sql, tuple(params + [page_size, offset]))
 
-        # Fetch
-        rows = self._query(
-            f"SELECT * FROM programs {where} ORDER BY {sort_col} {direction} LIMIT ? OFFSET ?",
-            tuple(params + [page_size, offset]),
-        )
+        return self._page_programs(rows, archive_only), total
 
-        # Get archive set
+    @_db_retry
+    def get_programs_after(
+        self,
+        after: Optional[str] = None,
+        page_size: int = 50,
+        sort_by: str = "generation",
+        sort_desc: bool = True,
+        island_id: Optional[int] = None,
+        generation_min: Optional[int] = None,
+        generation_max: Optional[int] = None,
+        score_min: Optional[float] = None,
+        archive_only: bool = False,
+        correct_only: bool = False,
+    ) -> Tuple[List[UnifiedProgramSummary], Optional[str]]:
+        if _SORT_COLUMNS.get(sort_by, "generation") != "generation":
+            return super().get_programs_after(
+                after, page_size, sort_by, sort_desc, island_id, generation_min,
+                generation_max, score_min, archive_only, correct_only,
+            )
+        # Resume after the last row's (generation, rowid) instead of counting
+        # and skipping an OFFSET; no COUNT(*) either
+        where_clauses, params = _program_filters(
+            island_id, generation_min, generation_max, score_min, correct_only,
+        )
+        key = _cursor_key(after)
+        sql = _programs_keyset_sql(
+            self._program_select(summary=True), tuple(where_clauses), sort_desc, key is not None,
+        )
+        if key is not None:
+            params += [key[0], key[0], key[1]]
+        rows = self._query(sql, tuple(params + [page_size + 1]))
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor("k", rows[-1]["_key"], rows[-1]["_rowid"])
+        return self._page_programs(rows, archive_only), next_cursor
+
+    def _page_programs(self, rows: List[sqlite3.Row], archive_only: bool) -> List[UnifiedProgramSummary]:
         archive_set = self._get_archive_set()
-
         programs = []
+        ix = self._column_index(rows[0]) if rows else {}
         for row in rows:
-            p = self._row_to_unified(row)
+            p = self._row_to_summary(row, ix)
             p.in_archive = p.id in archive_set
             if archive_only and not p.in_archive:
                 continue
             programs.append(p)
-
-        return programs, total
+        return programs
 
     @_db_retry
     def get_program(self, program_id: str) -> Optional[UnifiedProgram]:
-        row = self._query_one("SELECT * FROM programs WHERE id = ?", (program_id,))
+        row = self._query_one(
+            f"SELECT {self._program_select()} FROM programs WHERE id = ?", (program_id,)
+        )
         if row is None:
             return None
         archive_set = self._get_archive_set()
-        p = self._row_to_unified(row)
+        p = self._row_to_unified(row, self._column_index(row))
         p.in_archive = p.id in archive_set
         return p
 
     @_db_retry
-    def get_all_programs_brief(self) -> List[Dict[str, Any]]:
+    def get_programs_by_ids(self, program_ids: List[str]) -> List[UnifiedProgram]:
+        if not program_ids:
+            return []
+        # One JSON array parameter instead of a "?" per id: no bound-parameter
+        # limit to chunk around, and one statement shape for the cache
         rows = self._query(
-            "SELECT id, parent_id, generation, island_idx, combined_score, "
-            "correct, children_count, complexity FROM programs"
+            f"SELECT {self._program_select()} FROM programs "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(program_ids)),),
         )
+        if not rows:
+            return []
         archive_set = self._get_archive_set()
-        return [
-            {
-                "id": r["id"],
-                "parent_id": r["parent_id"],
-                "generation": r["generation"],
-                "island_id": r["island_idx"],
-                "score": _clean_nan(r["combined_score"]) or 0.0,
-                "correct": bool(r["correct"]),
-                "in_archive": r["id"] in archive_set,
-                "children_count": r["children_count"],
-                "complexity": _clean_nan(r["complexity"]) or 0.0,
-            }
-            for r in rows
-        ]
+        ix = self._column_index(rows[0])
+        by_id = {}
+        for row in rows:
+            p = self._row_to_unified(row, ix)
+            p.in_archive = p.id in archive_set
+            by_id[p.id] = p
+        return [by_id[pid] for pid in program_ids if pid in by_id]
+
+    @_db_retry
+    def get_all_programs_brief(self) -> List[Dict[str, Any]]:
+        rows = self._brief_rows()
+        if not rows:
+            return []
+        cols = rows[0].keys()
+        briefs = []
+        for row in rows:
+            b = dict(zip(cols, row))
+            b["correct"] = bool(b["correct"])
+            b["in_archive"] = bool(b["in_archive"])
+            briefs.append(b)
+        return briefs
+
+    @_db_retry
+    def get_all_programs_columns(self) -> Dict[str, List[Any]]:
+        rows = self._brief_rows()
+        if not rows:
+            return {}
+        columns = {key: list(values) for key, values in zip(rows[0].keys(), zip(*rows))}
+        columns["correct"] = [bool(v) for v in columns["correct"]]
+        columns["in_archive"] = [bool(v) for v in columns["in_archive"]]
+        return columns
+
+    def _brief_rows(self) -> List[sqlite3.Row]:
+        select = (
+            f"SELECT p.id AS id, p.parent_id AS parent_id, p.generation AS generation, "
+            f"p.island_idx AS island_id, {_SCORE_OF.format('p.combined_score')} AS score, "
+            f"p.correct AS correct, {{archived}} AS in_archive, "
+            f"p.children_count AS children_count, "
+            f"{_SCORE_OF.format('p.complexity')} AS complexity FROM programs p"
+        )
+        try:
+            return self._query(
+                select.format(archived="a.program_id IS NOT NULL")
+                + " LEFT JOIN archive a ON a.program_id = p.id"
+            )
+        except sqlite3.OperationalError:
+            # No archive table: nothing is archived
+            return self._query(select.format(archived="0"))
 
     @_db_retry
     def get_conversations(
@@ -294,149 +722,140 @@ class ShinkaAdapter(FrameworkAdapter):
         island_id: Optional[int] = None,
     ) -> Tuple[List[ConversationEntry], int]:
         """ShinkaEvolve doesn't store prompts separately — build from program data."""
-        where_parts: List[str] = []
-        params: List[Any] = []
+        where_parts, params = _conversation_filters(improvements_only, island_id)
+        where = "WHERE " + " AND ".join(where_parts) if where_parts else ""
+        joined = f"{_CONVERSATION_FROM} {where}"
+
+        with self._read_snapshot():
+            count_row = self._query_one(f"SELECT COUNT(*) AS cnt {joined}", tuple(params))
+            total = count_row["cnt"] if count_row else 0
+            rows = self._query(
+                f"""SELECT {_CONVERSATION_SELECT}
+                    {joined}
+                    ORDER BY {_CONVERSATION_KEY} DESC, p.rowid
+                    LIMIT ? OFFSET ?""",
+                tuple(params) + (page_size, (page - 1) * page_size),
+            )
 
-        if island_id is not None:
-            where_parts.append("p.island_idx = ?")
-            params.append(island_id)
+        return [_conversation_entry(r) for r in rows], total
 
+    @_db_retry
+    def get_conversations_after(
+        self,
+        after: Optional[str] = None,
+        page_size: int = 50,
+        improvements_only: bool = False,
+        island_id: Optional[int] = None,
+    ) -> Tuple[List[ConversationEntry], Optional[str]]:
+        where_parts, params = _conversation_filters(improvements_only, island_id)
+        key = _cursor_key(after)
+        if key is not None:
+            where_parts.append(
+                f"({_CONVERSATION_KEY} < ? OR ({_CONVERSATION_KEY} = ? AND p.rowid > ?))"
+            )
+            params += [key[0], key[0], key[1]]
         where = "WHERE " + " AND ".join(where_parts) if where_parts else ""
-
         rows = self._query(
-            f"""SELECT p.id, p.parent_id, p.generation, p.island_idx, p.timestamp,
-                       p.combined_score, p.code_diff, p.text_feedback,
-                       parent.combined_score as parent_score
-                FROM programs p
-                LEFT JOIN programs parent ON p.parent_id = parent.id
-                {where}
-                ORDER BY p.timestamp DESC""",
-            tuple(params),
+            f"""SELECT {_CONVERSATION_SELECT}, {_CONVERSATION_KEY} AS _key, p.rowid AS _rowid
+                {_CONVERSATION_FROM} {where}
+                ORDER BY {_CONVERSATION_KEY} DESC, p.rowid
+                LIMIT ?""",
+            tuple(params) + (page_size + 1,),
         )
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor("k", rows[-1]["_key"], rows[-1]["_rowid"])
+        return [_conversation_entry(r) for r in rows], next_cursor
 
-        entries = []
-        for r in rows:
-            parent_score = _clean_nan(r["parent_score"]) or 0.0
-            child_score = _clean_nan(r["combined_score"]) or 0.0
-            delta = child_score - parent_score
-
-            if improvements_only and delta <= 0:
-                continue
-
-            entries.append(ConversationEntry(
-                program_id=r["id"],
-                parent_id=r["parent_id"],
-                generation=r["generation"],
-                island_id=r["island_idx"],
-                timestamp=r["timestamp"],
-                score=child_score,
-                parent_score=parent_score,
-                improvement_delta=delta,
-                code_diff=r["code_diff"],
-            ))
-
-        total = len(entries)
-        start = (page - 1) * page_size
-        return entries[start:start + page_size], total
-
+    @_stamp_cached
     @_db_retry
     def get_metrics(self) -> MetricsSummary:
-        rows = self._query(
-            "SELECT generation, combined_score, timestamp, island_idx, correct FROM programs"
-        )
-        if not rows:
-            return MetricsSummary()
-
-        scores = [_clean_nan(r["combined_score"]) or 0.0 for r in rows]
-        timestamps = [r["timestamp"] for r in rows]
-        generations = [r["generation"] for r in rows]
-
-        time_min = min(timestamps)
-        time_max = max(timestamps)
-        elapsed = time_max - time_min
-
-        # Best by generation
-        gen_best: Dict[int, float] = {}
-        gen_scores: Dict[int, List[float]] = {}
-        island_gen_best: Dict[int, Dict[int, float]] = {}
+        with self._read_snapshot():
+            summary = self._query_one(
+                f"SELECT COUNT(*) AS n, MIN(timestamp) AS t0, MAX(timestamp) AS t1, "
+                f"AVG({_SCORE}) AS mean, MAX(generation) AS gen, "
+                f"SUM({_SCORE} > 0 AND correct) AS improvements FROM programs"
+            )
+            if not summary or not summary["n"]:
+                return MetricsSummary()
+            scores = [r[0] for r in self._query(f"SELECT {_SCORE} AS s FROM programs ORDER BY s")]
+            # Per-generation best is floored at 0, as the chart baseline.
+            gen_rows = self._query(
+                f"SELECT generation, max(MAX({_SCORE}), 0.0) AS best, AVG({_SCORE}) AS mean "
+                f"FROM programs GROUP BY generation ORDER BY generation"
+            )
+            island_rows = self._query(
+                f"SELECT island_idx, generation, max(MAX({_SCORE}), 0.0) AS best FROM programs "
+                f"WHERE island_idx IS NOT NULL "
+                f"GROUP BY island_idx, generation ORDER BY island_idx, generation"
+            )
 
-        for r in rows:
-            g = r["generation"]
-            s = _clean_nan(r["combined_score"]) or 0.0
-            gen_best[g] = max(gen_best.get(g, 0), s)
-            gen_scores.setdefault(g, []).append(s)
-
-            isl = r["island_idx"]
-            if isl is not None:
-                island_gen_best.setdefault(isl, {})[g] = max(
-                    island_gen_best.get(isl, {}).get(g, 0), s
-                )
+        total = summary["n"]
+        # scores arrive sorted, so the median is read off the middle
+        mid = len(scores) // 2
+        median = scores[mid] if len(scores) % 2 else (scores[mid - 1] + scores[mid]) / 2
+        t0, t1 = summary["t0"], summary["t1"]
+        elapsed = t1 - t0 if t0 is not None else 0.0
 
-        best_history = [
-            TimeSeriesPoint(generation=g, value=v) for g, v in sorted(gen_best.items())
-        ]
+        best_history = []
+        mean_history = []
         running_max = 0.0
-        for pt in best_history:
-            running_max = max(running_max, pt.value)
-            pt.value = running_max
-
-        mean_history = [
-            TimeSeriesPoint(generation=g, value=statistics.mean(ss))
-            for g, ss in sorted(gen_scores.items())
-        ]
-
-        per_island = {
-            isl: [TimeSeriesPoint(generation=g, value=v) for g, v in sorted(gb.items())]
-            for isl, gb in island_gen_best.items()
-        }
-
-        ppm = len(rows) / (elapsed / 60) if elapsed > 0 else 0
+        for r in gen_rows:
+            running_max = max(running_max, r["best"])
+            best_history.append(TimeSeriesPoint(generation=r["generation"], value=running_max))
+            mean_history.append(TimeSeriesPoint(generation=r["generation"], value=r["mean"]))
+
+        per_island: Dict[int, List[TimeSeriesPoint]] = {}
+        for r in island_rows:
+            per_island.setdefault(r["island_idx"], []).append(
+                TimeSeriesPoint(generation=r["generation"], value=r["best"])
+            )
 
-        # Improvement rate
-        improvements = sum(1 for r in rows if (_clean_nan(r["combined_score"]) or 0) > 0 and r["correct"])
-        imp_rate = improvements / len(rows) if rows else 0
+        ppm = total / (elapsed / 60) if elapsed > 0 else 0
 
         return MetricsSummary(
-            total_programs=len(rows),
-            best_score=max(scores),
-            mean_score=statistics.mean(scores),
-            median_score=statistics.median(scores),
-            current_generation=max(generations),
+            total_programs=total,
+            best_score=scores[-1],
+            mean_score=summary["mean"],
+            median_score=median,
+            current_generation=summary["gen"],
             programs_per_minute=ppm,
-            improvement_rate=imp_rate,
+            improvement_rate=(summary["improvements"] or 0) / total,
             time_elapsed=elapsed,
             best_score_history=best_history,
             mean_score_history=mean_history,
             per_island_best=per_island,
-            score_distribution=sorted(scores),
+            score_distribution=scores,
         )
 
     @_db_retry
     def get_islands(self) -> Tuple[List[IslandState], List[MigrationEvent]]:
         rows = self._query(
-            """SELECT island_idx, COUNT(*) as cnt,
-                      MAX(combined_score) as best,
-                      MAX(generation) as gen
-               FROM programs
-               WHERE island_idx IS NOT NULL
-               GROUP BY island_idx
+            """SELECT island_idx, cnt, best, gen, id FROM (
+                   SELECT island_idx, id,
+                          COUNT(*) OVER w AS cnt,
+                          MAX(combined_score) OVER w AS best,
+                          MAX(generation) OVER w AS gen,
+                          ROW_NUMBER() OVER (w ORDER BY combined_score DESC) AS rn
+                   FROM programs
+                   WHERE island_idx IS NOT NULL
+                   WINDOW w AS (PARTITION BY island_idx)
+               )
+               WHERE rn = 1
                ORDER BY island_idx"""
         )
 
-        islands = []
-        for r in rows:
-            # Find best program for this island
-            best_row = self._query_one(
-                "SELECT id FROM programs WHERE island_idx = ? ORDER BY combined_score DESC LIMIT 1",
-                (r["island_idx"],),
-            )
-            islands.append(IslandState(
+        islands = [
+            IslandState(
                 island_id=r["island_idx"],
                 program_count=r["cnt"],
                 best_score=_clean_nan(r["best"]) or 0.0,
-                best_program_id=best_row["id"] if best_row else None,
+                best_program_id=r["id"],
                 current_generation=r["gen"],
-            ))
+            )
+            for r in rows
+        ]
 
         # Migration events from migration_history in programs
         migrations: List[MigrationEvent] = []
@@ -458,12 +877,39 @@ class ShinkaAdapter(FrameworkAdapter):
         migrations.sort(key=lambda m: m.timestamp)
         return islands, migrations
 
+    @_stamp_cached
     @_db_retry
     def get_lineage(self, program_id: Optional[str] = None) -> LineageTree:
-        rows = self._query(
-            "SELECT id, parent_id, generation, island_idx, combined_score, children_count FROM programs"
-        )
-        archive_set = self._get_archive_set()
+        cols = f"id, parent_id, generation, island_idx, {_SCORE} AS score"
+        with self._read_snapshot():
+            rows = []
+            if program_id:
+                # Only the requested subtree; UNION also stops on parent cycles.
+                rows = self._query(
+                    f"""WITH RECURSIVE sub(id) AS (
+                            SELECT id FROM programs WHERE id = ?
+                            UNION
+                            SELECT p.id FROM programs p JOIN sub ON p.parent_id = sub.id
+                        )
+                        SELECT {cols} FROM programs WHERE id IN sub""",
+                    (program_id,),
+                )
+            subtree = bool(rows)
+            if not subtree:
+                rows = self._query(f"SELECT {cols} FROM programs")
+
+            # Golden path: ancestors of the best program, as (id, parent_id)
+            path_rows = self._query(
+                """WITH RECURSIVE anc(id, parent_id) AS (
+                       SELECT id, parent_id FROM (
+                           SELECT id, parent_id FROM programs
+                           ORDER BY combined_score DESC LIMIT 1
+                       )
+                       UNION
+                       SELECT p.id, p.parent_id FROM programs p JOIN anc ON p.id = anc.parent_id
+                   )
+                   SELECT id, parent_id FROM anc"""
+            )
 
         nodes: Dict[str, LineageNode] = {}
         for r in rows:
@@ -472,69 +918,83 @@ class ShinkaAdapter(FrameworkAdapter):
                 parent_id=r["parent_id"],
                 generation=r["generation"],
                 island_id=r["island_idx"],
-                score=_clean_nan(r["combined_score"]) or 0.0,
+                score=r["score"],
             )
 
         for nid, node in nodes.items():
             if node.parent_id and node.parent_id in nodes:
                 nodes[node.parent_id].children.append(nid)
 
-        root_ids = [nid for nid, n in nodes.items() if n.parent_id is None or n.parent_id not in nodes]
+        if subtree:
+            root_ids = [program_id]
+        else:
+            root_ids = [nid for nid, n in nodes.items() if n.parent_id is None or n.parent_id not in nodes]
 
-        # Golden path
-        best_row = self._query_one("SELECT id FROM programs ORDER BY combined_score DESC LIMIT 1")
         best_path: List[str] = []
-        if best_row:
-            curr = best_row["id"]
-            while curr and curr in nodes:
+        if path_rows:
+            parent_of = {r["id"]: r["parent_id"] for r in path_rows}
+            curr = path_rows[0]["id"]
+            while curr in parent_of:
                 best_path.append(curr)
-                curr = nodes[curr].parent_id
+                curr = parent_of.pop(curr)
             best_path.reverse()
 
-        if program_id and program_id in nodes:
-            subtree_ids = set()
-            stack = [program_id]
-            while stack:
-                nid = stack.pop()
-                subtree_ids.add(nid)
-                if nid in nodes:
-                    stack.extend(nodes[nid].children)
-            nodes = {k: v for k, v in nodes.items() if k in subtree_ids}
-            root_ids = [program_id]
-
         return LineageTree(nodes=nodes, root_ids=root_ids, best_path=best_path)
 
     @_db_retry
     def search_code(self, query: str, max_results: int = 50) -> List[UnifiedProgram]:
+        # Escape LIKE's wildcards so the query matches literally, as it does
+        # for OpenEvolve; LIKE stays ASCII case-insensitive without lowering
+        # every row's code
+        pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
         rows = self._query(
-            "SELECT * FROM programs WHERE code LIKE ? LIMIT ?",
-            (f"%{query}%", max_results),
+            f"SELECT {self._program_select()} FROM programs "
+            "WHERE code LIKE ? ESCAPE '\\' LIMIT ?",
+            (f"%{pattern}%", max_results),
         )
+        if not rows:
+            return []
         archive_set = self._get_archive_set()
+        ix = self._column_index(rows[0])
         return [
-            self._set_archive(self._row_to_unified(r), archive_set)
+            self._set_archive(self._row_to_unified(r, ix), archive_set)
             for r in rows
         ]
 
     def get_last_modified(self) -> float:
-        if os.path.exists(self._db_path):
-            return os.path.getmtime(self._db_path)
-        return 0.0
+        # In WAL mode commits land in the -wal file until a checkpoint, so the
+        # main file's mtime alone can lag behind a running experiment
+        try:
+            mtime = os.stat(self._db_path).st_mtime
+        except OSError:
+            return 0.0
+        try:
+            wal = os.stat(self._db_path + "-wal")
+        except OSError:
+            return mtime
+        return max(mtime, wal.st_mtime) if wal.st_size else mtime
 
+    @_stamp_cached
     @_db_retry
     def get_analytics(self) -> AnalyticsSummary:
+        # One JSON parse per row in SQLite pulls out just the fields used below,
+        # as a small JSON array. Rows whose metadata SQLite can't parse (e.g.
+        # NaN literals) come back raw and are decoded in Python instead.
+        paths = ", ".join(f"'{p}'" for p in _ANALYTICS_PATHS)
         rows = self._query(
-            "SELECT id, generation, timestamp, combined_score, parent_id, metadata "
-            "FROM programs ORDER BY timestamp"
+            f"""SELECT p.generation,
+                       {_SCORE_OF.format("p.combined_score")} AS score,
+                       CASE WHEN parent.id IS NOT NULL
+                            THEN {_SCORE_OF.format("parent.combined_score")} END AS parent_score,
+                       CASE WHEN json_valid(p.metadata)
+                            THEN json_extract(p.metadata, {paths}) END AS fields,
+                       CASE WHEN json_valid(p.metadata) THEN NULL ELSE p.metadata END AS raw
+                FROM programs p LEFT JOIN programs parent ON p.parent_id = parent.id
+                ORDER BY p.timestamp"""
         )
         if not rows:
             return AnalyticsSummary()
 
-        # Build parent score lookup
-        parent_scores: Dict[str, float] = {}
-        for r in rows:
-            parent_scores[r["id"]] = _clean_nan(r["combined_score"]) or 0.0
-
         total_api = 0.0
         total_embed = 0.0
         total_novelty = 0.0
@@ -550,51 +1010,54 @@ class ShinkaAdapter(FrameworkAdapter):
         patch_dist: Dict[str, int] = {}
 
         for r in rows:
-            meta = _json_loads_safe(r["metadata"])
+            values = _json_loads_safe(r["fields"], []) if r["fields"] is not None else []
+            if len(values) != len(_ANALYTICS_PATHS):
+                values = _extract_paths(_json_loads_safe(r["raw"]), _ANALYTICS_PATHS)
+            (api_cost, embed_cost, novelty_cost, meta_cost,
+             llm_model_name, meta_model_name, posteriors, patch_type) = values
             gen = r["generation"]
-            score = _clean_nan(r["combined_score"]) or 0.0
 
             # Costs
-            api_cost = meta.get("api_costs", 0) or 0
-            embed_cost = meta.get("embed_cost", 0) or 0
-            novelty_cost = meta.get("novelty_cost", 0) or 0
-            meta_cost = meta.get("meta_cost", 0) or 0
+            api_cost = api_cost or 0
+            embed_cost = embed_cost or 0
+            novelty_cost = novelty_cost or 0
+            meta_cost = meta_cost or 0
 
             total_api += api_cost
             total_embed += embed_cost
             total_novelty += novelty_cost
             total_meta += meta_cost
 
-            gc = gen_costs.setdefault(gen, {"api": 0, "embed": 0, "novelty": 0, "meta": 0})
+            gc = gen_costs.get(gen)
+            if gc is None:
+                gc = gen_costs[gen] = {"api": 0, "embed": 0, "novelty": 0, "meta": 0}
             gc["api"] += api_cost
             gc["embed"] += embed_cost
             gc["novelty"] += novelty_cost
             gc["meta"] += meta_cost
 
             # Model usage
-            llm_result = meta.get("llm_result", {}) or {}
-            model_name = llm_result.get("model_name") or meta.get("model_name")
+            model_name = llm_model_name or meta_model_name
             if model_name:
-                ms = model_stats.setdefault(model_name, {
-                    "uses": 0, "cost": 0.0, "improvements": 0, "deltas": [],
-                })
+                ms = model_stats.get(model_name)
+                if ms is None:
+                    ms = model_stats[model_name] = {
+                        "uses": 0, "cost": 0.0, "improvements": 0, "deltas": [],
+                    }
                 ms["uses"] += 1
                 ms["cost"] += api_cost
 
-                parent_id = r["parent_id"]
-                if parent_id and parent_id in parent_scores:
-                    delta = score - parent_scores[parent_id]
+                if r["parent_score"] is not None:
+                    delta = r["score"] - r["parent_score"]
                     ms["deltas"].append(delta)
                     if delta > 0:
                         ms["improvements"] += 1
 
             # Model posteriors
-            posteriors = llm_result.get("model_posteriors")
             if posteriors and isinstance(posteriors, dict):
                 gen_posteriors[gen] = posteriors
 
             # Patch type
-            patch_type = meta.get("patch_type")
             if patch_type:
                 patch_dist[patch_type] = patch_dist.get(patch_type, 0) + 1
 
@@ -646,10 +1109,11 @@ class ShinkaAdapter(FrameworkAdapter):
             patch_type_distribution=patch_dist,
         )
 
+    @_stamp_cached
     @_db_retry
     def get_embeddings(self, max_programs: int = 200) -> Dict[str, Any]:
         rows = self._query(
-            "SELECT id, combined_score, generation, island_idx, embedding, embedding_cluster_id "
+            f"SELECT id, {_SCORE} AS score, generation, island_idx, embedding, embedding_cluster_id "
             "FROM programs WHERE embedding IS NOT NULL AND embedding != '[]' "
             "ORDER BY combined_score DESC LIMIT ?",
             (max_programs,),
@@ -670,7 +1134,7 @@ class ShinkaAdapter(FrameworkAdapter):
                 continue
             embeddings.append(emb)
             program_ids.append(r["id"])
-            scores_list.append(_clean_nan(r["combined_score"]) or 0.0)
+            scores_list.append(r["score"])
             generations.append(r["generation"])
             islands.append(r["island_idx"])
             cluster_ids.append(r["embedding_cluster_id"])
@@ -678,34 +1142,12 @@ class ShinkaAdapter(FrameworkAdapter):
         if len(embeddings) < 2:
             return {}
 
-        # Compute cosine similarity matrix
-        try:
-            import numpy as np
-
-            mat = np.array(embeddings, dtype=np.float32)
-            norms = np.linalg.norm(mat, axis=1, keepdims=True)
-            norms = np.maximum(norms, 1e-10)
-            normalized = mat / norms
-            similarity = (normalized @ normalized.T).tolist()
-        except ImportError:
-            # Fallback without numpy — compute manually
-            n = len(embeddings)
-            similarity = [[0.0] * n for _ in range(n)]
-            for i in range(n):
-                for j in range(i, n):
-                    dot = sum(a * b for a, b in zip(embeddings[i], embeddings[j]))
-                    norm_i = sum(a * a for a in embeddings[i]) ** 0.5
-                    norm_j = sum(a * a for a in embeddings[j]) ** 0.5
-                    sim = dot / max(norm_i * norm_j, 1e-10)
-                    similarity[i][j] = round(sim, 4)
-                    similarity[j][i] = round(sim, 4)
-
         return {
             "program_ids": program_ids,
             "scores": scores_list,
             "generations": generations,
             "islands": islands,
-            "similarity_matrix": similarity,
+            "similarity_matrix": _cosine_matrix(embeddings),
             "cluster_ids": cluster_ids,
         }
 
@@ -715,69 +1157,114 @@ class ShinkaAdapter(FrameworkAdapter):
         return "se_" + Path(self._db_path).stem.replace(" ", "_")
 
     def _infer_status(self) -> ExperimentStatus:
-        from backend.config import STATUS_RUNNING_THRESHOLD, STATUS_PAUSED_THRESHOLD
-
-        last_mod = self.get_last_modified()
-        if last_mod == 0:
-            return ExperimentStatus.UNKNOWN
-        age = _time.time() - last_mod
-        if age < STATUS_RUNNING_THRESHOLD:
-            return ExperimentStatus.RUNNING
-        if age < STATUS_PAUSED_THRESHOLD:
-            return ExperimentStatus.PAUSED
-        return ExperimentStatus.COMPLETED
-
-    def _get_archive_set(self) -> set:
+        return infer_status(self.get_last_modified())
+
+    def _db_stamp(self) -> Tuple[int, ...]:
+        """(mtime_ns, size) of the database and its WAL; changes on every commit.
+
+        An empty WAL counts as absent: readers create one on open.
+        """
+        stamp: Tuple[int, ...] = ()
+        for path in (self._db_path, self._db_path + "-wal"):
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp += (0, 0)
+            else:
+                stamp += (st.st_mtime_ns, st.st_size) if st.st_size else (0, 0)
+        return stamp
+
+    def _get_archive_set(self) -> FrozenSet[str]:
+        stamp = self._db_stamp()
+        cached = self._archive_cache
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
         try:
             rows = self._query("SELECT program_id FROM archive")
-            return {r["program_id"] for r in rows}
+            archive = frozenset(r["program_id"] for r in rows)
         except Exception:
-            return set()
+            return frozenset()
+        self._archive_cache = (stamp, archive)
+        return archive
 
-    def _set_archive(self, prog: UnifiedProgram, archive_set: set) -> UnifiedProgram:
+    def _set_archive(self, prog: UnifiedProgram, archive_set: FrozenSet[str]) -> UnifiedProgram:
         prog.in_archive = prog.id in archive_set
         return prog
 
     def _load_config(self) -> Optional[Dict[str, Any]]:
-        """Try to find config near the database file."""
+        """Try to find config near the database file.
+
+        The parsed result is kept until one of the candidate files changes.
+        """
         db_dir = os.path.dirname(self._db_path)
-        candidates = [
-            os.path.join(db_dir, "config.yaml"),
-            os.path.join(db_dir, "config.yml"),
-            os.path.join(db_dir, ".hydra", "config.yaml"),
-            os.path.join(db_dir, ".hydra", "overrides.yaml"),
-        ]
-        for path in candidates:
-            if os.path.exists(path):
+        stamp: List[Optional[Tuple[int, int]]] = []
+        for name in _CONFIG_CANDIDATES:
+            try:
+                st = os.stat(os.path.join(db_dir, name))
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_mtime_ns, st.st_size))
+        key = tuple(stamp)
+        cached = self._config_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        config = None
+        for name, st in zip(_CONFIG_CANDIDATES, key):
+            if st is None:
+                continue
+            path = os.path.join(db_dir, name)
+            try:
+                import yaml
+                with open(path) as f:
+                    config = yaml.safe_load(f)
+                break
+            except Exception:
                 try:
-                    import yaml
                     with open(path) as f:
-                        return yaml.safe_load(f)
-                except Exception:
-                    try:
-                        with open(path) as f:
-                            return {"raw": f.read()}
-                    except IOError:
-                        pass
-        return None
+                        config = {"raw": f.read()}
+                    break
+                except IOError:
+                    pass
+        self._config_cache = (key, config)
+        return config
 
     def get_meta_files(self) -> List[Dict[str, Any]]:
-        """List meta_N.txt files near the database."""
+        """List meta_N.txt files near the database.
+
+        The directory is only re-listed when its mtime changes; sizes are
+        always re-read since a file can grow after it is created.
+        """
         db_dir = os.path.dirname(self._db_path)
+        dir_mtime = os.stat(db_dir).st_mtime_ns
+        cached = self._meta_names_cache
+        if cached is not None and cached[0] == dir_mtime:
+            names = cached[1]
+        else:
+            with os.scandir(db_dir) as it:
+                names = sorted(
+                    e.name for e in it if e.name.startswith("meta_") and e.name.endswith(".txt")
+                )
+            self._meta_names_cache = (dir_mtime, names)
+
         meta_files = []
-        for f in sorted(os.listdir(db_dir)):
-            if f.startswith("meta_") and f.endswith(".txt"):
-                fpath = os.path.join(db_dir, f)
-                try:
-                    gen = int(f.replace("meta_", "").replace(".txt", ""))
-                except ValueError:
-                    gen = 0
-                meta_files.append({
-                    "filename": f,
-                    "generation": gen,
-                    "path": fpath,
-                    "size": os.path.getsize(fpath),
-                })
+        for f in names:
+            fpath = os.path.join(db_dir, f)
+            try:
+                size = os.stat(fpath).st_size
+            except OSError:
+                continue  # removed since the listing
+            try:
+                gen = int(f[len("meta_"):-len(".txt")])
+            except ValueError:
+                gen = 0
+            meta_files.append({
+                "filename": f,
+                "generation": gen,
+                "path": fpath,
+                "size": size,
+            })
         return meta_files
 
     def get_meta_content(self, generation: int) -> Optional[str]:
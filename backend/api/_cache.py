@@ -0,0 +1,128 @@
+"""Short-lived cache of encoded endpoint responses.
+
+Dashboards poll the list and aggregate endpoints every second or two while
+the underlying experiment data changes far less often. Responses are cached
+by endpoint, experiment, query parameters and the adapter's data version,
+and stored already encoded, so a repeat GET skips both the adapter call and
+JSON serialization.
+
+Each encoded body also carries an ETag, so a client that already holds the
+current page gets an empty 304 instead of the body.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from backend.config import API_CACHE_SIZE, API_CACHE_TTL
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion.
+
+    Only touched from the event loop, so no locking.
+    """
+
+    __slots__ = ("ttl", "maxsize", "_data")
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        data = self._data
+        data[key] = (time.monotonic() + self.ttl, value)
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+response_cache = TTLCache(API_CACHE_TTL, API_CACHE_SIZE)
+
+
+def _etag(body: bytes) -> str:
+    # Weak: GZipMiddleware may re-encode the same representation
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip() for t in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+def cached(func: Callable) -> Callable:
+    """Cache an experiment endpoint's encoded response.
+
+    The endpoint must take ``adapter`` from ``get_adapter_dep`` and return a
+    pydantic model.
+    The model is encoded here and returned as a ready Response, so FastAPI's
+    response_model pass (validating the adapter's own models again, then
+    serializing) is skipped whether or not the cache is enabled; the
+    response_model still documents the route in OpenAPI. Errors and non-model
+    results pass straight through uncached.
+
+    Responses carry an ETag derived from the body, and a matching
+    If-None-Match is answered with 304. The wrapper takes the Request
+    itself, so endpoints don't need to declare it.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*, _request: Request, **kwargs):
+        adapter = kwargs["adapter"]
+        use_cache = response_cache.ttl > 0
+        # Adapter versions are unique across experiments, so the version
+        # stands in for the experiment id
+        params = tuple(sorted((k, v) for k, v in kwargs.items() if k != "adapter"))
+        key = (name, adapter.version, params)
+        entry = response_cache.get(key) if use_cache else None
+        if entry is None:
+            result = await func(**kwargs)
+            if not isinstance(result, BaseModel):
+                return result
+            # Large pages take a while to encode; keep that off the event loop
+            body = (await run_in_threadpool(result.model_dump_json)).encode()
+            entry = (_etag(body), body)
+            if use_cache:
+                response_cache.set(key, entry)
+
+        etag, body = entry
+        if _not_modified(_request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json",
+                        headers={"ETag": etag})
+
+    sig = inspect.signature(func)
+    wrapper.__signature__ = sig.replace(parameters=[
+        *sig.parameters.values(),
+        inspect.Parameter("_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+    ])
+    return wrapper
@@ -0,0 +1,23 @@
+"""Shared construction of paginated list responses."""
+
+from __future__ import annotations
+
+from typing import Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+
+PageT = TypeVar("PageT", bound=BaseModel)
+
+
+def total_pages(total: int, page_size: int) -> int:
+    """Number of pages for total items; an empty listing still has one page."""
+    return (total + page_size - 1) // page_size if total else 1
+
+
+def paginate(response_cls: Type[PageT], items: Sequence, total: int,
+             page: int, page_size: int) -> PageT:
+    """Build a list response carrying the standard pagination fields."""
+    return response_cls(
+        items=items, total=total, page=page, page_size=page_size,
+        total_pages=total_pages(total, page_size),
+    )
@@ -1,28 +1,24 @@
 """Analytics endpoints — LLM cost tracking, model posteriors, embeddings."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 
+from backend.adapters.base import FrameworkAdapter
+from backend.api._cache import cached
+from backend.api.deps import get_adapter_dep
 from backend.models.api import AnalyticsResponse
-from backend.services.experiment_manager import manager
 
 router = APIRouter(prefix="/experiments/{experiment_id}", tags=["analytics"])
 
 
 @router.get("/analytics", response_model=AnalyticsResponse)
-async def get_analytics(experiment_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
-    analytics = adapter.get_analytics()
+@cached
+async def get_analytics(adapter: FrameworkAdapter = Depends(get_adapter_dep)):
+    analytics = await run_in_threadpool(adapter.get_analytics)
     return AnalyticsResponse(analytics=analytics)
 
 
 @router.get("/embeddings")
-async def get_embeddings(experiment_id: str, max_programs: int = Query(200, le=500)):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
-    data = adapter.get_embeddings(max_programs=max_programs)
+async def get_embeddings(adapter: FrameworkAdapter = Depends(get_adapter_dep), max_programs: int = Query(200, le=500)):
+    data = await run_in_threadpool(adapter.get_embeddings, max_programs=max_programs)
     return data
@@ -1,28 +1,45 @@
 """Conversation endpoints."""
 
-import math
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from backend.adapters.base import FrameworkAdapter
+from backend.api._cache import cached
+from backend.api._pagination import paginate
+from backend.api.deps import get_adapter_dep
 from backend.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
-from backend.models.api import ConversationListResponse
-from backend.services.experiment_manager import manager
+from backend.models.api import ConversationCursorResponse, ConversationListResponse
 
 router = APIRouter(prefix="/experiments/{experiment_id}", tags=["conversations"])
 
 
-@router.get("/conversations", response_model=ConversationListResponse)
+@router.get(
+    "/conversations",
+    response_model=Union[ConversationListResponse, ConversationCursorResponse],
+)
+@cached
 async def list_conversations(
-    experiment_id: str,
+    adapter: FrameworkAdapter = Depends(get_adapter_dep),
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     improvements_only: bool = Query(False),
     island_id: Optional[int] = Query(None),
+    after: Optional[str] = Query(
+        None, description="Cursor paging: next_cursor from the previous page, empty for the first"
+    ),
 ):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
+    if after is not None:
+        try:
+            items, next_cursor = adapter.get_conversations_after(
+                after=after,
+                page_size=page_size,
+                improvements_only=improvements_only,
+                island_id=island_id,
+            )
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+        return ConversationCursorResponse(items=items, page_size=page_size, next_cursor=next_cursor)
 
     items, total = adapter.get_conversations(
         page=page,
@@ -30,7 +47,4 @@ async def list_conversations(
         improvements_only=improvements_only,
         island_id=island_id,
     )
-    total_pages = math.ceil(total / page_size) if total > 0 else 1
-    return ConversationListResponse(
-        items=items, total=total, page=page, page_size=page_size, total_pages=total_pages
-    )
+    return paginate(ConversationListResponse, items, total, page, page_size)
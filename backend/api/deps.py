@@ -0,0 +1,17 @@
+"""Shared FastAPI dependencies for the experiment-scoped routers."""
+
+from fastapi import HTTPException
+
+from backend.adapters.base import FrameworkAdapter
+from backend.services.experiment_manager import manager
+
+
+async def get_adapter_dep(experiment_id: str) -> FrameworkAdapter:
+    """The experiment's adapter; 404 if no such experiment is registered.
+
+    Async so FastAPI resolves it inline rather than on the thread pool.
+    """
+    adapter = manager.get_adapter(experiment_id)
+    if adapter is None:
+        raise HTTPException(404, f"Experiment {experiment_id} not found")
+    return adapter
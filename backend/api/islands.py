@@ -2,69 +2,60 @@
 
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 
-from backend.adapters.shinka_adapter import ShinkaAdapter
+from backend.adapters.base import FrameworkAdapter
+from backend.api._cache import cached
+from backend.api.deps import get_adapter_dep
 from backend.models.api import IslandsResponse
-from backend.services.experiment_manager import manager
+from backend.models.unified import UnifiedProgram
 
 router = APIRouter(prefix="/experiments/{experiment_id}", tags=["islands"])
 
 
 @router.get("/islands", response_model=IslandsResponse)
-async def get_islands(experiment_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
+@cached
+async def get_islands(adapter: FrameworkAdapter = Depends(get_adapter_dep)):
     islands, migrations = adapter.get_islands()
     return IslandsResponse(islands=islands, migrations=migrations)
 
 
 @router.get("/lineage")
-async def get_lineage(experiment_id: str, program_id: Optional[str] = None):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
+async def get_lineage(adapter: FrameworkAdapter = Depends(get_adapter_dep), program_id: Optional[str] = None):
     tree = adapter.get_lineage(program_id=program_id)
     return {"tree": tree}
 
 
 @router.get("/best-path")
-async def get_best_path(experiment_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
+async def get_best_path(adapter: FrameworkAdapter = Depends(get_adapter_dep)):
+    body = await run_in_threadpool(_best_path_json, adapter)
+    return Response(content=body, media_type="application/json")
+
+
+_BEST_PATH = TypeAdapter(Dict[str, List[UnifiedProgram]])
 
+
+def _best_path_json(adapter: FrameworkAdapter) -> bytes:
+    """Walk, fetch and encode the best path on a worker thread.
+
+    Path programs carry full code and prompts; dumping them to dicts and
+    then JSON on the event loop stalled other requests and WS heartbeats.
+    """
     tree = adapter.get_lineage()
-    path_programs = []
-    for pid in tree.best_path:
-        prog = adapter.get_program(pid)
-        if prog:
-            path_programs.append(prog.model_dump())
-    return {"path": path_programs}
+    programs = adapter.get_programs_by_ids(tree.best_path)
+    return _BEST_PATH.dump_json({"path": programs})
 
 
 @router.get("/meta-files")
-async def get_meta_files(experiment_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
-    if isinstance(adapter, ShinkaAdapter):
-        return {"files": adapter.get_meta_files()}
-    return {"files": []}
+async def get_meta_files(adapter: FrameworkAdapter = Depends(get_adapter_dep)):
+    return {"files": adapter.get_meta_files()}
 
 
 @router.get("/meta-content/{generation}")
-async def get_meta_content(experiment_id: str, generation: int):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
-    if isinstance(adapter, ShinkaAdapter):
-        content = adapter.get_meta_content(generation)
-        if content is not None:
-            return {"content": content, "generation": generation}
+async def get_meta_content(generation: int, adapter: FrameworkAdapter = Depends(get_adapter_dep)):
+    content = adapter.get_meta_content(generation)
+    if content is not None:
+        return {"content": content, "generation": generation}
     raise HTTPException(404, "Meta file not found")
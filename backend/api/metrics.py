@@ -1,18 +1,18 @@
 """Metrics endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 
+from backend.adapters.base import FrameworkAdapter
+from backend.api._cache import cached
+from backend.api.deps import get_adapter_dep
 from backend.models.api import MetricsResponse
-from backend.services.experiment_manager import manager
 
 router = APIRouter(prefix="/experiments/{experiment_id}", tags=["metrics"])
 
 
 @router.get("/metrics", response_model=MetricsResponse)
-async def get_metrics(experiment_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
-    summary = adapter.get_metrics()
+@cached
+async def get_metrics(adapter: FrameworkAdapter = Depends(get_adapter_dep)):
+    summary = await run_in_threadpool(adapter.get_metrics)
     return MetricsResponse(summary=summary)
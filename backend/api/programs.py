@@ -1,20 +1,31 @@
 """Program endpoints."""
 
-import math
-from typing import Optional
+import json
+from typing import Any, Dict, Iterator, List, Literal, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
+from backend.adapters.base import FrameworkAdapter
+from backend.api._cache import cached
+from backend.api._pagination import paginate, total_pages
+from backend.api.deps import get_adapter_dep
 from backend.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
-from backend.models.api import ProgramDetailResponse, ProgramListResponse, ProgramSearchResponse
-from backend.services.experiment_manager import manager
+from backend.models.api import (
+    ProgramCursorResponse,
+    ProgramDetailResponse,
+    ProgramListResponse,
+    ProgramSearchResponse,
+)
+from backend.models.unified import UnifiedProgramSummary
 
 router = APIRouter(prefix="/experiments/{experiment_id}", tags=["programs"])
 
 
-@router.get("/programs", response_model=ProgramListResponse)
+@router.get("/programs", response_model=Union[ProgramListResponse, ProgramCursorResponse])
+@cached
 async def list_programs(
-    experiment_id: str,
+    adapter: FrameworkAdapter = Depends(get_adapter_dep),
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     sort_by: str = Query("generation"),
@@ -25,10 +36,31 @@ async def list_programs(
     score_min: Optional[float] = Query(None),
     archive_only: bool = Query(False),
     correct_only: bool = Query(False),
+    format: Literal["json", "ndjson"] = Query("json"),
+    after: Optional[str] = Query(
+        None, description="Cursor paging: next_cursor from the previous page, empty for the first"
+    ),
 ):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
+    if after is not None:
+        # Keyset-style paging: no total count, no deep OFFSET; page is ignored
+        try:
+            items, next_cursor = adapter.get_programs_after(
+                after=after,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_desc=sort_desc,
+                island_id=island_id,
+                generation_min=generation_min,
+                generation_max=generation_max,
+                score_min=score_min,
+                archive_only=archive_only,
+                correct_only=correct_only,
+            )
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+        if format == "ndjson":
+            return _ndjson_response({"page_size": page_size, "next_cursor": next_cursor}, items)
+        return ProgramCursorResponse(items=items, page_size=page_size, next_cursor=next_cursor)
 
     items, total = adapter.get_programs(
         page=page,
@@ -42,18 +74,31 @@ async def list_programs(
         archive_only=archive_only,
         correct_only=correct_only,
     )
-    total_pages = math.ceil(total / page_size) if total > 0 else 1
-    return ProgramListResponse(
-        items=items, total=total, page=page, page_size=page_size, total_pages=total_pages
-    )
+    if format == "ndjson":
+        return _ndjson_response({
+            "total": total, "page": page, "page_size": page_size,
+            "total_pages": total_pages(total, page_size),
+        }, items)
+    return paginate(ProgramListResponse, items, total, page, page_size)
 
 
-@router.get("/programs/{program_id}", response_model=ProgramDetailResponse)
-async def get_program(experiment_id: str, program_id: str):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
+def _ndjson_response(header: Dict[str, Any], items: List[UnifiedProgramSummary]) -> StreamingResponse:
+    return StreamingResponse(_ndjson_lines(header, items), media_type="application/x-ndjson")
+
+
+def _ndjson_lines(header: Dict[str, Any], items: List[UnifiedProgramSummary]) -> Iterator[str]:
+    """Pagination header line, then one JSON line per program.
 
+    Items are encoded one at a time as the client reads, instead of building
+    the whole page as a single validated document first.
+    """
+    yield json.dumps(header) + "\n"
+    for item in items:
+        yield item.model_dump_json() + "\n"
+
+
+@router.get("/programs/{program_id}", response_model=ProgramDetailResponse)
+async def get_program(program_id: str, adapter: FrameworkAdapter = Depends(get_adapter_dep)):
     program = adapter.get_program(program_id)
     if not program:
         raise HTTPException(404, f"Program {program_id} not found")
@@ -61,14 +106,11 @@ async def get_program(experiment_id: str, program_id: str):
 
 
 @router.get("/search", response_model=ProgramSearchResponse)
+@cached
 async def search_programs(
-    experiment_id: str,
-    q: str = Query(..., min_length=1),
+    adapter: FrameworkAdapter = Depends(get_adapter_dep),
+    q: str = Query(..., min_length=1, max_length=200),
     max_results: int = Query(50, ge=1, le=200),
 ):
-    adapter = manager.get_adapter(experiment_id)
-    if not adapter:
-        raise HTTPException(404, f"Experiment {experiment_id} not found")
-
     results = adapter.search_code(q, max_results=max_results)
     return ProgramSearchResponse(items=results, total=len(results), query=q)
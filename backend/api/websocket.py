@@ -6,15 +6,29 @@ import asyncio
 import json
 import logging
 import time
-from typing import Dict, Set
+from typing import Any, Dict, List, Set, Tuple, Union
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from backend.config import WS_HEARTBEAT_INTERVAL
+from backend.config import WS_BATCH_WINDOW, WS_HEARTBEAT_INTERVAL, WS_SEND_QUEUE_SIZE
 from backend.models.unified import UnifiedEvent
 
 logger = logging.getLogger(__name__)
 
+# Optional orjson import — encodes broadcast frames in C
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional msgpack import — binary event frames for clients that ask for them
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
 router = APIRouter()
 
 
@@ -25,68 +39,208 @@ class ConnectionManager:
         # experiment_id -> set of websockets
         self._subscriptions: Dict[str, Set[WebSocket]] = {}
         self._all_connections: Set[WebSocket] = set()
+        # Connections that negotiated msgpack event frames (sent as binary)
+        self._binary: Set[WebSocket] = set()
+        # experiment_id -> frozen tuple of its subscribers plus "*" ones.
+        # Built on first broadcast and dropped whenever subscriptions change,
+        # so broadcasts neither allocate a set union nor iterate a live set.
+        self._fanout: Dict[str, Tuple[WebSocket, ...]] = {}
+        # experiment_id -> events waiting for the next batched send
+        self._pending: Dict[str, List[UnifiedEvent]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        # websocket -> (bounded frame queue, writer task draining it)
+        self._outboxes: Dict[WebSocket, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        # Frames dropped from full queues of clients that fell behind
+        self.dropped_events = 0
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self._all_connections.add(websocket)
+        self._open_outbox(websocket)
 
     def disconnect(self, websocket: WebSocket):
         self._all_connections.discard(websocket)
-        for subs in self._subscriptions.values():
-            subs.discard(websocket)
+        self._binary.discard(websocket)
+        self._close_outbox(websocket)
+        for eid in [eid for eid, subs in self._subscriptions.items() if websocket in subs]:
+            self.unsubscribe(websocket, eid)
 
-    def subscribe(self, websocket: WebSocket, experiment_id: str):
+    def subscribe(self, websocket: WebSocket, experiment_id: str,
+                  format: str = "json") -> str:
+        """Subscribe websocket to an experiment's events.
+
+        ``format="msgpack"`` switches the connection's event frames to binary
+        msgpack when msgpack is installed. Returns the format in effect.
+        """
         self._subscriptions.setdefault(experiment_id, set()).add(websocket)
+        self._fanout.clear()
+        if format == "msgpack" and HAS_MSGPACK:
+            self._binary.add(websocket)
+            return "msgpack"
+        self._binary.discard(websocket)
+        return "json"
 
     def unsubscribe(self, websocket: WebSocket, experiment_id: str):
-        if experiment_id in self._subscriptions:
-            self._subscriptions[experiment_id].discard(websocket)
+        subs = self._subscriptions.get(experiment_id)
+        if subs is not None and websocket in subs:
+            subs.discard(websocket)
+            if not subs:
+                del self._subscriptions[experiment_id]
+            self._fanout.clear()
 
     async def broadcast(self, event: UnifiedEvent):
-        """Broadcast event to all subscribers of the experiment."""
-        subs = self._subscriptions.get(event.experiment_id, set())
-        # Also send to connections subscribed to "*" (all experiments)
-        subs = subs | self._subscriptions.get("*", set())
-
-        msg = json.dumps({
-            "type": event.type.value,
-            "experiment_id": event.experiment_id,
-            "timestamp": event.timestamp,
-            "data": event.data,
-        })
-
-        dead: list[WebSocket] = []
-        for ws in subs:
-            try:
-                await ws.send_text(msg)
-            except Exception:
-                dead.append(ws)
+        """Queue event for subscribers of its experiment.
+
+        Events for one experiment that arrive within WS_BATCH_WINDOW are
+        coalesced into a single ``batch`` frame, so a burst of new programs
+        costs one encode and one send per subscriber. A lone event still
+        goes out as a plain event frame.
+        """
+        if WS_BATCH_WINDOW <= 0:
+            await self.broadcast_immediate(event)
+            return
+        eid = event.experiment_id
+        self._pending.setdefault(eid, []).append(event)
+        if eid not in self._flush_tasks:
+            self._flush_tasks[eid] = asyncio.ensure_future(
+                self._flush_after(eid, WS_BATCH_WINDOW)
+            )
+
+    async def broadcast_immediate(self, event: UnifiedEvent):
+        """Send event to its subscribers now, bypassing the batch window."""
+        subs = self._subscribers(event.experiment_id)
+        if subs:
+            self._send_all(subs, _event_payload(event))
 
-        for ws in dead:
-            self.disconnect(ws)
+    async def _flush_after(self, experiment_id: str, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._flush_tasks.pop(experiment_id, None)
+        events = self._pending.pop(experiment_id, None)
+        if not events:
+            return
+        subs = self._subscribers(experiment_id)
+        if not subs:
+            return
+        if len(events) == 1:
+            payload = _event_payload(events[0])
+        else:
+            payload = {
+                "type": "batch",
+                "experiment_id": experiment_id,
+                "timestamp": events[-1].timestamp,
+                "events": [_event_payload(e) for e in events],
+            }
+        self._send_all(subs, payload)
+
+    def _subscribers(self, experiment_id: str) -> Tuple[WebSocket, ...]:
+        targets = self._fanout.get(experiment_id)
+        if targets is None:
+            subs = self._subscriptions.get(experiment_id, set())
+            # Also send to connections subscribed to "*" (all experiments)
+            targets = tuple(subs | self._subscriptions.get("*", set()))
+            self._fanout[experiment_id] = targets
+        return targets
 
     async def broadcast_all(self, event: UnifiedEvent):
         """Broadcast to ALL connected clients."""
-        msg = json.dumps({
-            "type": event.type.value,
-            "experiment_id": event.experiment_id,
-            "timestamp": event.timestamp,
-            "data": event.data,
-        })
-
-        dead: list[WebSocket] = []
-        for ws in self._all_connections:
+        if self._all_connections:
+            self._send_all(tuple(self._all_connections), _event_payload(event))
+
+    def _send_all(self, conns: Tuple[WebSocket, ...], payload: Dict[str, Any]):
+        """Queue payload for every connection; each one's writer task sends it.
+
+        Sends never block the broadcaster: a slow client only backs up its
+        own bounded queue, where the oldest frames are dropped once it is
+        full. The payload is encoded at most once per frame format.
+        """
+        binary = self._binary
+        text = packed = None
+        if not binary.issuperset(conns):
+            text = _dumps(payload)
+        if binary and not binary.isdisjoint(conns):
+            packed = msgpack.packb(payload, use_bin_type=True)
+        for ws in conns:
+            self._enqueue(ws, packed if ws in binary else text)
+
+    def _enqueue(self, websocket: WebSocket, frame: Union[str, bytes]):
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            outbox = self._open_outbox(websocket)
+        queue = outbox[0]
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(frame)
+            self.dropped_events += 1
+
+    def _open_outbox(self, websocket: WebSocket) -> Tuple[asyncio.Queue, asyncio.Task]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        task = asyncio.ensure_future(self._writer(websocket, queue))
+        outbox = self._outboxes[websocket] = (queue, task)
+        return outbox
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued frames in order until the connection fails."""
+        while True:
+            frame = await queue.get()
             try:
-                await ws.send_text(msg)
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
             except Exception:
-                dead.append(ws)
+                queue.task_done()
+                break
+            queue.task_done()
+        self.disconnect(websocket)
 
-        for ws in dead:
-            self.disconnect(ws)
+    def _close_outbox(self, websocket: WebSocket):
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is None:
+            return
+        queue, task = outbox
+        if task is not asyncio.current_task():
+            task.cancel()
+        # Drain so anyone joining the queue isn't left waiting
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+
+
+def _event_payload(event: UnifiedEvent) -> Dict[str, Any]:
+    return {
+        # EventType is a str enum: every encoder here (orjson, json, msgpack)
+        # writes it as its value, so the .value lookup is skipped
+        "type": event.type,
+        "experiment_id": event.experiment_id,
+        "timestamp": event.timestamp,
+        "data": event.data,
+    }
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    """Encode a payload as the JSON text frame sent to clients."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(payload).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. non-str keys in event.data; json.dumps coerces them
+    return json.dumps(payload)
 
 
 ws_manager = ConnectionManager()
 
+# Control frames are fixed apart from a few fields, so they are formatted
+# from templates instead of going through the JSON encoder each time.
+# %r of a float is the same text json.dumps produces for it.
+_HEARTBEAT_FRAME = '{"type": "heartbeat", "timestamp": %r}'
+_PONG_FRAME = '{"type": "pong", "timestamp": %r}'
+_SUBSCRIBED_FRAME = '{"type": "subscribed", "experiment_id": %s, "format": "%s", "timestamp": %r}'
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -104,29 +258,22 @@ async def websocket_endpoint(websocket: WebSocket):
                     eid = msg.get("experiment_id", "*")
 
                     if action == "subscribe":
-                        ws_manager.subscribe(websocket, eid)
-                        await websocket.send_text(json.dumps({
-                            "type": "subscribed",
-                            "experiment_id": eid,
-                            "timestamp": time.time(),
-                        }))
+                        fmt = ws_manager.subscribe(websocket, eid, msg.get("format", "json"))
+                        # Control replies stay JSON text; only events switch format
+                        await websocket.send_text(
+                            _SUBSCRIBED_FRAME % (json.dumps(eid), fmt, time.time())
+                        )
                     elif action == "unsubscribe":
                         ws_manager.unsubscribe(websocket, eid)
                     elif action == "ping":
-                        await websocket.send_text(json.dumps({
-                            "type": "pong",
-                            "timestamp": time.time(),
-                        }))
+                        await websocket.send_text(_PONG_FRAME % time.time())
                 except json.JSONDecodeError:
                     pass
 
             except asyncio.TimeoutError:
                 # Send heartbeat
                 try:
-                    await websocket.send_text(json.dumps({
-                        "type": "heartbeat",
-                        "timestamp": time.time(),
-                    }))
+                    await websocket.send_text(_HEARTBEAT_FRAME % time.time())
                 except Exception:
                     break
 
@@ -4,6 +4,14 @@ import os
 from pathlib import Path
 
 
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
 # Base scan directory — the evollm-dashboard root
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -11,25 +19,56 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 PROJECTS_DIR = BASE_DIR / "configs" / "projects"
 
 # How often to re-scan for new experiments (seconds)
-SCAN_INTERVAL = 30
+SCAN_INTERVAL = _env_int("DASHBOARD_SCAN_INTERVAL", 30)
+
+# Worker threads for detect() probes during discovery; each probe is a few
+# stat calls, which overlap well on network-mounted scan directories
+STAT_THREADS = _env_int("DASHBOARD_STAT_THREADS", 8)
+
+# Worker threads for reading OpenEvolve program files on a checkpoint load,
+# and for probing experiments' info during a scan; file opens and reads
+# overlap across threads on cold caches
+LOAD_THREADS = _env_int("DASHBOARD_LOAD_THREADS", 8)
+
+# Directory for pickled copies of parsed OpenEvolve checkpoints, so a restart
+# skips re-decoding every program file. Empty (the default) disables it;
+# experiment directories themselves are never written to. Loading a cache
+# file unpickles it, which can run arbitrary code, so the directory must not
+# be writable by other users; it is created with mode 0700 if missing, and
+# files are only read when both they and the directory are owned by the
+# server's user and not group/other writable. Unavailable on Windows.
+PARSED_CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", "")
 
 # Status inference thresholds (seconds since last modification)
-STATUS_RUNNING_THRESHOLD = 60       # modified <60s ago
-STATUS_PAUSED_THRESHOLD = 600       # modified <10min ago
+STATUS_RUNNING_THRESHOLD = _env_int("DASHBOARD_STATUS_RUNNING_THRESHOLD", 60)    # modified <60s ago
+STATUS_PAUSED_THRESHOLD = _env_int("DASHBOARD_STATUS_PAUSED_THRESHOLD", 600)     # modified <10min ago
 # >10min idle → completed
 
 # WebSocket heartbeat interval
-WS_HEARTBEAT_INTERVAL = 15
+WS_HEARTBEAT_INTERVAL = _env_float("DASHBOARD_WS_HEARTBEAT_INTERVAL", 15)
+
+# Events for one experiment arriving within this window (seconds) are sent
+# to subscribers as a single "batch" frame; 0 sends each event on its own
+WS_BATCH_WINDOW = 0.05
+
+# Frames queued per WebSocket client before the oldest are dropped
+WS_SEND_QUEUE_SIZE = 256
 
 # SQLite polling interval for change detection (seconds)
-SQLITE_POLL_INTERVAL = 2
+SQLITE_POLL_INTERVAL = _env_float("DASHBOARD_SQLITE_POLL_INTERVAL", 2)
 
 # Filesystem watch debounce (seconds)
-FS_DEBOUNCE = 1.0
+FS_DEBOUNCE = _env_float("DASHBOARD_FS_DEBOUNCE", 1.0)
+
+# Lifetime (seconds) of cached list/aggregate responses. Entries are also
+# keyed by adapter version, so change events invalidate them early; 0
+# disables the cache.
+API_CACHE_TTL = _env_float("DASHBOARD_API_CACHE_TTL", 2)
+API_CACHE_SIZE = 1024
 
 # Pagination defaults
-DEFAULT_PAGE_SIZE = 50
-MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = _env_int("DASHBOARD_DEFAULT_PAGE_SIZE", 50)
+MAX_PAGE_SIZE = _env_int("DASHBOARD_MAX_PAGE_SIZE", 500)
 
 # API prefix
 API_PREFIX = "/api"
@@ -43,4 +82,4 @@ CORS_ORIGINS = [
 ]
 
 HOST = os.environ.get("DASHBOARD_HOST", "0.0.0.0")
-PORT = int(os.environ.get("DASHBOARD_PORT", "8000"))
+PORT = _env_int("DASHBOARD_PORT", 8000)
@@ -3,16 +3,40 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
+import json
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+# Optional orjson import — encodes the large program/conversation pages in C
+try:
+    import orjson  # noqa: F401
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Newer FastAPI dumps response models straight to JSON bytes in pydantic-core
+# when the response class is left at its default; ORJSONResponse is only a
+# win (and not deprecated) on versions without that path.
+_PYDANTIC_DUMPS_JSON = "dump_json" in inspect.signature(serialize_response).parameters
+
+if HAS_ORJSON and not _PYDANTIC_DUMPS_JSON:
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+else:
+    DefaultResponse = JSONResponse
 
 from backend.api import experiments, programs, conversations, metrics, islands, analytics, websocket
 from backend.api.websocket import ws_manager
 from backend.adapters.registry import registry
-from backend.config import API_PREFIX, CORS_ORIGINS, PROJECTS_DIR
+from backend.config import API_PREFIX, BASE_DIR, CORS_ORIGINS, PROJECTS_DIR
+from backend.models.unified import UnifiedEvent
 from backend.services.change_detection import change_engine
 from backend.services.experiment_manager import manager
 
@@ -23,6 +47,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _bump_adapter_version(event: UnifiedEvent):
+    """New data for an experiment: retire its cached API responses."""
+    adapter = manager.get_adapter(event.experiment_id)
+    if adapter is not None:
+        adapter.bump_version()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
@@ -34,9 +65,10 @@ async def lifespan(app: FastAPI):
     # Start experiment discovery
     manager.start()
 
-    # Wire change detection → WebSocket broadcast
-    loop = asyncio.get_event_loop()
+    # Wire change detection → cached-response invalidation + WebSocket broadcast
+    loop = asyncio.get_running_loop()
     change_engine.set_loop(loop)
+    change_engine.on_change(_bump_adapter_version)
     change_engine.on_change(ws_manager.broadcast)
 
     # Register discovered experiments with change engine
@@ -46,6 +78,9 @@ async def lifespan(app: FastAPI):
 
     change_engine.start()
 
+    # Build the OpenAPI document now rather than on the first /docs visit
+    _openapi_body()
+
     logger.info("Backend started — scanning for experiments in evollm-dashboard/")
     yield
 
@@ -58,6 +93,7 @@ app = FastAPI(
     title="EvoLLM Dashboard",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 # CORS
@@ -69,6 +105,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Program/conversation pages are mostly source code and prompts, which
+# compress several-fold; tiny responses and WebSocket frames are left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount REST routers
 app.include_router(experiments.router, prefix=API_PREFIX)
 app.include_router(programs.router, prefix=API_PREFIX)
@@ -81,6 +121,30 @@ app.include_router(analytics.router, prefix=API_PREFIX)
 app.include_router(websocket.router)
 
 
+def _openapi_body() -> bytes:
+    """The encoded OpenAPI document, built once; routes don't change at runtime."""
+    body = getattr(app.state, "openapi_body", None)
+    if body is None:
+        schema = app.openapi()
+        if HAS_ORJSON:
+            body = orjson.dumps(schema)
+        else:
+            body = json.dumps(schema, separators=(",", ":")).encode()
+        app.state.openapi_body = body
+    return body
+
+
+# FastAPI's own /openapi.json route re-encodes the cached schema on every
+# request; swap it for one that returns the bytes built above
+app.router.routes[:] = [r for r in app.router.routes
+                        if getattr(r, "path", None) != app.openapi_url]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json():
+    return Response(_openapi_body(), media_type="application/json")
+
+
 @app.get("/api/health")
 async def health():
     exps = manager.list_experiments()
@@ -93,11 +157,14 @@ async def health():
 
 @app.get("/api/frameworks")
 async def frameworks():
-    return {"frameworks": registry.get_framework_metadata()}
+    return {"frameworks": registry.get_framework_metadata(str(BASE_DIR))}
 
 
 if __name__ == "__main__":
     import uvicorn
     from backend.config import HOST, PORT
 
-    uvicorn.run("backend.main:app", host=HOST, port=PORT, reload=True)
+    # uvicorn[standard] ships uvloop and httptools; "auto" picks them where
+    # available and falls back to asyncio/h11 (e.g. uvloop on Windows)
+    uvicorn.run("backend.main:app", host=HOST, port=PORT, reload=True,
+                loop="auto", http="auto")
@@ -14,6 +14,7 @@ from .unified import (
     MigrationEvent,
     UnifiedExperiment,
     UnifiedProgram,
+    UnifiedProgramSummary,
     LineageTree,
 )
 
@@ -41,13 +42,19 @@ class ExperimentDetailResponse(BaseModel):
 # ── Programs ────────────────────────────────────────────────────────
 
 class ProgramListResponse(BaseModel):
-    items: List[UnifiedProgram]
+    items: List[UnifiedProgramSummary]
     total: int
     page: int
     page_size: int
     total_pages: int
 
 
+class ProgramCursorResponse(BaseModel):
+    items: List[UnifiedProgramSummary]
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
 class ProgramDetailResponse(BaseModel):
     program: UnifiedProgram
 
@@ -68,6 +75,12 @@ class ConversationListResponse(BaseModel):
     total_pages: int
 
 
+class ConversationCursorResponse(BaseModel):
+    items: List[ConversationEntry]
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
 # ── Metrics ─────────────────────────────────────────────────────────
 
 class MetricsResponse(BaseModel):
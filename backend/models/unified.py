@@ -18,9 +18,10 @@ class ExperimentStatus(str, enum.Enum):
 
 # ── Core program model ──────────────────────────────────────────────
 
-class UnifiedProgram(BaseModel):
+class UnifiedProgramSummary(BaseModel):
+    """The fields list views use; UnifiedProgram adds code, prompts and the other large ones."""
+
     id: str
-    code: str
     language: str = "python"
 
     # Evolution
@@ -38,10 +39,26 @@ class UnifiedProgram(BaseModel):
     # Features
     complexity: float = 0.0
     diversity: float = 0.0
+    changes_description: str = ""
+
+    # Embeddings
+    embedding_2d: Optional[List[float]] = None
+    embedding_3d: Optional[List[float]] = None
+    embedding_cluster_id: Optional[int] = None
+
+    # Genealogy
+    children_count: int = 0
+    in_archive: bool = False
+
+    # Metadata pass-through
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class UnifiedProgram(UnifiedProgramSummary):
+    code: str
 
     # Code diff
     code_diff: Optional[str] = None
-    changes_description: str = ""
 
     # Prompts & LLM
     prompts: Optional[Dict[str, Any]] = None
@@ -51,20 +68,10 @@ class UnifiedProgram(BaseModel):
     artifacts: Optional[Dict[str, Any]] = None
     text_feedback: Optional[str] = None
 
-    # Embeddings
-    embedding_2d: Optional[List[float]] = None
-    embedding_3d: Optional[List[float]] = None
-    embedding_cluster_id: Optional[int] = None
-
     # Genealogy
-    children_count: int = 0
-    in_archive: bool = False
     migration_history: List[Dict[str, Any]] = Field(default_factory=list)
     inspiration_ids: List[str] = Field(default_factory=list)
 
-    # Metadata pass-through
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-
 
 # ── Experiment model ────────────────────────────────────────────────
 
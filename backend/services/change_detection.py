@@ -6,21 +6,33 @@ Broadcasts events to WebSocket subscribers when experiments change.
 from __future__ import annotations
 
 import asyncio
+import importlib
 import logging
 import os
-import threading
 import time
-from typing import Callable, Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Tuple
 
 from backend.config import FS_DEBOUNCE, SQLITE_POLL_INTERVAL
 from backend.models.unified import EventType, UnifiedEvent
 
 logger = logging.getLogger(__name__)
 
+# The module itself: backend.adapters re-exports the `registry` instance under
+# the module's name, so `import ... as` would bind the instance
+_registry_module = importlib.import_module("backend.adapters.registry")
+
 # Optional watchdog import
 try:
     from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler, FileSystemEvent
+    from watchdog.events import (
+        EVENT_TYPE_CREATED, EVENT_TYPE_MODIFIED, EVENT_TYPE_MOVED,
+        FileCreatedEvent, FileModifiedEvent, FileMovedEvent,
+        FileSystemEvent, FileSystemEventHandler,
+    )
+    # Only the event types _WatchdogHandler acts on. The inotify emitter
+    # narrows its kernel watch mask to match, so opens and closes (including
+    # the adapters' own checkpoint reads) never reach Python at all.
+    _EVENT_FILTER = [FileCreatedEvent, FileModifiedEvent, FileMovedEvent]
     HAS_WATCHDOG = True
 except ImportError:
     HAS_WATCHDOG = False
@@ -32,13 +44,29 @@ class ChangeDetectionEngine:
 
     def __init__(self):
         self._callbacks: List[Callable] = []
+        # (callback, is_coroutine_function) snapshot read by _fire_event;
+        # rebuilt on registration, so firing never sees a list mid-append
+        self._callback_snapshot: Tuple[Tuple[Callable, bool], ...] = ()
         self._running = False
-        self._poll_thread: Optional[threading.Thread] = None
+        self._poll_task: Optional[asyncio.Task] = None
         self._observer = None  # watchdog Observer
-        self._watched_paths: Set[str] = set()
-        self._last_mtimes: Dict[str, float] = {}
+        self._handler = None  # the one _WatchdogHandler shared by every watch
+        # Watched experiment directory -> experiment id; events resolve to the
+        # nearest registered ancestor of their path
+        self._path_to_expid: Dict[str, str] = {}
+        # Root of each scheduled recursive watch -> its ObservedWatch; an
+        # experiment nested inside another's root shares that watch
+        self._watches: Dict[str, object] = {}
+        self._last_mtimes: Dict[str, int] = {}  # experiment_id -> st_mtime_ns
         self._experiment_meta: Dict[str, Dict] = {}  # experiment_id -> {path, framework}
-        self._debounce_timers: Dict[str, float] = {}
+        # Polled files grouped by directory: parent -> {basename: experiment_id}
+        self._poll_groups: Dict[str, Dict[str, str]] = {}
+        # Debounce keys are (experiment_id, EventType) tuples: hashing one
+        # is cheaper than formatting a string per event.
+        # Key -> time.monotonic() of its last dispatch; used only without a loop
+        self._debounce_timers: Dict[Tuple[str, EventType], float] = {}
+        # event key -> [newest event held back in the window, window timer]
+        self._pending: Dict[Tuple[str, EventType], List] = {}
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     def set_loop(self, loop: asyncio.AbstractEventLoop):
@@ -47,115 +75,280 @@ class ChangeDetectionEngine:
     def on_change(self, callback: Callable):
         """Register a callback(event: UnifiedEvent) for changes."""
         self._callbacks.append(callback)
+        # Only the new callback is inspected; earlier flags are kept as is
+        self._callback_snapshot = self._callback_snapshot + (
+            (callback, asyncio.iscoroutinefunction(callback)),
+        )
 
     def register_experiment(self, experiment_id: str, path: str, framework: str):
-        from backend.adapters.registry import registry
-        config = registry.get(framework)
-        strategy = config.change_detection if config else "poll"
+        strategy = self._strategy_for(framework, path)
+        self._forget_poll(experiment_id)
         self._experiment_meta[experiment_id] = {"path": path, "framework": framework, "strategy": strategy}
+        if strategy == "poll":
+            parent, name = os.path.split(os.path.abspath(path))
+            self._poll_groups.setdefault(parent, {})[name] = experiment_id
         if strategy == "watchdog" and HAS_WATCHDOG:
             self._setup_watchdog(experiment_id, path)
 
     def start(self):
         self._running = True
-        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
-        self._poll_thread.start()
+        if self._loop is not None:
+            self._poll_task = self._loop.create_task(self._poll_loop())
+        else:
+            logger.warning("No event loop set — SQLite polling disabled")
         if HAS_WATCHDOG and self._observer is None:
             self._observer = Observer()
+            self._handler = _WatchdogHandler(self)
+            # Experiments registered before start() get their watches now
+            for path in list(self._path_to_expid):
+                self._watch(path)
             self._observer.start()
 
     def stop(self):
         self._running = False
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        for _, handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
         if self._observer:
             self._observer.stop()
             self._observer.join()
 
     # ── internals ───────────────────────────────────────────────────
 
+    def _strategy_for(self, framework: str, path: str) -> str:
+        # Read from the module on each call so a swapped-in registry is honoured
+        registry = _registry_module.registry
+        strategy = registry.strategy_index.get(framework)
+        if strategy is not None:
+            return strategy
+        # "auto" resolves per path (network mounts poll)
+        return registry.change_detection_for(framework, path)
+
     def _setup_watchdog(self, experiment_id: str, path: str):
-        if not HAS_WATCHDOG or not self._observer:
-            return
-        if path in self._watched_paths:
-            return
-        self._watched_paths.add(path)
+        path = os.path.abspath(path)
+        self._path_to_expid[path] = experiment_id
+        if self._observer is not None:
+            self._watch(path)
 
-        handler = _WatchdogHandler(self, experiment_id)
+    def _watch(self, path: str):
+        """Make sure a recursive watch covers path, sharing an enclosing one."""
+        if _nearest(self._watches, path) is not None:
+            return
+        # A new root above existing ones takes over their subtrees
+        prefix = path.rstrip(os.sep) + os.sep
+        for root in [r for r in self._watches if r.startswith(prefix)]:
+            self._observer.unschedule(self._watches.pop(root))
         try:
-            self._observer.schedule(handler, path, recursive=True)
+            self._watches[path] = self._observer.schedule(
+                self._handler, path, recursive=True, event_filter=_EVENT_FILTER
+            )
             logger.debug(f"Watchdog watching: {path}")
         except Exception as e:
             logger.warning(f"Failed to watch {path}: {e}")
 
-    def _poll_loop(self):
-        """Poll SQLite files for mtime changes."""
+    def _resolve_expid(self, file_path: str) -> Optional[str]:
+        """Experiment owning file_path: its nearest registered ancestor."""
+        root = _nearest(self._path_to_expid, file_path)
+        return self._path_to_expid.get(root) if root is not None else None
+
+    def _forget_poll(self, experiment_id: str):
+        meta = self._experiment_meta.get(experiment_id)
+        if meta is None or meta.get("strategy") != "poll":
+            return
+        parent, name = os.path.split(os.path.abspath(meta["path"]))
+        group = self._poll_groups.get(parent)
+        if group is not None and group.get(name) == experiment_id:
+            del group[name]
+            if not group:
+                del self._poll_groups[parent]
+
+    async def _poll_loop(self):
+        """Poll SQLite files for mtime changes.
+
+        Runs on the event loop; each directory sweep goes to the default
+        executor, all directories at once, and the events are fired from
+        the loop without a thread hop.
+        """
         while self._running:
-            for eid, meta in list(self._experiment_meta.items()):
-                if meta.get("strategy") != "poll":
-                    continue
-                path = meta["path"]
-                try:
-                    mtime = os.path.getmtime(path) if os.path.exists(path) else 0
-                    prev = self._last_mtimes.get(eid, 0)
-                    if mtime > prev:
-                        self._last_mtimes[eid] = mtime
-                        if prev > 0:  # skip first detection
-                            self._fire_event(UnifiedEvent(
-                                type=EventType.NEW_PROGRAM,
-                                experiment_id=eid,
-                                timestamp=time.time(),
-                                data={"source": "sqlite_poll"},
-                            ))
-                except Exception as e:
-                    logger.debug(f"Poll error for {eid}: {e}")
-
-            time.sleep(SQLITE_POLL_INTERVAL)
+            groups = [(parent, dict(group)) for parent, group in self._poll_groups.items()]
+            try:
+                sweeps = await asyncio.gather(*(
+                    asyncio.to_thread(_dir_mtimes, parent, group) for parent, group in groups
+                ))
+                self._apply_mtimes(zip(groups, sweeps))
+            except Exception as e:
+                logger.debug(f"Poll error: {e}")
+            await asyncio.sleep(SQLITE_POLL_INTERVAL)
 
-    def _fire_event(self, event: UnifiedEvent):
-        # Debounce
+    def _poll_once(self):
+        """One synchronous sweep of every polled directory."""
+        groups = [(parent, dict(group)) for parent, group in self._poll_groups.items()]
+        self._apply_mtimes(((parent, group), _dir_mtimes(parent, group)) for parent, group in groups)
+
+    def _apply_mtimes(self, sweeps):
+        changed = []
+        for (parent, group), mtimes in sweeps:
+            for name, eid in group.items():
+                # WAL-mode writers touch only the -wal file until a checkpoint
+                mtime = max(mtimes.get(name, 0), mtimes.get(name + "-wal", 0))
+                prev = self._last_mtimes.get(eid, 0)
+                if mtime > prev:
+                    self._last_mtimes[eid] = mtime
+                    if prev > 0:  # skip first detection
+                        changed.append(eid)
+        if not changed:
+            return
+        # One wall-clock read stamps every event of the sweep
         now = time.time()
-        key = f"{event.experiment_id}:{event.type.value}"
-        last = self._debounce_timers.get(key, 0)
-        if now - last < FS_DEBOUNCE:
+        for eid in changed:
+            self._fire_event(UnifiedEvent(
+                type=EventType.NEW_PROGRAM,
+                experiment_id=eid,
+                timestamp=now,
+                data={"source": "sqlite_poll"},
+            ))
+
+    def _fire_event(self, event: UnifiedEvent):
+        """Debounce per experiment and event type, on leading and trailing edges.
+
+        The first event of a burst goes out at once; later ones within
+        FS_DEBOUNCE are coalesced and the newest is sent when the window
+        closes, so the end state of a burst is never dropped. Events from
+        other threads (watchdog) are handed to the loop first.
+        """
+        loop = self._loop
+        if loop is None:
+            # Nothing to time a trailing call on: leading edge only. The
+            # window is measured on the monotonic clock, which wall-clock
+            # adjustments can't stretch or shrink
+            now = time.monotonic()
+            key = (event.experiment_id, event.type)
+            last = self._debounce_timers.get(key)
+            if last is not None and now - last < FS_DEBOUNCE:
+                return
+            self._debounce_timers[key] = now
+            self._dispatch(event)
+            return
+
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:  # watchdog thread
+            on_loop = False
+        if on_loop:
+            self._debounce(event)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._debounce, event)
+            except RuntimeError:  # loop closed during shutdown
+                pass
+
+    def _debounce(self, event: UnifiedEvent):
+        key = (event.experiment_id, event.type)
+        entry = self._pending.get(key)
+        if entry is not None:
+            entry[0] = event
             return
-        self._debounce_timers[key] = now
+        self._dispatch(event)
+        self._pending[key] = [None, self._loop.call_later(FS_DEBOUNCE, self._flush_pending, key)]
+
+    def _flush_pending(self, key: Tuple[str, EventType]):
+        event = self._pending.pop(key)[0]
+        if event is not None:
+            # Sends it and opens a new window, so a sustained burst still
+            # yields at most one event per FS_DEBOUNCE
+            self._debounce(event)
 
-        for cb in self._callbacks:
+    def _dispatch(self, event: UnifiedEvent):
+        loop = self._loop
+        for cb, is_coro in self._callback_snapshot:
             try:
-                if asyncio.iscoroutinefunction(cb):
-                    if self._loop:
-                        self._loop.call_soon_threadsafe(
-                            asyncio.ensure_future, cb(event)
-                        )
+                if is_coro:
+                    if loop:
+                        loop.create_task(cb(event))
                 else:
                     cb(event)
             except Exception as e:
                 logger.error(f"Change callback error: {e}")
 
     def handle_fs_event(self, experiment_id: str, file_path: str):
-        """Called by watchdog handler."""
-        # Only care about JSON files in checkpoint dirs
-        if file_path.endswith(".json") or file_path.endswith(".jsonl"):
-            self._fire_event(UnifiedEvent(
-                type=EventType.NEW_PROGRAM,
-                experiment_id=experiment_id,
-                timestamp=time.time(),
-                data={"source": "watchdog", "file": os.path.basename(file_path)},
-            ))
+        """Called by watchdog handler, for checkpoint JSON files only."""
+        self._fire_event(UnifiedEvent(
+            type=EventType.NEW_PROGRAM,
+            experiment_id=experiment_id,
+            timestamp=time.time(),
+            data={"source": "watchdog", "file": os.path.basename(file_path)},
+        ))
 
 
+def _dir_mtimes(parent: str, names: Dict[str, str]) -> Dict[str, int]:
+    """st_mtime_ns of the given files (and their -wal files) in one directory.
+
+    One scandir of the parent replaces an exists + getmtime pair per file.
+    Integer nanoseconds keep writes that a float mtime would round together
+    apart. Files that are missing are left out.
+    """
+    mtimes: Dict[str, int] = {}
+    try:
+        with os.scandir(parent) as it:
+            for entry in it:
+                name = entry.name
+                if name in names or (name.endswith("-wal") and name[:-4] in names):
+                    try:
+                        mtimes[name] = entry.stat().st_mtime_ns
+                    except OSError:
+                        pass
+    except OSError as e:
+        logger.debug(f"Poll scandir failed for {parent}: {e}")
+        for name in names:
+            for candidate in (name, name + "-wal"):
+                try:
+                    mtimes[candidate] = os.stat(os.path.join(parent, candidate)).st_mtime_ns
+                except OSError:
+                    pass
+    return mtimes
+
+
+def _nearest(paths: Dict[str, object], path: str) -> Optional[str]:
+    """path or its nearest ancestor that is a key of paths; O(depth) lookups."""
+    while True:
+        if path in paths:
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+# Files in checkpoint dirs that signal new programs
+_WATCHED_SUFFIXES = (".json", ".jsonl")
+
 if HAS_WATCHDOG:
     class _WatchdogHandler(FileSystemEventHandler):
-        def __init__(self, engine: ChangeDetectionEngine, experiment_id: str):
-            self._engine = engine
-            self._experiment_id = experiment_id
+        """Routes events from every watch to the experiment owning the path."""
 
-        def on_modified(self, event: FileSystemEvent):
-            if not event.is_directory:
-                self._engine.handle_fs_event(self._experiment_id, event.src_path)
+        def __init__(self, engine: ChangeDetectionEngine):
+            self._engine = engine
 
-        def on_created(self, event: FileSystemEvent):
-            if not event.is_directory:
-                self._engine.handle_fs_event(self._experiment_id, event.src_path)
+        def dispatch(self, event: FileSystemEvent):
+            # Filter here, before FileSystemEventHandler's per-type dispatch:
+            # the temp and lock files of a checkpoint write stop at one
+            # suffix test. A rename (atomic save) counts by its destination.
+            if event.is_directory:
+                return
+            kind = event.event_type
+            if kind == EVENT_TYPE_MOVED:
+                path = event.dest_path
+            elif kind == EVENT_TYPE_MODIFIED or kind == EVENT_TYPE_CREATED:
+                path = event.src_path
+            else:
+                return
+            if path.endswith(_WATCHED_SUFFIXES):
+                eid = self._engine._resolve_expid(path)
+                if eid is not None:
+                    self._engine.handle_fs_event(eid, path)
 
 
 # Singleton
@@ -2,98 +2,302 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import threading
-import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
-from backend.adapters.base import FrameworkAdapter
+from backend.adapters.base import FrameworkAdapter, infer_status
 from backend.adapters.registry import registry
-from backend.config import BASE_DIR, SCAN_INTERVAL
+from backend.config import BASE_DIR, FS_DEBOUNCE, LOAD_THREADS, SCAN_INTERVAL
 from backend.models.unified import UnifiedExperiment
 
 logger = logging.getLogger(__name__)
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import (
+        EVENT_TYPE_MOVED, DirMovedEvent, FileCreatedEvent, FileMovedEvent,
+        FileSystemEvent, FileSystemEventHandler,
+    )
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
 
 class ExperimentManager:
     """Singleton registry that discovers and caches experiment adapters."""
 
     def __init__(self):
+        # Copy-on-write: scan() builds a new dict and rebinds the attribute,
+        # so readers take a plain reference without locking
         self._adapters: Dict[str, FrameworkAdapter] = {}
-        self._experiments: Dict[str, UnifiedExperiment] = {}
-        self._lock = threading.Lock()
-        self._scan_thread: Optional[threading.Thread] = None
+        # id -> (adapter.get_last_modified() when fetched, info)
+        self._experiments: Dict[str, Tuple[float, UnifiedExperiment]] = {}
+        # (adapters dict, per-experiment stamps, results) of the last
+        # list_experiments(); stale once scan() rebinds _adapters or a stamp moves
+        self._list_cache: Optional[Tuple[dict, tuple, List[UnifiedExperiment]]] = None
+        # (path, framework_name) -> experiment id, so rescans reuse adapters
+        self._known: Dict[Tuple[str, str], str] = {}
+        # Serializes writers only
+        self._scan_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scan_handle: Optional[asyncio.TimerHandle] = None
+        # Watchdog observer on BASE_DIR; while it runs, scans are event-driven
+        self._observer = None
+        self._scanning = False
+        self._rescan = False  # an event arrived while a scan was running
         self._running = False
 
     def start(self):
-        """Start periodic scanning."""
+        """Scan now, then rescan on the running event loop.
+
+        Where BASE_DIR delivers file events, a rescan follows the creation
+        or move of anything matching a config's glob_patterns; otherwise
+        BASE_DIR is rescanned every SCAN_INTERVAL.
+        """
         self._running = True
         self.scan()
-        self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
-        self._scan_thread.start()
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop — periodic rescans disabled")
+            return
+        if not self._watch_base_dir():
+            self._schedule_scan()
 
     def stop(self):
         self._running = False
+        if self._scan_handle is not None:
+            self._scan_handle.cancel()
+            self._scan_handle = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
 
     def scan(self):
         """Discover experiments in BASE_DIR."""
         discovered = registry.discover_experiments(str(BASE_DIR))
-        with self._lock:
+        with self._scan_lock:
+            adapters = dict(self._adapters)
+            experiments = dict(self._experiments)
+            known = dict(self._known)
+            candidates = []
             for path, framework_name in discovered:
-                adapter = registry.create_adapter(path, framework_name)
-                if adapter is None:
+                # Keep the existing adapter (and its caches) for experiments
+                # seen on an earlier scan instead of rebuilding it every time
+                eid = known.get((path, framework_name))
+                adapter = adapters.get(eid) if eid is not None else None
+                is_new = adapter is None
+                if is_new:
+                    adapter = registry.create_adapter(path, framework_name)
+                    if adapter is None:
+                        continue
+                candidates.append((path, framework_name, adapter, is_new))
+            probes = _map_threaded(_probe, [c[2] for c in candidates])
+            for (path, framework_name, adapter, is_new), probe in zip(candidates, probes):
+                if isinstance(probe, Exception):
+                    logger.warning(f"Failed to load experiment at {path}: {probe}")
                     continue
-                try:
-                    info = adapter.get_experiment_info()
-                    self._adapters[info.id] = adapter
-                    self._experiments[info.id] = info
+                mtime, info = probe
+                adapters[info.id] = adapter
+                experiments[info.id] = (mtime, info)
+                known[(path, framework_name)] = info.id
+                if is_new:
+                    adapter.start_watching()
                     logger.info(f"Registered experiment: {info.id} ({info.framework})")
-                except Exception as e:
-                    logger.warning(f"Failed to load experiment at {path}: {e}")
+            # Drop experiments that were deleted or moved, unless their id
+            # still belongs to a discovered path
+            live = {(path, framework_name) for path, framework_name in discovered}
+            live_ids = {eid for key, eid in known.items() if key in live}
+            removed = []
+            for key in [key for key in known if key not in live]:
+                eid = known.pop(key)
+                if eid in live_ids:
+                    continue
+                experiments.pop(eid, None)
+                adapter = adapters.pop(eid, None)
+                if adapter is not None:
+                    removed.append((eid, adapter))
+            # Single reference stores; a reader sees the old dict or the new one
+            self._experiments = experiments
+            self._known = known
+            self._adapters = adapters
+        for eid, adapter in removed:
+            adapter.stop_watching()
+            logger.info(f"Unregistered experiment: {eid}")
+
+    def _watch_base_dir(self) -> bool:
+        base_dir = os.path.abspath(str(BASE_DIR))
+        if not HAS_WATCHDOG or not registry.supports_fs_events(base_dir):
+            return False
+        observer = Observer()
+        try:
+            observer.schedule(
+                _DiscoveryHandler(self, base_dir), base_dir, recursive=True,
+                event_filter=[FileCreatedEvent, FileMovedEvent, DirMovedEvent],
+            )
+            observer.start()
+        except Exception as e:  # e.g. the inotify watch limit
+            logger.warning(f"Cannot watch {base_dir} ({e}) — rescanning every {SCAN_INTERVAL}s")
+            return False
+        self._observer = observer
+        return True
+
+    def _request_scan(self):
+        # On the loop: coalesce a burst of events into one scan FS_DEBOUNCE
+        # after the first, and queue another if one is already running
+        if not self._running:
+            return
+        if self._scanning:
+            self._rescan = True
+        elif self._scan_handle is None:
+            self._scan_handle = self._loop.call_later(FS_DEBOUNCE, self._tick)
+
+    def _request_scan_threadsafe(self):
+        try:
+            self._loop.call_soon_threadsafe(self._request_scan)
+        except RuntimeError:  # loop closed during shutdown
+            pass
 
-    def _scan_loop(self):
-        while self._running:
-            time.sleep(SCAN_INTERVAL)
-            try:
-                self.scan()
-            except Exception as e:
-                logger.error(f"Scan error: {e}")
+    def _schedule_scan(self, _done=None):
+        self._scanning = False
+        if not self._running:
+            return
+        if self._observer is None:
+            self._scan_handle = self._loop.call_later(SCAN_INTERVAL, self._tick)
+        elif self._rescan:
+            self._request_scan()
+
+    def _tick(self):
+        # Discovery walks the filesystem, so it runs off the loop; the next
+        # scan is armed once it finishes, never overlapping two scans
+        self._scan_handle = None
+        self._scanning = True
+        self._rescan = False
+        future = self._loop.run_in_executor(None, self._safe_scan)
+        future.add_done_callback(self._schedule_scan)
+
+    def _safe_scan(self):
+        try:
+            self.scan()
+        except Exception as e:
+            logger.error(f"Scan error: {e}")
 
     # ── public API ──────────────────────────────────────────────────
 
+    @staticmethod
+    def _last_modified(adapter: FrameworkAdapter) -> Optional[float]:
+        try:
+            return adapter.get_last_modified()
+        except Exception:
+            return None
+
+    def _refresh(
+        self, eid: str, adapter: FrameworkAdapter, mtime: Optional[float]
+    ) -> Optional[UnifiedExperiment]:
+        """Current info for an experiment, re-read only if its data changed.
+
+        mtime must be read before calling, so a write in between forces a
+        re-fetch next time. The cached entry is replaced in place (a single
+        dict store), so this is safe alongside scan() publishing a new dict.
+        """
+        experiments = self._experiments
+        cached = experiments.get(eid)
+        try:
+            if mtime is None:
+                raise OSError("last-modified time unavailable")
+            if cached is not None and mtime and cached[0] == mtime:
+                info = cached[1]
+                # Status is time-based and ages even when nothing changes
+                status = infer_status(mtime)
+                if info.status != status:
+                    info = info.model_copy(update={"status": status})
+                    experiments[eid] = (mtime, info)
+                return info
+            info = adapter.get_experiment_info()
+            experiments[eid] = (mtime, info)
+            return info
+        except Exception:
+            return cached[1] if cached is not None else None
+
     def list_experiments(self) -> list[UnifiedExperiment]:
-        with self._lock:
-            # Refresh status for each
-            results = []
-            for eid, adapter in self._adapters.items():
-                try:
-                    info = adapter.get_experiment_info()
-                    self._experiments[eid] = info
-                    results.append(info)
-                except Exception:
-                    if eid in self._experiments:
-                        results.append(self._experiments[eid])
-            return results
+        adapters = self._adapters
+        mtimes = [(eid, adapter, self._last_modified(adapter)) for eid, adapter in adapters.items()]
+        # Status ages with the clock, so it is part of the key alongside mtime
+        key = tuple(
+            (eid, mtime, infer_status(mtime) if mtime is not None else None)
+            for eid, _, mtime in mtimes
+        )
+        cached = self._list_cache
+        if cached is not None and cached[0] is adapters and cached[1] == key:
+            return list(cached[2])
+        results = []
+        for eid, adapter, mtime in mtimes:
+            info = self._refresh(eid, adapter, mtime)
+            if info is not None:
+                results.append(info)
+        self._list_cache = (adapters, key, results)
+        return list(results)
 
     def get_experiment(self, experiment_id: str) -> Optional[UnifiedExperiment]:
-        with self._lock:
-            adapter = self._adapters.get(experiment_id)
-            if adapter:
-                try:
-                    info = adapter.get_experiment_info()
-                    self._experiments[experiment_id] = info
-                    return info
-                except Exception:
-                    return self._experiments.get(experiment_id)
-            return None
+        adapter = self._adapters.get(experiment_id)
+        if adapter:
+            return self._refresh(experiment_id, adapter, self._last_modified(adapter))
+        return None
 
     def get_adapter(self, experiment_id: str) -> Optional[FrameworkAdapter]:
-        with self._lock:
-            return self._adapters.get(experiment_id)
+        return self._adapters.get(experiment_id)
+
+    def get_all_adapters(self) -> Mapping[str, FrameworkAdapter]:
+        # scan() never mutates a published dict, so a read-only view of it
+        # is a stable snapshot without copying
+        return MappingProxyType(self._adapters)
+
+
+def _probe(adapter: FrameworkAdapter):
+    """(last-modified time, info) of an experiment, or the exception raised.
+
+    The time is read first, so a write in between forces a later re-fetch.
+    """
+    try:
+        mtime = adapter.get_last_modified()
+        return mtime, adapter.get_experiment_info()
+    except Exception as e:
+        return e
+
+
+def _map_threaded(fn, items: list) -> list:
+    """fn over items, on up to LOAD_THREADS threads when there are several.
+
+    get_experiment_info() reads checkpoints or queries SQLite, so probes of
+    different experiments overlap their I/O.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(LOAD_THREADS, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+if HAS_WATCHDOG:
+    class _DiscoveryHandler(FileSystemEventHandler):
+        """Requests a rescan when a path that could be a new experiment appears."""
+
+        def __init__(self, manager: ExperimentManager, base_dir: str):
+            self._manager = manager
+            self._prefix_len = len(base_dir.rstrip(os.sep)) + 1
 
-    def get_all_adapters(self) -> Dict[str, FrameworkAdapter]:
-        with self._lock:
-            return dict(self._adapters)
+        def dispatch(self, event: FileSystemEvent):
+            path = event.dest_path if event.event_type == EVENT_TYPE_MOVED else event.src_path
+            # A directory moved in arrives whole, without events for its contents
+            if event.is_directory or registry.matches_glob(
+                path[self._prefix_len:].replace(os.sep, "/")
+            ):
+                self._manager._request_scan_threadsafe()
 
 
 # Singleton
@@ -1,58 +1,98 @@
 """OpenEvolve project config for the EvoLLM Dashboard."""
 
 import os
+from typing import Dict, Tuple
 
 from backend.adapters.openevolve_adapter import OpenEvolveAdapter
 
 
+# directory -> (st_mtime_ns, _scan_for_checkpoint result), for results that
+# only a change to the directory's own entries (which bumps its mtime) can
+# overturn. Periodic discovery re-probes the same experiments every scan.
+_SCAN_CACHE: Dict[str, Tuple[int, Tuple[bool, bool]]] = {}
+_SCAN_CACHE_SIZE = 4096
+
+
+def _scan_for_checkpoint(directory: str) -> Tuple[bool, bool]:
+    """Scan directory once for checkpoint_*/ subdirs containing metadata.json.
+
+    Returns ``(found, has_checkpoints_dir)``; the second flag records whether
+    a ``checkpoints/`` subdir was seen on the way, so callers can skip
+    probing for it separately. Repeat calls on an unchanged directory cost
+    one stat.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return False, False
+    cached = _SCAN_CACHE.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    result, settled = _scan_for_checkpoint_uncached(directory)
+    if settled:
+        if len(_SCAN_CACHE) >= _SCAN_CACHE_SIZE:
+            _SCAN_CACHE.clear()
+        _SCAN_CACHE[directory] = (mtime_ns, result)
+    return result
+
+
+def _scan_for_checkpoint_uncached(directory: str) -> Tuple[Tuple[bool, bool], bool]:
+    """The scan itself, plus whether its result can be cached on the mtime.
+
+    A checkpoint_*/ dir still missing its metadata.json may gain it without
+    the directory's mtime changing, so such a miss is not cacheable.
+    """
+    has_checkpoints_dir = False
+    pending_checkpoint = False
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                # is_dir(follow_symlinks=False) is answered from the cached
+                # d_type, so only name-matching dirs cost a syscall (the
+                # metadata.json lstat); symlinked dirs are ignored, like the
+                # discovery walk does
+                if name.startswith("checkpoint_") and entry.is_dir(follow_symlinks=False):
+                    if os.path.lexists(os.path.join(entry.path, "metadata.json")):
+                        return (True, has_checkpoints_dir), True
+                    pending_checkpoint = True
+                elif name == "checkpoints" and entry.is_dir(follow_symlinks=False):
+                    has_checkpoints_dir = True
+    except OSError:
+        return (False, False), False
+    return (False, has_checkpoints_dir), not pending_checkpoint
+
+
 def _detect_openevolve(path: str) -> bool:
     """Detect if a path is an OpenEvolve experiment."""
-    if os.path.isfile(path):
-        return False
-
-    if not os.path.isdir(path):
-        return False
+    # No is-a-directory stat first: for a file or missing path both probes
+    # below already fail (ENOTDIR/ENOENT) and report "not found"
 
     # Check if it IS a checkpoint dir
     if os.path.basename(path).startswith("checkpoint_"):
-        meta = os.path.join(path, "metadata.json")
-        if os.path.exists(meta):
+        if os.path.lexists(os.path.join(path, "metadata.json")):
             return True
 
-    # Check if it contains checkpoint dirs
-    try:
-        for entry in os.listdir(path):
-            sub = os.path.join(path, entry)
-            if os.path.isdir(sub) and entry.startswith("checkpoint_"):
-                meta = os.path.join(sub, "metadata.json")
-                if os.path.exists(meta):
-                    return True
-    except OSError:
-        pass
-
-    # Recurse one level into checkpoints/
-    checkpoints_dir = os.path.join(path, "checkpoints")
-    if os.path.isdir(checkpoints_dir):
-        try:
-            for entry in os.listdir(checkpoints_dir):
-                sub = os.path.join(checkpoints_dir, entry)
-                if os.path.isdir(sub) and entry.startswith("checkpoint_"):
-                    meta = os.path.join(sub, "metadata.json")
-                    if os.path.exists(meta):
-                        return True
-        except OSError:
-            pass
-
+    # Check if it contains checkpoint dirs; the same pass tells us whether
+    # there is a checkpoints/ dir worth recursing one level into
+    found, has_checkpoints_dir = _scan_for_checkpoint(path)
+    if found:
+        return True
+    if has_checkpoints_dir:
+        return _scan_for_checkpoint(os.path.join(path, "checkpoints"))[0]
     return False
 
 
 def _resolve_openevolve_path(match_path: str) -> str:
     """Resolve a glob match (checkpoint_*/metadata.json) to the experiment root."""
-    # match_path is like .../checkpoint_N/metadata.json
-    checkpoint_dir = os.path.dirname(match_path)
-    checkpoints_parent = os.path.dirname(checkpoint_dir)
-    if os.path.basename(checkpoints_parent) == "checkpoints":
-        return os.path.dirname(checkpoints_parent)
+    # match_path is like .../checkpoint_N/metadata.json, built by the discovery
+    # walk and therefore already normalized, so plain rpartition is enough
+    checkpoint_dir = match_path.rpartition(os.sep)[0]
+    checkpoints_parent = checkpoint_dir.rpartition(os.sep)[0]
+    head, _, base = checkpoints_parent.rpartition(os.sep)
+    if base == "checkpoints":
+        return head
     return checkpoints_parent
 
 
@@ -1,16 +1,21 @@
 """ShinkaEvolve project config for the EvoLLM Dashboard."""
 
 import os
+import stat
 
 from backend.adapters.shinka_adapter import ShinkaAdapter
 
 
 def _detect_shinkaevolve(path: str) -> bool:
     """Detect if a path is a ShinkaEvolve SQLite database."""
-    if not os.path.isfile(path):
+    # Only the last 7 chars (len(".sqlite")) can hold the suffix, so lowercase
+    # just those; checking the name first also skips the stat for other files
+    if not path[-7:].lower().endswith((".sqlite", ".db")):
+        return False
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
         return False
-    ext = os.path.splitext(path)[1].lower()
-    return ext in (".sqlite", ".db")
 
 
 PROJECT_CONFIG = {
@@ -5,6 +5,7 @@ export function useWebSocket(experimentId) {
   const wsRef = useRef(null);
   const setConnected = useWebSocketStore((s) => s.setConnected);
   const addEvent = useWebSocketStore((s) => s.addEvent);
+  const addEvents = useWebSocketStore((s) => s.addEvents);
 
   useEffect(() => {
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -23,6 +24,11 @@ export function useWebSocket(experimentId) {
       try {
         const msg = JSON.parse(e.data);
         if (msg.type === 'heartbeat' || msg.type === 'pong' || msg.type === 'subscribed') return;
+        // Bursts of events arrive coalesced into one frame
+        if (msg.type === 'batch') {
+          addEvents(msg.events);
+          return;
+        }
         addEvent(msg);
       } catch {
         // ignore
@@ -36,7 +42,7 @@ export function useWebSocket(experimentId) {
       ws.close();
       setConnected(false);
     };
-  }, [experimentId, setConnected, addEvent]);
+  }, [experimentId, setConnected, addEvent, addEvents]);
 
   return wsRef;
 }
@@ -16,6 +16,18 @@ export const useWebSocketStore = create((set, get) => ({
       return { events, unreadCounts };
     }),
 
+  // Apply a batch of events in one update (newest last in the batch)
+  addEvents: (batch) =>
+    set((state) => {
+      const events = [...batch].reverse().concat(state.events).slice(0, 500);
+      const unreadCounts = { ...state.unreadCounts };
+      for (const event of batch) {
+        const eid = event.experiment_id;
+        unreadCounts[eid] = (unreadCounts[eid] || 0) + 1;
+      }
+      return { events, unreadCounts };
+    }),
+
   clearUnread: (experimentId) =>
     set((state) => ({
       unreadCounts: { ...state.unreadCounts, [experimentId]: 0 },
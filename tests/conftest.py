@@ -2,6 +2,7 @@
 
 import json
 import os
+import sqlite3
 from typing import Any, Dict, List, Optional
 from unittest.mock import MagicMock
 
@@ -95,6 +96,22 @@ def fresh_registry():
     return ProjectRegistry()
 
 
+REAL_CONFIGS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs", "projects"
+)
+
+
+@pytest.fixture(scope="session")
+def real_registry():
+    """A ProjectRegistry loaded once per session from configs/projects/.
+
+    Treat it as read-only; copy its configs into fresh_registry to mutate.
+    """
+    reg = ProjectRegistry()
+    reg.load_all(projects_dir=REAL_CONFIGS_DIR)
+    return reg
+
+
 @pytest.fixture
 def tmp_openevolve_experiment(tmp_path):
     """Create a minimal OpenEvolve experiment directory structure.
@@ -127,3 +144,85 @@ def tmp_shinka_experiment(tmp_path):
     db_file = tmp_path / "evolution.sqlite"
     db_file.write_bytes(b"")
     return str(db_file)
+
+
+# ── ShinkaEvolve database ─────────────────────────────────────────
+
+SHINKA_SCHEMA = """
+CREATE TABLE programs (
+    id TEXT PRIMARY KEY,
+    code TEXT,
+    language TEXT,
+    parent_id TEXT,
+    archive_inspiration_ids TEXT,
+    top_k_inspiration_ids TEXT,
+    generation INTEGER,
+    timestamp REAL,
+    code_diff TEXT,
+    combined_score REAL,
+    public_metrics TEXT,
+    private_metrics TEXT,
+    text_feedback TEXT,
+    complexity REAL,
+    embedding TEXT,
+    embedding_pca_2d TEXT,
+    embedding_pca_3d TEXT,
+    embedding_cluster_id INTEGER,
+    correct INTEGER,
+    children_count INTEGER,
+    metadata TEXT,
+    migration_history TEXT,
+    island_idx INTEGER
+);
+CREATE TABLE archive (program_id TEXT PRIMARY KEY);
+CREATE TABLE metadata_store (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def insert_shinka_program(conn, pid, **fields):
+    row = {
+        "id": pid, "code": f"# {pid}", "language": "python", "parent_id": None,
+        "archive_inspiration_ids": "[]", "top_k_inspiration_ids": "[]",
+        "generation": 0, "timestamp": 0.0, "code_diff": None,
+        "combined_score": 0.0, "public_metrics": "{}", "private_metrics": "{}",
+        "text_feedback": None, "complexity": 1.0, "embedding": "[]",
+        "embedding_pca_2d": "[]", "embedding_pca_3d": "[]",
+        "embedding_cluster_id": None, "correct": 1, "children_count": 0,
+        "metadata": "{}", "migration_history": "[]", "island_idx": 0,
+        **fields,
+    }
+    cols = ", ".join(row)
+    marks = ", ".join("?" for _ in row)
+    conn.execute(f"INSERT INTO programs ({cols}) VALUES ({marks})", tuple(row.values()))
+
+
+@pytest.fixture
+def shinka_db(tmp_path):
+    """A ShinkaEvolve database with a small lineage.
+
+    p0 -> p1 -> p3
+       -> p2
+    """
+    db = tmp_path / "evolution.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SHINKA_SCHEMA)
+    insert_shinka_program(conn, "p0", combined_score=0.1, timestamp=100.0, children_count=2,
+                    public_metrics='{"a": 0.1, "b": NaN}')
+    insert_shinka_program(conn, "p1", parent_id="p0", generation=1, combined_score=0.4,
+                    timestamp=160.0, children_count=1, embedding="[1.0, 0.0]",
+                    metadata=json.dumps({"api_costs": 0.5, "patch_type": "diff",
+                                         "llm_result": {"model_name": "m1"}}))
+    insert_shinka_program(conn, "p2", parent_id="p0", generation=1, combined_score=0.2,
+                    timestamp=170.0, island_idx=1, embedding="[0.0, 2.0]",
+                    metadata=json.dumps({"api_costs": 0.25, "patch_type": "full",
+                                         "llm_result": {"model_name": "m2"}}))
+    insert_shinka_program(conn, "p3", parent_id="p1", generation=2, combined_score=0.9,
+                    timestamp=220.0, code_diff="+fast", embedding="[3.0, 3.0]",
+                    metadata=json.dumps({"api_costs": 1.0, "patch_type": "diff",
+                                         "llm_result": {"model_name": "m1"}}))
+    conn.execute("INSERT INTO archive VALUES ('p3')")
+    conn.execute("INSERT INTO metadata_store VALUES ('last_iteration', '3')")
+    conn.commit()
+    conn.close()
+    return str(db)
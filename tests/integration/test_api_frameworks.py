@@ -49,3 +49,294 @@ async def test_health_endpoint():
         assert isinstance(exp["framework"], str)
         assert isinstance(exp["id"], str)
         assert isinstance(exp["name"], str)
+
+
+@pytest.mark.asyncio
+async def test_aggregate_endpoints_serve_shinka_experiment(shinka_db):
+    """Metrics and analytics (run on the thread pool) answer from the adapter."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    adapter = ShinkaAdapter(shinka_db)
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": adapter}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            metrics = await client.get("/api/experiments/se_test/metrics")
+            analytics = await client.get("/api/experiments/se_test/analytics")
+            embeddings = await client.get("/api/experiments/se_test/embeddings")
+
+    assert metrics.status_code == 200
+    assert metrics.json()["summary"]["total_programs"] == 4
+    assert analytics.status_code == 200
+    assert analytics.json()["analytics"]["patch_type_distribution"] == {"diff": 2, "full": 1}
+    assert embeddings.json()["program_ids"] == ["p3", "p1", "p2"]
+
+
+@pytest.mark.asyncio
+async def test_non_finite_metrics_serialize_as_null(shinka_db):
+    """Program metrics may hold NaN; responses encode it as null."""
+    pytest.importorskip("orjson")
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            resp = await client.get("/api/experiments/se_test/programs/p0")
+
+    assert resp.status_code == 200
+    assert resp.json()["program"]["metrics"] == {"a": 0.1, "b": None}
+
+
+@pytest.mark.asyncio
+async def test_list_responses_cached_until_adapter_version_bumps(shinka_db):
+    """Repeat GETs reuse the encoded page; a change event re-queries."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    adapter = ShinkaAdapter(shinka_db)
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": adapter}), \
+            patch.object(ShinkaAdapter, "get_programs", autospec=True,
+                         side_effect=ShinkaAdapter.get_programs) as spy:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            first = await client.get("/api/experiments/se_test/programs?page_size=2")
+            second = await client.get("/api/experiments/se_test/programs?page_size=2")
+            other = await client.get("/api/experiments/se_test/programs?page_size=3")
+            adapter.bump_version()
+            third = await client.get("/api/experiments/se_test/programs?page_size=2")
+
+    assert spy.call_count == 3
+    assert first.content == second.content == third.content
+    assert first.json()["total"] == 4
+    assert len(other.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_programs_stream_as_ndjson(shinka_db):
+    """format=ndjson yields a pagination header line, then one program per line."""
+    import json
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            resp = await client.get(
+                "/api/experiments/se_test/programs?format=ndjson&page_size=3&sort_by=id&sort_desc=false"
+            )
+            bad = await client.get("/api/experiments/se_test/programs?format=xml")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    header, *items = [json.loads(line) for line in resp.text.splitlines()]
+    assert header == {"total": 4, "page": 1, "page_size": 3, "total_pages": 2}
+    assert [p["id"] for p in items] == ["p0", "p1", "p2"]
+    assert bad.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_bypass_response_model_pass(shinka_db):
+    """Cached endpoints encode their own model even with the cache disabled."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.api._cache import response_cache
+    from backend.services.experiment_manager import manager
+
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}), \
+            patch.object(response_cache, "ttl", 0), \
+            patch("fastapi.routing.serialize_response") as serialize:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            programs = await client.get("/api/experiments/se_test/programs")
+            search = await client.get("/api/experiments/se_test/search?q=def")
+
+    serialize.assert_not_called()
+    assert programs.json()["total"] == 4
+    assert search.status_code == 200
+    assert search.json()["query"] == "def"
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(shinka_db):
+    """Responses past the size threshold are compressed for gzip-capable clients."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            programs = await client.get("/api/experiments/se_test/programs",
+                                        headers={"Accept-Encoding": "gzip"})
+            small = await client.get("/api/experiments/se_test/meta-files",
+                                     headers={"Accept-Encoding": "gzip"})
+
+    assert len(programs.content) >= 1024
+    assert programs.headers["content-encoding"] == "gzip"
+    assert programs.json()["total"] == 4
+    assert "content-encoding" not in small.headers
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_answer_matching_etag_with_304(shinka_db):
+    """A repeat poll carrying the page's ETag gets an empty 304."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    adapter = ShinkaAdapter(shinka_db)
+    url = "/api/experiments/se_test/conversations"
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": adapter}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            first = await client.get(url)
+            etag = first.headers["etag"]
+            again = await client.get(url, headers={"If-None-Match": etag})
+            # New version, same data: the content-derived tag still matches
+            adapter.bump_version()
+            after_bump = await client.get(url, headers={"If-None-Match": f'W/"x", {etag}'})
+            stale = await client.get(url, headers={"If-None-Match": 'W/"stale"'})
+
+    assert etag.startswith('W/"')
+    assert again.status_code == after_bump.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_cached_endpoints_do_not_expose_request_parameter():
+    params = app.openapi()["paths"]["/api/experiments/{experiment_id}/programs"]["get"]["parameters"]
+    assert "_request" not in {p["name"] for p in params}
+
+
+@pytest.mark.asyncio
+async def test_best_path_lists_programs_root_first(shinka_db):
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    adapter = ShinkaAdapter(shinka_db)
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": adapter}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            resp = await client.get("/api/experiments/se_test/best-path")
+
+    assert resp.status_code == 200
+    path = resp.json()["path"]
+    assert [p["id"] for p in path] == adapter.get_lineage().best_path
+    assert path and "code" in path[0]
+
+
+@pytest.mark.asyncio
+async def test_cursor_paging_over_http(shinka_db):
+    """after= switches to cursor pages: no total, next_cursor until the end."""
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    url = "/api/experiments/se_test/programs"
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            first = (await client.get(url, params={"after": "", "page_size": 3})).json()
+            second = (await client.get(url, params={"after": first["next_cursor"],
+                                                    "page_size": 3})).json()
+            convs = (await client.get("/api/experiments/se_test/conversations",
+                                      params={"after": ""})).json()
+            bad = await client.get(url, params={"after": "garbage"})
+
+    assert "total" not in first
+    assert [p["id"] for p in first["items"] + second["items"]] == ["p3", "p1", "p2", "p0"]
+    assert second["next_cursor"] is None
+    assert convs["next_cursor"] is None and len(convs["items"]) == 4
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_wrong_type_cursor_is_400(shinka_db):
+    """Well-formed cursors holding unbindable values are rejected, not retried."""
+    import time
+    from unittest.mock import patch
+
+    from backend.adapters.base import encode_cursor
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    cursors = [
+        encode_cursor("k", {"x": 1}, 2),
+        encode_cursor("k", [1], 2),
+        encode_cursor("k", 1, "2"),
+        encode_cursor("k", 1, True),
+        encode_cursor("k", 1, 2.5),
+    ]
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            for route in ("programs", "conversations"):
+                for cursor in cursors:
+                    start = time.monotonic()
+                    resp = await client.get(f"/api/experiments/se_test/{route}",
+                                            params={"after": cursor})
+                    assert resp.status_code == 400, (route, cursor)
+                    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_unknown_experiment_is_404_on_every_route():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for path in ("programs", "programs/p0", "search?q=x", "conversations",
+                     "islands", "lineage", "best-path", "metrics", "analytics"):
+            resp = await client.get(f"/api/experiments/no_such_exp/{path}")
+            assert resp.status_code == 404, path
+            assert resp.json()["detail"] == "Experiment no_such_exp not found"
+
+
+def test_adapter_dependency_not_exposed_as_parameter():
+    params = app.openapi()["paths"]["/api/experiments/{experiment_id}/metrics"]["get"]["parameters"]
+    assert [p["name"] for p in params] == ["experiment_id"]
+
+
+@pytest.mark.asyncio
+async def test_search_query_length_is_bounded(shinka_db):
+    from unittest.mock import patch
+
+    from backend.adapters.shinka_adapter import ShinkaAdapter
+    from backend.services.experiment_manager import manager
+
+    transport = ASGITransport(app=app)
+    with patch.dict(manager._adapters, {"se_test": ShinkaAdapter(shinka_db)}):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            resp = await client.get("/api/experiments/se_test/search", params={"q": "x" * 201})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_openapi_served_from_prebuilt_bytes():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = await client.get("/openapi.json")
+        again = await client.get("/openapi.json")
+        docs = await client.get("/docs")
+
+    assert first.status_code == 200
+    assert first.json() == app.openapi()
+    assert again.content == first.content == app.state.openapi_body
+    assert [getattr(r, "path", None) for r in app.routes].count("/openapi.json") == 1
+    assert "/openapi.json" not in first.json()["paths"]
+    assert docs.status_code == 200
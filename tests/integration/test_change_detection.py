@@ -1,13 +1,19 @@
 """Integration tests for backend.services.change_detection."""
 
+import asyncio
+import os
 import sys
+import threading
 import time
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from backend.adapters.registry import ProjectConfig, ProjectRegistry
-from backend.services.change_detection import ChangeDetectionEngine
+from backend.services.change_detection import HAS_WATCHDOG, ChangeDetectionEngine
+
+if HAS_WATCHDOG:
+    from backend.services.change_detection import _WatchdogHandler
 
 from tests.conftest import MockAdapter
 
@@ -76,6 +82,29 @@ class TestRegisterExperiment:
         assert meta is not None
         assert meta["strategy"] == "poll"
 
+    def test_fixed_strategy_read_from_registry_index(self, mock_adapter_class):
+        reg = ProjectRegistry()
+        for name, mode in (("poller", "poll"), ("auto_fw", "auto")):
+            reg.register(ProjectConfig(
+                name=name,
+                adapter_class=mock_adapter_class,
+                detect=lambda p: True,
+                glob_patterns=[],
+                change_detection=mode,
+            ))
+
+        engine = ChangeDetectionEngine()
+        with _patch_registry(reg), \
+                patch.object(reg, "change_detection_for", wraps=reg.change_detection_for) as spy:
+            for i in range(3):
+                engine.register_experiment(f"p{i}", f"/tmp/p{i}", "poller")
+                engine.register_experiment(f"a{i}", f"/tmp/a{i}", "auto_fw")
+
+        # "auto" depends on each path's filesystem, so it is not shared
+        assert [c.args[0] for c in spy.call_args_list].count("poller") == 0
+        assert [c.args[0] for c in spy.call_args_list].count("auto_fw") == 3
+        assert {engine._experiment_meta[f"p{i}"]["strategy"] for i in range(3)} == {"poll"}
+
 
 class TestCallbacks:
     def test_on_change_registers_callback(self):
@@ -84,6 +113,17 @@ class TestCallbacks:
         engine.on_change(cb)
         assert cb in engine._callbacks
 
+    def test_callback_kind_resolved_at_registration(self):
+        engine = ChangeDetectionEngine()
+        sync_cb = MagicMock()
+
+        async def async_cb(event):
+            pass
+
+        engine.on_change(sync_cb)
+        engine.on_change(async_cb)
+        assert engine._callback_snapshot == ((sync_cb, False), (async_cb, True))
+
     def test_fire_event_calls_sync_callback(self):
         """A synchronous callback gets called by _fire_event."""
         engine = ChangeDetectionEngine()
@@ -139,13 +179,97 @@ class TestHandleFsEvent:
         engine.handle_fs_event("exp1", "/path/to/trace.jsonl")
         assert cb.call_count == 1
 
-    def test_non_json_file_ignored(self):
+
+@pytest.mark.skipif(not HAS_WATCHDOG, reason="watchdog not installed")
+class TestWatchdogHandler:
+    @staticmethod
+    def _handler():
         engine = ChangeDetectionEngine()
-        cb = MagicMock()
-        engine.on_change(cb)
+        engine._path_to_expid["/cp"] = "exp1"
+        engine.handle_fs_event = MagicMock()
+        return _WatchdogHandler(engine), engine.handle_fs_event
+
+    def test_non_json_file_ignored(self):
+        from watchdog.events import FileModifiedEvent
 
-        engine.handle_fs_event("exp1", "/path/to/image.png")
-        assert cb.call_count == 0
+        handler, handled = self._handler()
+        handler.dispatch(FileModifiedEvent("/cp/image.png"))
+        handler.dispatch(FileModifiedEvent("/cp/checkpoint_1/program.json.tmp"))
+        assert handled.call_count == 0
+
+    def test_created_and_modified_json_handled(self):
+        from watchdog.events import FileCreatedEvent, FileModifiedEvent
+
+        handler, handled = self._handler()
+        handler.dispatch(FileCreatedEvent("/cp/program.json"))
+        handler.dispatch(FileModifiedEvent("/cp/trace.jsonl"))
+        assert [c.args for c in handled.call_args_list] == [
+            ("exp1", "/cp/program.json"), ("exp1", "/cp/trace.jsonl"),
+        ]
+
+    def test_rename_counts_by_destination(self):
+        from watchdog.events import DirModifiedEvent, FileDeletedEvent, FileMovedEvent
+
+        handler, handled = self._handler()
+        handler.dispatch(FileMovedEvent("/cp/.program.json.tmp", "/cp/program.json"))
+        handler.dispatch(FileMovedEvent("/cp/program.json", "/cp/program.bak"))
+        handler.dispatch(FileDeletedEvent("/cp/old.json"))
+        handler.dispatch(DirModifiedEvent("/cp/checkpoint.json"))
+        assert [c.args for c in handled.call_args_list] == [("exp1", "/cp/program.json")]
+
+
+    def test_events_resolve_to_nearest_experiment(self):
+        from watchdog.events import FileModifiedEvent
+
+        handler, handled = self._handler()
+        handler._engine._path_to_expid["/cp/inner"] = "exp2"
+        handler.dispatch(FileModifiedEvent("/cp/inner/checkpoint_1/program.json"))
+        handler.dispatch(FileModifiedEvent("/cp/checkpoint_1/program.json"))
+        handler.dispatch(FileModifiedEvent("/elsewhere/program.json"))
+        assert [c.args[0] for c in handled.call_args_list] == ["exp2", "exp1"]
+
+    def test_nested_experiments_share_one_watch(self, tmp_path):
+        engine = ChangeDetectionEngine()
+        (tmp_path / "a" / "inner").mkdir(parents=True)
+        (tmp_path / "b").mkdir()
+        # Registered before start(): watches are scheduled when it runs
+        engine._setup_watchdog("inner", str(tmp_path / "a" / "inner"))
+        engine.start()
+        try:
+            engine._setup_watchdog("b", str(tmp_path / "b"))
+            engine._setup_watchdog("a", str(tmp_path / "a"))
+            assert set(engine._watches) == {str(tmp_path / "a"), str(tmp_path / "b")}
+            assert engine._resolve_expid(str(tmp_path / "a" / "inner" / "x.json")) == "inner"
+        finally:
+            engine.stop()
+
+    def test_watch_filters_event_types(self, tmp_path):
+        from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+        engine = ChangeDetectionEngine()
+        engine.start()
+        try:
+            engine._setup_watchdog("a", str(tmp_path))
+            watch = engine._watches[str(tmp_path)]
+            assert watch.event_filter == frozenset(
+                {FileCreatedEvent, FileModifiedEvent, FileMovedEvent}
+            )
+        finally:
+            engine.stop()
+
+    def test_filtered_watch_still_sees_new_checkpoints(self, tmp_path):
+        engine = ChangeDetectionEngine()
+        seen = threading.Event()
+        engine.handle_fs_event = lambda eid, path: seen.set()
+        engine.start()
+        try:
+            engine._setup_watchdog("a", str(tmp_path))
+            # A file in a directory created after the watch started
+            (tmp_path / "checkpoint_1").mkdir()
+            time.sleep(0.1)
+            (tmp_path / "checkpoint_1" / "metadata.json").write_text("{}")
+            assert seen.wait(5)
+        finally:
+            engine.stop()
 
 
 class TestPollLoopStrategy:
@@ -177,3 +301,140 @@ class TestPollLoopStrategy:
         # Verify strategies were assigned
         assert engine._experiment_meta["poll_exp"]["strategy"] == "poll"
         assert engine._experiment_meta["watch_exp"]["strategy"] == "watchdog"
+
+    def test_poll_once_sweeps_each_directory_once(self, tmp_path, mock_adapter_class):
+        """Polled files sharing a directory are read from one scandir."""
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="poller",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+            change_detection="poll",
+        ))
+        for name in ("a.sqlite", "b.sqlite"):
+            (tmp_path / name).write_bytes(b"")
+            os.utime(tmp_path / name, (1000, 1000))
+
+        engine = ChangeDetectionEngine()
+        cb = MagicMock()
+        engine.on_change(cb)
+        with _patch_registry(reg):
+            engine.register_experiment("a", str(tmp_path / "a.sqlite"), "poller")
+            engine.register_experiment("b", str(tmp_path / "b.sqlite"), "poller")
+        assert engine._poll_groups == {str(tmp_path): {"a.sqlite": "a", "b.sqlite": "b"}}
+
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            engine._poll_once()
+        assert scandir.call_count == 1
+        assert cb.call_count == 0  # first sighting only records the mtime
+
+        # A WAL-mode write shows up in the -wal file before the database
+        (tmp_path / "b.sqlite-wal").write_bytes(b"")
+        os.utime(tmp_path / "b.sqlite-wal", (2000, 2000))
+        engine._poll_once()
+        assert [c.args[0].experiment_id for c in cb.call_args_list] == ["b"]
+
+    def test_poll_tracks_nanosecond_mtimes(self, tmp_path):
+        db = tmp_path / "a.sqlite"
+        db.write_bytes(b"")
+        base = 1_700_000_000 * 10**9
+        os.utime(db, ns=(base, base))
+        if os.stat(db).st_mtime_ns != base:
+            pytest.skip("filesystem lacks nanosecond timestamps")
+
+        engine = ChangeDetectionEngine()
+        cb = MagicMock()
+        engine.on_change(cb)
+        with _patch_registry(ProjectRegistry()):
+            engine.register_experiment("a", str(db), "unknown")
+        engine._poll_once()
+        assert engine._last_mtimes["a"] == base
+
+        # Too small a step for a float of epoch seconds to represent
+        os.utime(db, ns=(base + 1, base + 1))
+        engine._poll_once()
+        assert cb.call_count == 1
+
+    def test_reregistering_moves_poll_group(self, tmp_path, mock_adapter_class):
+        reg = ProjectRegistry()
+        engine = ChangeDetectionEngine()
+        with _patch_registry(reg):
+            engine.register_experiment("a", str(tmp_path / "old" / "a.sqlite"), "unknown")
+            engine.register_experiment("a", str(tmp_path / "new" / "a.sqlite"), "unknown")
+        assert engine._poll_groups == {str(tmp_path / "new"): {"a.sqlite": "a"}}
+
+
+class TestAsyncPoller:
+    @pytest.mark.asyncio
+    async def test_poller_runs_on_loop_and_awaits_async_callbacks(self, tmp_path):
+        db = tmp_path / "a.sqlite"
+        db.write_bytes(b"")
+        os.utime(db, (1000, 1000))
+
+        received = []
+
+        async def cb(event):
+            received.append(event.experiment_id)
+
+        engine = ChangeDetectionEngine()
+        engine.set_loop(asyncio.get_running_loop())
+        engine.on_change(cb)
+        with _patch_registry(ProjectRegistry()):
+            engine.register_experiment("a", str(db), "unknown")
+
+        with patch("backend.services.change_detection.SQLITE_POLL_INTERVAL", 0.01):
+            engine.start()
+            try:
+                await asyncio.sleep(0.05)
+                os.utime(db, (2000, 2000))
+                for _ in range(100):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                engine.stop()
+
+        assert received == ["a"]
+        assert engine._poll_task is None
+
+
+class TestDebounce:
+    @staticmethod
+    def _event(n):
+        from backend.models.unified import EventType, UnifiedEvent
+        return UnifiedEvent(type=EventType.NEW_PROGRAM, experiment_id="exp1",
+                            timestamp=float(n), data={"n": n})
+
+    @pytest.mark.asyncio
+    async def test_burst_sends_first_and_last(self):
+        engine = ChangeDetectionEngine()
+        engine.set_loop(asyncio.get_running_loop())
+        cb = MagicMock()
+        engine.on_change(cb)
+
+        with patch("backend.services.change_detection.FS_DEBOUNCE", 0.02):
+            for n in range(5):
+                engine._fire_event(self._event(n))
+            assert [c.args[0].data["n"] for c in cb.call_args_list] == [0]
+            await asyncio.sleep(0.05)
+            assert [c.args[0].data["n"] for c in cb.call_args_list] == [0, 4]
+            await asyncio.sleep(0.05)
+        assert cb.call_count == 2
+        assert engine._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_events_from_other_threads_are_handed_to_loop(self):
+        engine = ChangeDetectionEngine()
+        engine.set_loop(asyncio.get_running_loop())
+        threads = []
+        engine.on_change(lambda event: threads.append(threading.get_ident()))
+
+        worker = threading.Thread(target=engine._fire_event, args=(self._event(0),))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0.01)
+        engine.stop()
+
+        assert threads == [threading.get_ident()]
+        assert engine._pending == {}
@@ -1,16 +1,17 @@
 """Integration tests for backend.services.experiment_manager."""
 
+import asyncio
+import os
+import shutil
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from backend.adapters.registry import ProjectConfig, ProjectRegistry
 from backend.models.unified import ExperimentStatus, UnifiedExperiment
-from backend.services.experiment_manager import ExperimentManager
-
-
-# We need to import the module-level MockAdapter from conftest
-from tests.conftest import MockAdapter
+from backend.services.experiment_manager import HAS_WATCHDOG, ExperimentManager
 
 
 class TestExperimentManagerScan:
@@ -38,6 +39,52 @@ class TestExperimentManagerScan:
         assert exps[0].id == "mock_exp"
         assert exps[0].framework == "mock"
 
+    def test_rescan_reuses_adapter(self, tmp_path, mock_adapter_class):
+        """A path seen on an earlier scan keeps its adapter instance."""
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        fake_discoveries = [(str(tmp_path / "exp1"), "mock")]
+
+        with patch.object(reg, "discover_experiments", return_value=fake_discoveries):
+            with patch("backend.services.experiment_manager.registry", reg):
+                mgr.scan()
+                first = mgr.get_adapter("mock_exp")
+                mgr.scan()
+
+        assert mgr.get_adapter("mock_exp") is first
+
+    def test_rescan_drops_deleted_experiment(self, tmp_path, real_registry):
+        """A deleted experiment dir loses its adapter, its watch and its entry."""
+        for name in ("keep", "gone"):
+            cp = tmp_path / name / "checkpoints" / "checkpoint_1"
+            (cp / "programs").mkdir(parents=True)
+            (cp / "metadata.json").write_text("{}")
+
+        mgr = ExperimentManager()
+        with patch("backend.services.experiment_manager.BASE_DIR", tmp_path), \
+                patch("backend.services.experiment_manager.registry", real_registry):
+            mgr.scan()
+            assert sorted(mgr.get_all_adapters()) == ["oe_gone", "oe_keep"]
+            gone, keep = mgr.get_adapter("oe_gone"), mgr.get_adapter("oe_keep")
+            assert gone._watching == HAS_WATCHDOG
+
+            shutil.rmtree(tmp_path / "gone")
+            mgr.scan()
+
+        assert list(mgr.get_all_adapters()) == ["oe_keep"]
+        assert mgr.get_adapter("oe_keep") is keep
+        assert mgr.get_experiment("oe_gone") is None
+        assert [e.id for e in mgr.list_experiments()] == ["oe_keep"]
+        assert list(mgr._known.values()) == ["oe_keep"]
+        assert not gone._watching
+
     def test_scan_handles_adapter_failure(self, tmp_path, mock_adapter_class):
         """If adapter.get_experiment_info() raises, that experiment is skipped."""
 
@@ -63,6 +110,32 @@ class TestExperimentManagerScan:
 
         assert mgr.list_experiments() == []
 
+    def test_scan_probes_experiments_concurrently(self, tmp_path, mock_adapter_class):
+        """get_experiment_info() of several experiments runs in parallel."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        class SlowAdapter(mock_adapter_class):
+            def get_experiment_info(self):
+                barrier.wait()  # breaks unless all three probes overlap
+                info = super().get_experiment_info()
+                return info.model_copy(update={"id": os.path.basename(self.experiment_path)})
+
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=SlowAdapter,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        fake_discoveries = [(str(tmp_path / name), "mock") for name in ("a", "b", "c")]
+        with patch.object(reg, "discover_experiments", return_value=fake_discoveries):
+            with patch("backend.services.experiment_manager.registry", reg):
+                mgr.scan()
+
+        assert sorted(mgr.get_all_adapters()) == ["a", "b", "c"]
+
 
 class TestExperimentManagerAPI:
     def test_list_experiments_returns_info(self, tmp_path, mock_adapter_class):
@@ -136,7 +209,7 @@ class TestExperimentManagerAPI:
         assert adapter is not None
         assert isinstance(adapter, mock_adapter_class)
 
-    def test_get_all_adapters_returns_copy(self, tmp_path, mock_adapter_class):
+    def test_get_all_adapters_is_read_only(self, tmp_path, mock_adapter_class):
         reg = ProjectRegistry()
         cfg = ProjectConfig(
             name="mock",
@@ -154,7 +227,206 @@ class TestExperimentManagerAPI:
                 mgr.scan()
 
         adapters = mgr.get_all_adapters()
-        assert isinstance(adapters, dict)
-        # Mutating the returned dict should not affect internal state
-        adapters.clear()
+        assert list(adapters) == ["mock_exp"]
+        # The snapshot is read-only, so callers can't alter internal state
+        with pytest.raises(TypeError):
+            adapters["other"] = None
         assert mgr.get_adapter("mock_exp") is not None
+
+    def test_scan_publishes_new_dict(self, tmp_path, mock_adapter_class):
+        """Readers holding the previous mapping never see it change."""
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        before = mgr._adapters
+        with patch.object(reg, "discover_experiments", return_value=[(str(tmp_path / "a"), "mock")]):
+            with patch("backend.services.experiment_manager.registry", reg):
+                mgr.scan()
+
+        assert before == {}
+        assert mgr._adapters is not before
+        assert list(mgr._adapters) == ["mock_exp"]
+
+    def test_list_skips_refresh_when_unmodified(self, tmp_path, mock_adapter_class):
+        """Info is re-read only after get_last_modified() moves."""
+        stamp = [time.time()]
+        calls = []
+
+        class CountingAdapter(mock_adapter_class):
+            def get_experiment_info(self):
+                calls.append(1)
+                return super().get_experiment_info()
+
+            def get_last_modified(self):
+                return stamp[0]
+
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=CountingAdapter,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        with patch.object(reg, "discover_experiments", return_value=[(str(tmp_path / "a"), "mock")]):
+            with patch("backend.services.experiment_manager.registry", reg):
+                mgr.scan()
+
+        assert len(calls) == 1
+        mgr.list_experiments()
+        mgr.get_experiment("mock_exp")
+        assert len(calls) == 1
+
+        stamp[0] += 1
+        assert mgr.list_experiments()[0].id == "mock_exp"
+        assert len(calls) == 2
+
+    def test_cached_info_status_ages(self, tmp_path, mock_adapter_class):
+        """A reused entry still reports a status derived from its age."""
+        stamp = time.time() - 10 * 86400
+
+        class StaleAdapter(mock_adapter_class):
+            def get_last_modified(self):
+                return stamp
+
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=StaleAdapter,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        with patch.object(reg, "discover_experiments", return_value=[(str(tmp_path / "a"), "mock")]):
+            with patch("backend.services.experiment_manager.registry", reg):
+                mgr.scan()
+
+        assert mgr.get_experiment("mock_exp").status == ExperimentStatus.COMPLETED
+
+
+    def test_list_reuses_results_until_stamp_or_scan_changes(self, tmp_path, mock_adapter_class):
+        stamp = [time.time()]
+
+        class StampAdapter(mock_adapter_class):
+            def get_last_modified(self):
+                return stamp[0]
+
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=StampAdapter,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+
+        mgr = ExperimentManager()
+        with patch.object(reg, "discover_experiments", return_value=[(str(tmp_path / "a"), "mock")]), \
+                patch("backend.services.experiment_manager.registry", reg):
+            mgr.scan()
+            first = mgr.list_experiments()
+            with patch.object(mgr, "_refresh", wraps=mgr._refresh) as spy:
+                assert mgr.list_experiments() == first
+                assert spy.call_count == 0
+
+                stamp[0] += 1
+                mgr.list_experiments()
+                assert spy.call_count == 1
+
+                mgr.scan()
+                mgr.list_experiments()
+                assert spy.call_count == 2
+
+
+class TestExperimentManagerTimer:
+    async def test_rescans_on_loop_timer(self):
+        """Periodic scans run from a loop timer, not a dedicated thread."""
+        mgr = ExperimentManager()
+        with patch("backend.services.experiment_manager.SCAN_INTERVAL", 0.01), \
+                patch.object(mgr, "_watch_base_dir", return_value=False), \
+                patch.object(mgr, "scan") as scan:
+            mgr.start()
+            assert mgr._scan_handle is not None
+            for _ in range(100):
+                if scan.call_count >= 3:
+                    break
+                await asyncio.sleep(0.01)
+            mgr.stop()
+
+        assert scan.call_count >= 3
+        assert mgr._scan_handle is None
+        assert not hasattr(mgr, "_scan_thread")
+        count = scan.call_count
+        await asyncio.sleep(0.05)
+        assert scan.call_count == count
+
+    def test_start_without_loop_scans_once(self):
+        mgr = ExperimentManager()
+        with patch.object(mgr, "scan") as scan:
+            mgr.start()
+            mgr.stop()
+        assert scan.call_count == 1
+        assert mgr._scan_handle is None
+
+
+@pytest.mark.skipif(not HAS_WATCHDOG, reason="watchdog not installed")
+class TestExperimentManagerWatch:
+    @staticmethod
+    def _registry(mock_adapter_class):
+        reg = ProjectRegistry()
+        reg.register(ProjectConfig(
+            name="mock",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=["**/*.db"],
+        ))
+        return reg
+
+    async def _wait_for(self, scan, count):
+        for _ in range(200):
+            if scan.call_count >= count:
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_new_matching_file_triggers_scan(self, tmp_path, mock_adapter_class):
+        mgr = ExperimentManager()
+        with patch("backend.services.experiment_manager.BASE_DIR", tmp_path), \
+                patch("backend.services.experiment_manager.FS_DEBOUNCE", 0.01), \
+                patch("backend.services.experiment_manager.registry", self._registry(mock_adapter_class)), \
+                patch.object(mgr, "scan") as scan:
+            mgr.start()
+            try:
+                assert mgr._observer is not None
+                assert mgr._scan_handle is None  # no interval timer while watching
+                (tmp_path / "exp").mkdir()
+                (tmp_path / "exp" / "notes.txt").write_text("x")
+                await asyncio.sleep(0.2)
+                assert scan.call_count == 1  # startup scan only
+
+                (tmp_path / "exp" / "evolution.db").write_text("")
+                await self._wait_for(scan, 2)
+                assert scan.call_count == 2
+            finally:
+                mgr.stop()
+        assert mgr._observer is None
+
+    async def test_falls_back_to_interval_without_fs_events(self, tmp_path, mock_adapter_class):
+        mgr = ExperimentManager()
+        reg = self._registry(mock_adapter_class)
+        with patch("backend.services.experiment_manager.BASE_DIR", tmp_path), \
+                patch("backend.services.experiment_manager.registry", reg), \
+                patch.object(reg, "supports_fs_events", return_value=False), \
+                patch.object(mgr, "scan"):
+            mgr.start()
+            try:
+                assert mgr._observer is None
+                assert mgr._scan_handle is not None
+            finally:
+                mgr.stop()
@@ -0,0 +1,81 @@
+"""Tests for backend.adapters.base — FrameworkAdapter contract."""
+
+import pytest
+
+from backend.adapters.base import FrameworkAdapter
+
+
+class TestFrameworkAdapter:
+    def test_base_cannot_be_instantiated(self):
+        with pytest.raises(TypeError):
+            FrameworkAdapter("/tmp/exp")
+
+    def test_incomplete_subclass_cannot_be_instantiated(self):
+        class Partial(FrameworkAdapter):
+            def get_experiment_info(self):
+                return None
+
+        with pytest.raises(TypeError, match="get_programs") as exc:
+            Partial("/tmp/exp")
+        assert "get_experiment_info" not in str(exc.value)
+
+    def test_complete_subclass_gets_optional_defaults(self, mock_adapter_class):
+        adapter = mock_adapter_class("/tmp/exp")
+        assert adapter.experiment_path == "/tmp/exp"
+        assert adapter.get_meta_files() == []
+        assert adapter.get_meta_content(0) is None
+
+    def test_columns_default_transposes_brief(self, mock_adapter_class):
+        adapter = mock_adapter_class("/tmp/exp")
+        assert adapter.get_all_programs_columns() == {}
+        adapter.get_all_programs_brief = lambda: [
+            {"id": "a", "score": 1.0}, {"id": "b", "score": 2.0},
+        ]
+        assert adapter.get_all_programs_columns() == {"id": ["a", "b"], "score": [1.0, 2.0]}
+
+    def test_bump_version_never_repeats_across_adapters(self, mock_adapter_class):
+        a = mock_adapter_class("/tmp/exp")
+        b = mock_adapter_class("/tmp/exp")
+        assert a.version != b.version
+        before = a.version
+        a.bump_version()
+        assert a.version not in (before, b.version)
+
+
+class TestCursorPaging:
+    @pytest.fixture
+    def paged(self, mock_adapter_class):
+        adapter = mock_adapter_class("/tmp/exp")
+        data = [f"p{i}" for i in range(7)]
+        calls = []
+
+        def get_programs(page=1, page_size=50, **filters):
+            calls.append((page, page_size))
+            return data[(page - 1) * page_size:page * page_size], len(data)
+
+        adapter.get_programs = get_programs
+        return adapter, calls
+
+    def test_offset_cursor_walks_all_programs(self, paged):
+        adapter, calls = paged
+        items, cursor = adapter.get_programs_after(page_size=3)
+        seen = list(items)
+        while cursor is not None:
+            items, cursor = adapter.get_programs_after(after=cursor, page_size=3)
+            seen += items
+        assert seen == [f"p{i}" for i in range(7)]
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+    def test_page_size_change_mid_walk(self, paged):
+        adapter, _ = paged
+        first, cursor = adapter.get_programs_after(page_size=2)
+        second, cursor = adapter.get_programs_after(after=cursor, page_size=3)
+        assert first + second == ["p0", "p1", "p2", "p3", "p4"]
+
+    def test_cursor_round_trip_and_rejects_garbage(self):
+        from backend.adapters.base import decode_cursor, encode_cursor
+
+        assert decode_cursor(encode_cursor("k", 3, 17)) == ["k", 3, 17]
+        for bad in ("", "!!", encode_cursor()):
+            with pytest.raises(ValueError):
+                decode_cursor(bad)
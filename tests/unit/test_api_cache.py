@@ -0,0 +1,26 @@
+"""Tests for backend.api._cache — TTL cache of encoded responses."""
+
+from unittest.mock import patch
+
+from backend.api._cache import TTLCache
+
+
+class TestTTLCache:
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(ttl=2.0, maxsize=8)
+        with patch("backend.api._cache.time.monotonic", return_value=100.0):
+            cache.set("k", b"body")
+            assert cache.get("k") == b"body"
+        with patch("backend.api._cache.time.monotonic", return_value=102.0):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_oldest_entry_evicted_past_maxsize(self):
+        cache = TTLCache(ttl=60.0, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == 3
+        assert cache.get("c") == 4
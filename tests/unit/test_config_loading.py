@@ -1,23 +1,18 @@
 """Tests for registry.load_directory_configs() and load_all()."""
 
-import os
 import textwrap
 
 import pytest
 
 from backend.adapters.registry import ProjectRegistry
+from tests.conftest import REAL_CONFIGS_DIR
 
 
 class TestLoadDirectoryConfigs:
     def test_load_from_real_configs_dir(self):
         """Load from the actual configs/projects/ directory, verify both frameworks."""
         reg = ProjectRegistry()
-        configs_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "configs",
-            "projects",
-        )
-        reg.load_directory_configs(configs_dir)
+        reg.load_directory_configs(REAL_CONFIGS_DIR)
 
         assert reg.get("openevolve") is not None
         assert reg.get("shinkaevolve") is not None
@@ -93,17 +88,44 @@ class TestLoadDirectoryConfigs:
         assert reg.get("dummy").display_name == "Dummy"
 
 
+    def test_unchanged_file_is_executed_once(self, tmp_path):
+        """Reloading reuses the config; editing the file loads it afresh."""
+        counter = tmp_path / "runs.txt"
+        path = tmp_path / "counted.py"
+
+        def write(display_name):
+            path.write_text(textwrap.dedent(f"""\
+                with open({str(counter)!r}, "a") as f:
+                    f.write("x")
+                from tests.conftest import MockAdapter
+                PROJECT_CONFIG = {{
+                    "name": "counted",
+                    "adapter_class": MockAdapter,
+                    "detect": lambda p: False,
+                    "glob_patterns": [],
+                    "display_name": {display_name!r},
+                }}
+            """))
+
+        write("First")
+        reg = ProjectRegistry()
+        reg.load_directory_configs(str(tmp_path))
+        first = reg.get("counted")
+        ProjectRegistry().load_directory_configs(str(tmp_path))
+        reg.load_directory_configs(str(tmp_path))
+        assert counter.read_text() == "x"
+        assert reg.get("counted") is first
+
+        write("Second, edited")
+        reg.load_directory_configs(str(tmp_path))
+        assert counter.read_text() == "xx"
+        assert reg.get("counted").display_name == "Second, edited"
+
+
 class TestLoadAll:
-    def test_load_all_integrates(self):
+    def test_load_all_integrates(self, real_registry):
         """load_all with the real configs/projects/ directory registers both frameworks."""
-        reg = ProjectRegistry()
-        configs_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "configs",
-            "projects",
-        )
-        reg.load_all(projects_dir=configs_dir)
-        names = set(reg.all_configs().keys())
+        names = set(real_registry.all_configs().keys())
         assert "openevolve" in names
         assert "shinkaevolve" in names
 
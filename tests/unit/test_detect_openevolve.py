@@ -2,6 +2,7 @@
 
 import json
 import os
+from unittest.mock import patch
 
 import pytest
 
@@ -36,6 +37,12 @@ class TestDetectOpenEvolve:
         f.write_text("hello")
         assert _detect_openevolve(str(f)) is False
 
+    def test_rejects_file_named_like_checkpoint(self, tmp_path):
+        """A file named like a checkpoint dir is rejected."""
+        f = tmp_path / "checkpoint_0"
+        f.write_text("{}")
+        assert _detect_openevolve(str(f)) is False
+
     def test_rejects_empty_dir(self, tmp_path):
         """An empty directory is rejected."""
         assert _detect_openevolve(str(tmp_path)) is False
@@ -57,6 +64,37 @@ class TestDetectOpenEvolve:
         (sub / "metadata.json").write_text("{}")
         assert _detect_openevolve(str(tmp_path)) is False
 
+    def test_ignores_symlinked_checkpoint_dir(self, tmp_path):
+        """Symlinked checkpoint dirs are not followed, matching discovery."""
+        real = tmp_path / "elsewhere" / "checkpoint_0"
+        real.mkdir(parents=True)
+        (real / "metadata.json").write_text("{}")
+        exp = tmp_path / "exp"
+        exp.mkdir()
+        os.symlink(real, exp / "checkpoint_0")
+        assert _detect_openevolve(str(exp)) is False
+
+
+class TestDetectCache:
+    def test_unchanged_directory_is_not_rescanned(self, tmp_path):
+        (tmp_path / "notes").mkdir()
+        assert _detect_openevolve(str(tmp_path)) is False
+        with patch("os.scandir", side_effect=AssertionError("rescanned")):
+            assert _detect_openevolve(str(tmp_path)) is False
+
+        cp = tmp_path / "checkpoint_0"
+        cp.mkdir()  # bumps tmp_path's mtime
+        (cp / "metadata.json").write_text("{}")
+        assert _detect_openevolve(str(tmp_path)) is True
+
+    def test_checkpoint_awaiting_metadata_is_rechecked(self, tmp_path):
+        """metadata.json landing in checkpoint_N doesn't touch the parent's mtime."""
+        cp = tmp_path / "checkpoint_0"
+        cp.mkdir()
+        assert _detect_openevolve(str(tmp_path)) is False
+        (cp / "metadata.json").write_text("{}")
+        assert _detect_openevolve(str(tmp_path)) is True
+
 
 class TestResolveOpenEvolvePath:
     def test_resolve_path_from_checkpoint(self, tmp_path):
@@ -0,0 +1,397 @@
+"""Tests for backend.adapters.openevolve_adapter — checkpoint loading and queries."""
+
+import json
+import os
+import pickle
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.adapters import openevolve_adapter
+from backend.adapters.openevolve_adapter import OpenEvolveAdapter, _read_json, _read_jsonl
+
+
+def _write_program(programs_dir, pid, **fields):
+    prog = {"id": pid, "code": f"# {pid}", "generation": 0, "metrics": {}, **fields}
+    (programs_dir / f"{pid}.json").write_text(json.dumps(prog))
+
+
+@pytest.fixture
+def oe_experiment(tmp_path):
+    """An OpenEvolve experiment with a small lineage in checkpoint_1.
+
+    p0 -> p1 -> p3
+       -> p2
+    """
+    exp = tmp_path / "exp"
+    cp = exp / "checkpoints" / "checkpoint_1"
+    programs = cp / "programs"
+    programs.mkdir(parents=True)
+    _write_program(programs, "p0", metrics={"a": 0.1}, timestamp=100.0)
+    _write_program(programs, "p1", parent_id="p0", generation=1,
+                   metrics={"a": 0.4, "b": float("nan")}, timestamp=160.0)
+    _write_program(programs, "p2", parent_id="p0", generation=1,
+                   metrics={"a": 0.2}, timestamp=170.0)
+    _write_program(programs, "p3", parent_id="p1", generation=2,
+                   metrics={"a": 0.9}, timestamp=220.0,
+                   prompts={"diff_user": {"system": "s", "user": "u", "responses": ["r"]}},
+                   artifacts_json='{"stdout": "ok"}')
+    (cp / "metadata.json").write_text(json.dumps({
+        "best_program_id": "p3",
+        "islands": [["p0", "p1", "p3"], ["p2"]],
+        "archive": ["p3"],
+        "last_iteration": 3,
+    }))
+    return str(exp)
+
+
+class TestLoadCheckpoint:
+    def test_loads_programs_and_metadata(self, oe_experiment):
+        adapter = OpenEvolveAdapter(oe_experiment)
+        info = adapter.get_experiment_info()
+        assert info.total_programs == 4
+        assert info.best_score == pytest.approx(0.9)
+        assert info.num_islands == 2
+        assert info.current_generation == 2
+
+    def test_non_finite_metrics_are_sanitized(self, oe_experiment):
+        """Files with NaN literals still load; the NaN becomes None."""
+        prog = OpenEvolveAdapter(oe_experiment).get_program("p1")
+        assert prog.metrics == {"a": 0.4, "b": None}
+        assert prog.score == pytest.approx(0.4)
+        assert prog.island_id == 0
+
+    def test_programs_reused_until_checkpoint_changes(self, oe_experiment):
+        adapter = OpenEvolveAdapter(oe_experiment)
+        first, _ = adapter.get_programs(sort_by="score")
+        again, _ = adapter.get_programs(sort_by="generation")
+        assert {id(p) for p in first} == {id(p) for p in again}
+
+        cp = os.path.join(oe_experiment, "checkpoints", "checkpoint_1")
+        with open(os.path.join(cp, "programs", "p4.json"), "w") as f:
+            json.dump({"id": "p4", "parent_id": "p3", "generation": 3, "metrics": {"a": 1.0}}, f)
+        meta_path = os.path.join(cp, "metadata.json")
+        st = os.stat(meta_path)
+        os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        progs, total = adapter.get_programs(sort_by="score")
+        assert total == 5
+        assert progs[0].id == "p4"
+        assert {p.id: p.children_count for p in progs}["p3"] == 1
+
+    def test_reload_mid_query_keeps_one_snapshot(self, oe_experiment, monkeypatch):
+        """A reload between reading the rows and the sort keys doesn't mix two loads."""
+        adapter = OpenEvolveAdapter(oe_experiment)
+        adapter.get_experiment_info()
+        cp = os.path.join(oe_experiment, "checkpoints", "checkpoint_1")
+        sort_column = OpenEvolveAdapter._sort_column
+
+        def reload_first(self, snap, sort_by):
+            with open(os.path.join(cp, "programs", "p4.json"), "w") as f:
+                json.dump({"id": "p4", "parent_id": "p3", "generation": 3, "metrics": {"a": 1.0}}, f)
+            meta_path = os.path.join(cp, "metadata.json")
+            st = os.stat(meta_path)
+            os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert self._ensure_cache() is not snap
+            return sort_column(self, snap, sort_by)
+
+        monkeypatch.setattr(OpenEvolveAdapter, "_sort_column", reload_first)
+        progs, total = adapter.get_programs(sort_by="score")
+        assert (total, [p.id for p in progs]) == (4, ["p3", "p1", "p2", "p0"])
+        monkeypatch.undo()
+
+        # The old load's sort keys and summaries didn't leak into the new one
+        progs, total = adapter.get_programs(sort_by="score")
+        assert (total, progs[0].id) == (5, "p4")
+        assert {p.id: p.children_count for p in progs}["p3"] == 1
+
+    def test_picks_up_newer_checkpoint(self, oe_experiment):
+        adapter = OpenEvolveAdapter(oe_experiment)
+        assert adapter.get_experiment_info().total_programs == 4
+
+        cp2 = os.path.join(oe_experiment, "checkpoints", "checkpoint_2")
+        os.makedirs(os.path.join(cp2, "programs"))
+        with open(os.path.join(cp2, "metadata.json"), "w") as f:
+            json.dump({"islands": []}, f)
+        st = os.stat(os.path.join(oe_experiment, "checkpoints", "checkpoint_1"))
+        os.utime(cp2, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        assert adapter.get_experiment_info().total_programs == 0
+
+    def test_corrupt_program_file_is_skipped(self, oe_experiment):
+        programs = os.path.join(oe_experiment, "checkpoints", "checkpoint_1", "programs")
+        with open(os.path.join(programs, "bad.json"), "w") as f:
+            f.write("{not json")
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 4
+
+    def test_search_code_case_insensitive(self, oe_experiment):
+        adapter = OpenEvolveAdapter(oe_experiment)
+        assert [p.id for p in adapter.search_code("# P3")] == ["p3"]
+        assert len(adapter.search_code("#", max_results=2)) == 2
+        assert adapter.search_code("nothing like this") == []
+
+
+class TestWatching:
+    def test_events_invalidate_instead_of_stat(self, oe_experiment, monkeypatch):
+        if not openevolve_adapter.HAS_WATCHDOG:
+            pytest.skip("watchdog not installed")
+        adapter = OpenEvolveAdapter(oe_experiment)
+        assert adapter.start_watching()
+        assert adapter.get_experiment_info().total_programs == 4
+
+        # While clean, no filesystem checks are made at all
+        def no_stat(path):
+            raise AssertionError("stat on a clean cache")
+        monkeypatch.setattr(openevolve_adapter, "_mtime_ns", no_stat)
+        assert len(adapter.get_all_programs_brief()) == 4
+        monkeypatch.undo()
+
+        cp = os.path.join(oe_experiment, "checkpoints", "checkpoint_1")
+        with open(os.path.join(cp, "programs", "p4.json"), "w") as f:
+            json.dump({"id": "p4", "generation": 3, "metrics": {"a": 1.0}}, f)
+        meta_path = os.path.join(cp, "metadata.json")
+        st = os.stat(meta_path)
+        os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        deadline = time.monotonic() + 5
+        while not adapter._dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert adapter.get_experiment_info().total_programs == 5
+
+
+class TestConcurrency:
+    def test_queries_on_threads_during_reloads(self, oe_experiment):
+        """Worker-thread calls racing reloads each see one consistent load."""
+        adapter = OpenEvolveAdapter(oe_experiment)
+        cp = os.path.join(oe_experiment, "checkpoints", "checkpoint_1")
+        meta_path = os.path.join(cp, "metadata.json")
+        stop = threading.Event()
+
+        def query():
+            while not stop.is_set():
+                progs, total = adapter.get_programs(sort_by="children_count", page_size=100)
+                assert len(progs) == total
+                assert len({p.id for p in progs}) == total
+                m = adapter.get_metrics()
+                assert len(m.score_distribution) == m.total_programs
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(query) for _ in range(4)]
+            try:
+                for i in range(4, 40):
+                    with open(os.path.join(cp, "programs", f"p{i}.json"), "w") as f:
+                        json.dump({"id": f"p{i}", "parent_id": f"p{i - 1}", "generation": i,
+                                   "metrics": {"a": i / 100}}, f)
+                    st = os.stat(meta_path)
+                    os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+                    time.sleep(0.002)
+            finally:
+                stop.set()
+            for fut in futures:
+                fut.result()
+        assert adapter.get_programs()[1] == 40
+
+
+class TestParsedCache:
+    def test_restart_loads_from_parsed_cache(self, oe_experiment, tmp_path, monkeypatch):
+        monkeypatch.setattr(openevolve_adapter, "PARSED_CACHE_DIR", str(tmp_path / "cache"))
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 4
+
+        # With the program files gone, a fresh adapter can only get them from the cache
+        programs = os.path.join(oe_experiment, "checkpoints", "checkpoint_1", "programs")
+        for name in os.listdir(programs):
+            os.unlink(os.path.join(programs, name))
+        assert OpenEvolveAdapter(oe_experiment).get_program("p1").score == pytest.approx(0.4)
+
+        meta_path = os.path.join(programs, os.pardir, "metadata.json")
+        st = os.stat(meta_path)
+        os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 0
+
+    @pytest.mark.parametrize("payload", [["not", "a", "dict"], {"version": None}, None])
+    def test_malformed_cache_is_a_miss(self, oe_experiment, tmp_path, monkeypatch, payload):
+        monkeypatch.setattr(openevolve_adapter, "PARSED_CACHE_DIR", str(tmp_path / "cache"))
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 4
+        for name in os.listdir(tmp_path / "cache"):
+            with open(tmp_path / "cache" / name, "wb") as f:
+                pickle.dump(payload, f)
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 4
+
+    def test_cache_dir_is_owner_only(self, oe_experiment, tmp_path, monkeypatch):
+        monkeypatch.setattr(openevolve_adapter, "PARSED_CACHE_DIR", str(tmp_path / "cache"))
+        OpenEvolveAdapter(oe_experiment).get_experiment_info()
+        assert stat.S_IMODE(os.stat(tmp_path / "cache").st_mode) & 0o077 == 0
+
+    @pytest.mark.parametrize("target", ["dir", "file"])
+    def test_cache_writable_by_others_is_ignored(self, oe_experiment, tmp_path, monkeypatch, target):
+        cache = tmp_path / "cache"
+        monkeypatch.setattr(openevolve_adapter, "PARSED_CACHE_DIR", str(cache))
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 4
+        paths = [cache] if target == "dir" else [cache / name for name in os.listdir(cache)]
+        for path in paths:
+            os.chmod(path, 0o777 if target == "dir" else 0o666)
+
+        # A trusted cache would still report 4 programs after the files are gone
+        programs = os.path.join(oe_experiment, "checkpoints", "checkpoint_1", "programs")
+        for name in os.listdir(programs):
+            os.unlink(os.path.join(programs, name))
+        assert OpenEvolveAdapter(oe_experiment).get_experiment_info().total_programs == 0
+
+    def test_empty_cache_dir_disables(self, oe_experiment, monkeypatch):
+        monkeypatch.setattr(openevolve_adapter, "PARSED_CACHE_DIR", "")
+        assert openevolve_adapter._parsed_cache_path(oe_experiment) is None
+
+
+class TestAggregates:
+    def test_get_metrics(self, oe_experiment):
+        m = OpenEvolveAdapter(oe_experiment).get_metrics()
+        assert m.total_programs == 4
+        assert m.best_score == pytest.approx(0.9)
+        assert m.mean_score == pytest.approx(0.4)
+        assert [(p.generation, p.value) for p in m.best_score_history] == [
+            (0, pytest.approx(0.1)), (1, pytest.approx(0.4)), (2, pytest.approx(0.9)),
+        ]
+        assert [p.value for p in m.per_island_best[1]] == [pytest.approx(0.2)]
+        assert m.time_elapsed == pytest.approx(120.0)
+
+    def test_get_islands(self, oe_experiment):
+        islands, migrations = OpenEvolveAdapter(oe_experiment).get_islands()
+        assert [i.best_program_id for i in islands] == ["p3", "p2"]
+        assert migrations == []
+
+    def test_get_lineage_and_best_path(self, oe_experiment):
+        tree = OpenEvolveAdapter(oe_experiment).get_lineage()
+        assert tree.root_ids == ["p0"]
+        assert sorted(tree.nodes["p0"].children) == ["p1", "p2"]
+        assert tree.best_path == ["p0", "p1", "p3"]
+
+        sub = OpenEvolveAdapter(oe_experiment).get_lineage("p1")
+        assert set(sub.nodes) == {"p1", "p3"}
+
+    def test_get_programs_children_and_archive(self, oe_experiment):
+        progs, total = OpenEvolveAdapter(oe_experiment).get_programs(sort_by="score")
+        assert total == 4
+        assert [p.id for p in progs] == ["p3", "p1", "p2", "p0"]
+        by_id = {p.id: p for p in progs}
+        assert by_id["p0"].children_count == 2
+        assert by_id["p3"].in_archive is True
+
+        archived, total = OpenEvolveAdapter(oe_experiment).get_programs(archive_only=True)
+        assert (total, [p.id for p in archived]) == (1, ["p3"])
+
+    def test_list_views_skip_prompts_and_artifacts(self, oe_experiment):
+        adapter = OpenEvolveAdapter(oe_experiment)
+        listed = {p.id: p for p in adapter.get_programs()[0]}
+        assert not hasattr(listed["p3"], "prompts")
+        assert not hasattr(listed["p3"], "code")
+        assert adapter.search_code("# p3")[0].llm_response is None
+
+        detail = adapter.get_program("p3")
+        assert detail.llm_response == "r"
+        assert detail.artifacts == {"stdout": "ok"}
+
+
+class TestSearch:
+    @pytest.fixture
+    def searchable(self, oe_experiment):
+        programs = os.path.join(oe_experiment, "checkpoints", "checkpoint_1", "programs")
+        codes = {
+            "p0": "def parse(x):\n    return x",
+            "p1": "def Parser(y):\n    return parse_all(y)",
+            "p2": "x = 2abc + parse(1)",
+            "p3": "print(parse (2))",
+        }
+        for pid, code in codes.items():
+            path = os.path.join(programs, f"{pid}.json")
+            with open(path) as f:
+                prog = json.load(f)
+            prog["code"] = code
+            with open(path, "w") as f:
+                json.dump(prog, f)
+        return OpenEvolveAdapter(oe_experiment)
+
+    @pytest.mark.parametrize("query, expected", [
+        (" parse(", ["p0", "p2"]),       # whole token: answered from the index
+        ("def parse", ["p0", "p1"]),     # token at the query's edge is a prefix
+        ("PARS", ["p0", "p1", "p2", "p3"]),
+        ("(2abc)", []),
+        (" 2abc ", ["p2"]),
+        ("return parse_all(", ["p1"]),
+    ])
+    def test_matches_linear_substring_scan(self, searchable, query, expected):
+        ids = [p.id for p in searchable.search_code(query)]
+        assert sorted(ids) == expected
+        # Same order as scanning every program
+        scan_order = [pid for pid in searchable._snapshot.programs if pid in expected]
+        assert ids == scan_order
+
+    def test_index_built_once_per_load(self, searchable):
+        searchable.search_code(" parse(")
+        index = searchable._snapshot.search_index
+        assert index is not None
+        searchable.search_code("x = 2abc + ")
+        assert searchable._snapshot.search_index is index
+        first = next(pid for pid in searchable._snapshot.programs if pid in ("p0", "p1"))
+        assert [p.id for p in searchable.search_code(" return ", max_results=1)] == [first]
+
+
+class TestTraces:
+    @pytest.fixture
+    def traced(self, oe_experiment):
+        traces = [
+            {"child_id": "p1", "parent_id": "p0", "island_id": 0, "timestamp": 160.0,
+             "child_metrics": {"a": 0.4}, "parent_metrics": {"a": 0.1}, "code_diff": "d1"},
+            {"child_id": "p2", "parent_id": "p0", "island_id": 1, "timestamp": 170.0,
+             "child_metrics": {"a": 0.05}, "parent_metrics": {"a": 0.1}, "code_diff": "d2"},
+            {"child_id": "p3", "parent_id": "p1", "island_id": 0, "timestamp": 220.0,
+             "child_metrics": {"a": 0.9}, "parent_metrics": {"a": 0.4}, "code_diff": "d3"},
+        ]
+        with open(os.path.join(oe_experiment, "evolution_trace.jsonl"), "w") as f:
+            f.write("\n".join(json.dumps(t) for t in traces))
+        return OpenEvolveAdapter(oe_experiment)
+
+    def test_program_gets_diff_from_trace(self, traced):
+        assert traced.get_program("p3").code_diff == "d3"
+        assert traced.get_program("p0").code_diff is None
+
+    def test_programs_by_ids_keep_order_and_diffs(self, traced):
+        progs = traced.get_programs_by_ids(["p3", "missing", "p0", "p1"])
+        assert [p.id for p in progs] == ["p3", "p0", "p1"]
+        assert [p.code_diff for p in progs] == ["d3", None, "d1"]
+
+    def test_conversations_filter_sort_and_page(self, traced):
+        entries, total = traced.get_conversations(page_size=2)
+        assert total == 3
+        assert [e.program_id for e in entries] == ["p3", "p2"]
+        assert entries[1].improvement_delta == pytest.approx(-0.05)
+
+        entries, total = traced.get_conversations(improvements_only=True, island_id=0)
+        assert (total, [e.program_id for e in entries]) == (2, ["p3", "p1"])
+
+
+class TestReadJson:
+    @pytest.mark.parametrize("nan", [False, True])
+    def test_large_file_with_and_without_nan(self, tmp_path, nan):
+        path = tmp_path / "big.json"
+        doc = {"code": "x" * (1 << 17), "metrics": {"a": float("nan") if nan else 1.0}}
+        path.write_text(json.dumps(doc))
+        loaded = _read_json(str(path))
+        assert loaded["code"] == doc["code"]
+        assert (loaded["metrics"]["a"] != loaded["metrics"]["a"]) is nan
+
+
+class TestReadJsonl:
+    def test_lines_spanning_chunks(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        records = [{"i": i, "pad": "x" * (i * 7)} for i in range(50)]
+        path.write_text("\n".join(json.dumps(r) for r in records))
+        assert _read_jsonl(str(path), chunk_size=64) == records
+
+    def test_skips_blank_and_corrupt_lines(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        path.write_text('{"a": 1}\r\n\n   \n{broken\n{"b": NaN}\n')
+        assert _read_jsonl(str(path))[0] == {"a": 1}
+        assert len(_read_jsonl(str(path))) == 2
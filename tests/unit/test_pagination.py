@@ -0,0 +1,20 @@
+"""Tests for backend.api._pagination."""
+
+from backend.api._pagination import paginate, total_pages
+from backend.models.api import ConversationListResponse
+
+
+class TestPagination:
+    def test_total_pages_rounds_up_and_keeps_one_empty_page(self):
+        assert total_pages(0, 50) == 1
+        assert total_pages(1, 50) == 1
+        assert total_pages(50, 50) == 1
+        assert total_pages(51, 50) == 2
+
+    def test_total_pages_exact_for_huge_totals(self):
+        total = 2**53 + 1
+        assert total_pages(total, 1) == total
+
+    def test_paginate_fills_response_fields(self):
+        resp = paginate(ConversationListResponse, [], 120, 3, 50)
+        assert (resp.total, resp.page, resp.page_size, resp.total_pages) == (120, 3, 50, 3)
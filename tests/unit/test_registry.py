@@ -2,11 +2,15 @@
 
 import os
 import json
+import sys
 
 import pytest
 
 from backend.adapters.registry import ProjectConfig, ProjectRegistry
 
+# backend.adapters re-exports the `registry` singleton under the module's name
+registry_module = sys.modules["backend.adapters.registry"]
+
 
 class TestRegisterAndGet:
     def test_register_and_get(self, fresh_registry, mock_project_config):
@@ -29,17 +33,37 @@ class TestRegisterAndGet:
         assert fresh_registry.get("mock") is replacement
 
 
+    def test_config_is_frozen_with_tuple_patterns(self, mock_adapter_class):
+        cfg = ProjectConfig(
+            name="frozen",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: False,
+            glob_patterns=["**/*.db"],
+        )
+        assert cfg.glob_patterns == ("**/*.db",)
+        with pytest.raises(AttributeError):
+            cfg.name = "other"
+
+
 class TestAllConfigs:
     def test_all_configs_empty(self, fresh_registry):
         assert fresh_registry.all_configs() == {}
 
-    def test_all_configs_returns_copy(self, fresh_registry, mock_project_config):
+    def test_all_configs_is_read_only_snapshot(self, fresh_registry, mock_project_config, mock_adapter_class):
         fresh_registry.register(mock_project_config)
         configs = fresh_registry.all_configs()
         assert "mock" in configs
-        # Mutating the returned dict should not affect registry
-        configs.pop("mock")
+        with pytest.raises(TypeError):
+            configs["mock"] = None
         assert fresh_registry.get("mock") is not None
+        # Later registrations don't show up in an earlier snapshot
+        fresh_registry.register(ProjectConfig(
+            name="other",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+        assert list(configs) == ["mock"]
 
     def test_all_configs_multiple(self, fresh_registry, mock_adapter_class):
         for name in ("alpha", "beta", "gamma"):
@@ -103,6 +127,36 @@ class TestDetectFramework:
         assert result == "first"
 
 
+    def test_detect_framework_caches_matches_until_path_changes(self, fresh_registry, mock_adapter_class, tmp_path):
+        calls = []
+
+        def counting_detect(p):
+            calls.append(p)
+            return p.endswith("exp")
+
+        fresh_registry.register(ProjectConfig(
+            name="counted",
+            adapter_class=mock_adapter_class,
+            detect=counting_detect,
+            glob_patterns=[],
+        ))
+        exp = tmp_path / "exp"
+        exp.mkdir()
+        assert fresh_registry.detect_framework(str(exp)) == "counted"
+        assert fresh_registry.detect_framework(str(exp)) == "counted"
+        assert len(calls) == 1
+
+        st = os.stat(exp)
+        os.utime(exp, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert fresh_registry.detect_framework(str(exp)) == "counted"
+        assert len(calls) == 2
+
+        # Misses are probed every time
+        assert fresh_registry.detect_framework(str(tmp_path)) is None
+        assert fresh_registry.detect_framework(str(tmp_path)) is None
+        assert len(calls) == 4
+
+
 class TestCreateAdapter:
     def test_create_adapter(self, fresh_registry, mock_project_config):
         fresh_registry.register(mock_project_config)
@@ -165,6 +219,193 @@ class TestDiscoverExperiments:
         fresh_registry.discover_experiments(str(tmp_path))
         assert len(resolved_to) >= 1
 
+    def test_discover_skips_excluded_dirs(self, fresh_registry, mock_adapter_class, tmp_path):
+        for d in ("node_modules/pkg", "__pycache__", "exp"):
+            (tmp_path / d).mkdir(parents=True)
+            (tmp_path / d / "evo.db").write_bytes(b"")
+        # Only directories are excluded; a file of that name is still a candidate
+        (tmp_path / "exp" / "node_modules").write_bytes(b"")
+
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isfile,
+            glob_patterns=["**/*.db", "**/node_modules"],
+        ))
+        assert sorted(fresh_registry.discover_experiments(str(tmp_path))) == [
+            (str(tmp_path / "exp" / "evo.db"), "sqlite"),
+            (str(tmp_path / "exp" / "node_modules"), "sqlite"),
+        ]
+
+    def test_discover_multiple_frameworks_single_walk(self, fresh_registry, mock_adapter_class, tmp_path):
+        """Every config's patterns are matched in one walk; hidden dirs are skipped like glob."""
+        (tmp_path / "runs" / "a").mkdir(parents=True)
+        (tmp_path / "runs" / "a" / "evo.sqlite").write_bytes(b"")
+        (tmp_path / "top.db").write_bytes(b"")
+        (tmp_path / ".cache").mkdir()
+        (tmp_path / ".cache" / "hidden.db").write_bytes(b"")
+        cp = tmp_path / "oe" / "checkpoints" / "checkpoint_3"
+        cp.mkdir(parents=True)
+        (cp / "metadata.json").write_text("{}")
+
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isfile,
+            glob_patterns=["**/*.sqlite", "**/*.db"],
+        ))
+        fresh_registry.register(ProjectConfig(
+            name="checkpoints",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isdir,
+            glob_patterns=["**/checkpoint_*/metadata.json"],
+            resolve_experiment_path=lambda p: os.path.dirname(os.path.dirname(os.path.dirname(p))),
+        ))
+
+        results = sorted(fresh_registry.discover_experiments(str(tmp_path)))
+        assert results == sorted([
+            (str(tmp_path / "runs" / "a" / "evo.sqlite"), "sqlite"),
+            (str(tmp_path / "top.db"), "sqlite"),
+            (str(tmp_path / "oe"), "checkpoints"),
+        ])
+
+    def test_discover_entry_claimed_by_several_configs(self, fresh_registry, mock_adapter_class, tmp_path):
+        """An entry matching more than one config is offered to each of them."""
+        (tmp_path / "a.db").write_bytes(b"")
+        (tmp_path / "b.txt").write_bytes(b"")
+        for name, patterns in (("first", ["**/*.txt", "**/*.db"]), ("second", ["**/*.db"])):
+            fresh_registry.register(ProjectConfig(
+                name=name,
+                adapter_class=mock_adapter_class,
+                detect=lambda p, name=name: name == "second" or p.endswith(".txt"),
+                glob_patterns=patterns,
+            ))
+        assert sorted(fresh_registry.discover_experiments(str(tmp_path))) == [
+            (str(tmp_path / "a.db"), "second"),
+            (str(tmp_path / "b.txt"), "first"),
+        ]
+
+    def test_discover_dedups_symlinked_file(self, fresh_registry, mock_adapter_class, tmp_path):
+        """A symlink to an already-discovered file is reported only once."""
+        (tmp_path / "a.db").write_bytes(b"")
+        os.symlink(tmp_path / "a.db", tmp_path / "b.db")
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isfile,
+            glob_patterns=["**/*.db"],
+        ))
+        assert len(fresh_registry.discover_experiments(str(tmp_path))) == 1
+
+    def test_parallel_walk_matches_serial_walk(self, tmp_path):
+        """Walking top-level subtrees on a pool yields the same entries in the same order."""
+        for top in ("a", "b", "c"):
+            (tmp_path / top / "x" / "y").mkdir(parents=True)
+            (tmp_path / top / "x" / "y" / "f.db").write_bytes(b"")
+            (tmp_path / top / "g.db").write_bytes(b"")
+        (tmp_path / "top.db").write_bytes(b"")
+        serial_mtimes, parallel_mtimes = {}, {}
+        serial = list(registry_module._walk(str(tmp_path), dir_mtimes=serial_mtimes))
+        parallel = list(registry_module._walk_parallel(str(tmp_path), 4, dir_mtimes=parallel_mtimes))
+        assert parallel == serial
+        assert parallel_mtimes == serial_mtimes
+
+    def test_tree_unchanged_in_parallel_batches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry_module, "_PARALLEL_STAT_MIN", 2)
+        for i in range(6):
+            (tmp_path / f"d{i}").mkdir()
+        mtimes = {}
+        list(registry_module._walk(str(tmp_path), dir_mtimes=mtimes))
+        assert registry_module._tree_unchanged(mtimes, workers=3)
+        (tmp_path / "d4" / "new").write_bytes(b"")
+        assert not registry_module._tree_unchanged(mtimes, workers=3)
+
+    def test_dedup_key_without_inode_numbers(self, monkeypatch):
+        """Filesystems reporting st_ino == 0 fall back to path strings."""
+        no_inode = os.stat_result((0o100644, 0, 7, 1, 0, 0, 0, 0, 0, 0))
+        monkeypatch.setattr(os, "stat", lambda *a, **k: no_inode)
+        assert registry_module._path_key("/a/x.db") != registry_module._path_key("/a/y.db")
+
+    def test_discover_reuses_results_until_tree_changes(self, fresh_registry, mock_adapter_class, tmp_path):
+        """Repeat scans skip detect() unless a directory in the tree was modified."""
+        (tmp_path / "runs").mkdir()
+        (tmp_path / "runs" / "a.db").write_bytes(b"")
+        calls = []
+
+        def counting_detect(p):
+            calls.append(p)
+            return True
+
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=counting_detect,
+            glob_patterns=["**/*.db"],
+        ))
+        first = fresh_registry.discover_experiments(str(tmp_path))
+        assert fresh_registry.discover_experiments(str(tmp_path)) == first
+        assert len(calls) == 1
+
+        # A new file in a nested dir only changes that dir's mtime
+        (tmp_path / "runs" / "b.db").write_bytes(b"")
+        assert len(fresh_registry.discover_experiments(str(tmp_path))) == 2
+
+    def test_discover_rereads_only_changed_dirs(self, fresh_registry, mock_adapter_class, tmp_path, monkeypatch):
+        for d in ("a", "b", "c"):
+            (tmp_path / d).mkdir()
+            (tmp_path / d / f"{d}.db").write_bytes(b"")
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isfile,
+            glob_patterns=["**/*.db"],
+        ))
+        assert len(fresh_registry.discover_experiments(str(tmp_path))) == 3
+
+        listed = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            listed.append(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        (tmp_path / "b" / "new.db").write_bytes(b"")
+        assert len(fresh_registry.discover_experiments(str(tmp_path))) == 4
+        assert listed == [str(tmp_path / "b")]
+
+    def test_discover_uses_patterns_of_replacement_config(self, fresh_registry, mock_adapter_class, tmp_path):
+        """Re-registering a name swaps in the new config's compiled patterns."""
+        (tmp_path / "a.db").write_bytes(b"")
+        (tmp_path / "b.other").write_bytes(b"")
+        for pattern in ("**/*.db", "**/*.other"):
+            fresh_registry.register(ProjectConfig(
+                name="swap",
+                adapter_class=mock_adapter_class,
+                detect=os.path.isfile,
+                glob_patterns=[pattern],
+            ))
+        assert fresh_registry.discover_experiments(str(tmp_path)) == [
+            (str(tmp_path / "b.other"), "swap"),
+        ]
+
+    def test_discover_prunes_dirs_outside_literal_prefix(self, fresh_registry, mock_adapter_class, tmp_path):
+        """Patterns rooted at a literal dir only list that subtree."""
+        (tmp_path / "runs" / "exp_1" / "deep").mkdir(parents=True)
+        (tmp_path / "runs" / "exp_1" / "deep" / "a.db").write_bytes(b"")
+        (tmp_path / "other").mkdir()
+        (tmp_path / "other" / "b.db").write_bytes(b"")
+        fresh_registry.register(ProjectConfig(
+            name="sqlite",
+            adapter_class=mock_adapter_class,
+            detect=os.path.isfile,
+            glob_patterns=["runs/exp_*/**/*.db"],
+        ))
+        results = fresh_registry.discover_experiments(str(tmp_path))
+        assert results == [(str(tmp_path / "runs" / "exp_1" / "deep" / "a.db"), "sqlite")]
+        walked = fresh_registry._discovery_cache[str(tmp_path)][0]
+        assert str(tmp_path / "other") not in walked
+
     def test_discover_empty_dir(self, fresh_registry, mock_adapter_class, tmp_path):
         """No experiments in an empty directory."""
         cfg = ProjectConfig(
@@ -205,3 +446,76 @@ class TestGetFrameworkMetadata:
 
     def test_metadata_empty_registry(self, fresh_registry):
         assert fresh_registry.get_framework_metadata() == []
+
+    def test_metadata_cached_until_register(self, fresh_registry, mock_project_config, mock_adapter_class):
+        fresh_registry.register(mock_project_config)
+        first = fresh_registry.get_framework_metadata("/base")
+        assert fresh_registry.get_framework_metadata("/base") is first
+        assert fresh_registry.get_framework_metadata("/other") is not first
+
+        fresh_registry.register(ProjectConfig(
+            name="second",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: False,
+            glob_patterns=[],
+        ))
+        assert [m["name"] for m in fresh_registry.get_framework_metadata("/base")] == ["mock", "second"]
+
+
+class TestChangeDetection:
+    def _config(self, mock_adapter_class, **kwargs):
+        return ProjectConfig(
+            name="fw",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+            **kwargs,
+        )
+
+    def test_auto_is_the_default_and_resolves_to_watchdog(self, fresh_registry, mock_adapter_class, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry_module, "_detect_fs_type", lambda p: "ext4")
+        fresh_registry.register(self._config(mock_adapter_class))
+        assert fresh_registry.get("fw").change_detection == "auto"
+        assert fresh_registry.change_detection_for("fw", str(tmp_path)) == "watchdog"
+        assert fresh_registry.get_framework_metadata(str(tmp_path))[0]["change_detection"] == "watchdog"
+
+    def test_auto_polls_on_network_fs(self, fresh_registry, mock_adapter_class, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry_module, "_detect_fs_type", lambda p: "nfs4")
+        fresh_registry.register(self._config(mock_adapter_class))
+        assert fresh_registry.change_detection_for("fw", str(tmp_path)) == "poll"
+
+    def test_explicit_strategy_is_kept(self, fresh_registry, mock_adapter_class, monkeypatch):
+        monkeypatch.setattr(registry_module, "_detect_fs_type", lambda p: "nfs4")
+        fresh_registry.register(self._config(mock_adapter_class, change_detection="watchdog"))
+        assert fresh_registry.change_detection_for("fw", "/x") == "watchdog"
+        assert fresh_registry.change_detection_for("unknown", "/x") == "poll"
+
+    def test_detect_fs_type_reads_mountinfo(self, tmp_path):
+        if not os.path.exists("/proc/self/mountinfo"):
+            pytest.skip("no /proc/self/mountinfo")
+        assert registry_module._detect_fs_type(str(tmp_path))
+
+    def test_strategy_index_tracks_registrations(self, fresh_registry, mock_adapter_class):
+        assert dict(fresh_registry.strategy_index) == {}
+        fresh_registry.register(self._config(mock_adapter_class, change_detection="poll"))
+        fresh_registry.register(ProjectConfig(
+            name="auto_fw",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=[],
+        ))
+        assert dict(fresh_registry.strategy_index) == {"fw": "poll"}
+        with pytest.raises(TypeError):
+            fresh_registry.strategy_index["fw"] = "watchdog"
+
+    def test_matches_glob(self, fresh_registry, mock_adapter_class):
+        assert not fresh_registry.matches_glob("exp/evolution.db")
+        fresh_registry.register(ProjectConfig(
+            name="db_fw",
+            adapter_class=mock_adapter_class,
+            detect=lambda p: True,
+            glob_patterns=["**/*.db"],
+        ))
+        assert fresh_registry.matches_glob("evolution.db")
+        assert fresh_registry.matches_glob("a/b/evolution.db")
+        assert not fresh_registry.matches_glob("a/b/notes.txt")
@@ -0,0 +1,401 @@
+"""Tests for backend.adapters.shinka_adapter — SQLite queries."""
+
+import math
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from backend.adapters.shinka_adapter import ShinkaAdapter, _db_retry, _json_loads_safe
+from tests.conftest import SHINKA_SCHEMA, insert_shinka_program
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestArchive:
+    def test_archive_flags(self, shinka_db):
+        progs, total = ShinkaAdapter(shinka_db).get_programs(sort_by="score")
+        assert total == 4
+        assert [(p.id, p.in_archive) for p in progs] == [
+            ("p3", True), ("p1", False), ("p2", False), ("p0", False),
+        ]
+
+    def test_archive_set_reused_until_db_changes(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        first = adapter._get_archive_set()
+        assert adapter._get_archive_set() is first
+
+        conn = sqlite3.connect(shinka_db)
+        conn.execute("INSERT INTO archive VALUES ('p1')")
+        conn.commit()
+        conn.close()
+        _bump_mtime(shinka_db)
+
+        assert adapter._get_archive_set() == {"p1", "p3"}
+
+
+class TestConnection:
+    def test_connection_reused_per_thread(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        adapter.get_experiment_info()
+        conn = adapter._local.conn
+        adapter.get_metrics()
+        assert adapter._local.conn is conn
+
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(adapter._conn()))
+        t.start()
+        t.join()
+        assert seen[0] is not conn
+
+    def test_failed_query_reopens_connection(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        conn = adapter._conn()
+        with pytest.raises(sqlite3.OperationalError):
+            adapter._query("SELECT * FROM missing_table")
+        assert adapter._conn() is not conn
+        assert adapter.get_experiment_info().total_programs == 4
+
+
+    def test_retry_skips_programming_errors(self):
+        calls = []
+
+        @_db_retry
+        def bad_bind():
+            calls.append(1)
+            raise sqlite3.ProgrammingError("Error binding parameter 1")
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            bad_bind()
+        assert len(calls) == 1
+
+
+class TestEmbeddings:
+    def test_cosine_similarity_matrix(self, shinka_db):
+        data = ShinkaAdapter(shinka_db).get_embeddings()
+        assert data["program_ids"] == ["p3", "p1", "p2"]
+        assert data["similarity_matrix"] == [
+            [1.0, 0.7071, 0.7071],
+            [0.7071, 1.0, 0.0],
+            [0.7071, 0.0, 1.0],
+        ]
+
+
+class TestMetrics:
+    def test_aggregates(self, shinka_db):
+        m = ShinkaAdapter(shinka_db).get_metrics()
+        assert m.total_programs == 4
+        assert m.best_score == pytest.approx(0.9)
+        assert m.mean_score == pytest.approx(0.4)
+        assert m.median_score == pytest.approx(0.3)
+        assert m.current_generation == 2
+        assert m.time_elapsed == pytest.approx(120.0)
+        assert m.score_distribution == pytest.approx([0.1, 0.2, 0.4, 0.9])
+        assert [p.generation for p in m.best_score_history] == [0, 1, 2]
+        assert [p.value for p in m.best_score_history] == pytest.approx([0.1, 0.4, 0.9])
+        assert [p.value for p in m.mean_score_history] == pytest.approx([0.1, 0.3, 0.9])
+        assert {isl: [p.generation for p in pts] for isl, pts in m.per_island_best.items()} == {
+            0: [0, 1, 2], 1: [1]}
+
+    def test_non_finite_scores_count_as_zero(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        insert_shinka_program(conn, "p4", generation=3, combined_score=float("inf"), timestamp=230.0)
+        insert_shinka_program(conn, "p5", generation=3, combined_score=None, timestamp=240.0)
+        conn.commit()
+        conn.close()
+        m = ShinkaAdapter(shinka_db).get_metrics()
+        assert m.best_score == pytest.approx(0.9)
+        assert m.score_distribution[:2] == [0.0, 0.0]
+        assert m.mean_score_history[-1].value == 0.0
+
+    def test_empty_database(self, tmp_path):
+        db = tmp_path / "empty.sqlite"
+        conn = sqlite3.connect(db)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SHINKA_SCHEMA)
+        conn.close()
+        assert ShinkaAdapter(str(db)).get_metrics().total_programs == 0
+
+
+class TestIslands:
+    def test_island_summaries(self, shinka_db):
+        islands, migrations = ShinkaAdapter(shinka_db).get_islands()
+        assert [(i.island_id, i.program_count, i.best_program_id, i.current_generation)
+                for i in islands] == [(0, 3, "p3", 2), (1, 1, "p2", 1)]
+        assert islands[0].best_score == pytest.approx(0.9)
+        assert migrations == []
+
+
+class TestPrograms:
+    def test_raw_embedding_not_selected(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        assert "embedding," not in adapter._program_select() + ","
+        assert adapter.get_program("p3").embedding_2d is None
+
+    def test_schema_without_optional_columns(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        conn.execute("ALTER TABLE programs DROP COLUMN text_feedback")
+        conn.execute("ALTER TABLE programs DROP COLUMN embedding_pca_3d")
+        conn.commit()
+        conn.close()
+        adapter = ShinkaAdapter(shinka_db)
+        progs, total = adapter.get_programs()
+        assert total == 4
+        assert adapter.get_program("p1").text_feedback is None
+        assert [p.id for p in adapter.search_code("p3")] == ["p3"]
+
+    def test_search_matches_wildcards_literally(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        insert_shinka_program(conn, "p4", code="rate = 50% off\nmy_var = 1")
+        conn.commit()
+        conn.close()
+        adapter = ShinkaAdapter(shinka_db)
+        assert [p.id for p in adapter.search_code("50%")] == ["p4"]
+        assert [p.id for p in adapter.search_code("MY_VAR")] == ["p4"]
+        assert adapter.search_code("p_") == []
+        assert [p.id for p in adapter.search_code("%")] == ["p4"]
+
+    def test_list_pages_are_summaries(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        progs, _ = adapter.get_programs(sort_by="score")
+        assert progs and all(not hasattr(p, "code") for p in progs)
+        full = adapter.get_program(progs[0].id)
+        assert full.model_dump(include=set(type(progs[0]).model_fields)) == progs[0].model_dump()
+
+    def test_programs_by_ids_in_requested_order(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        progs = adapter.get_programs_by_ids(["p3", "nope", "p0", "p1"])
+        assert [p.id for p in progs] == ["p3", "p0", "p1"]
+        assert [p.in_archive for p in progs] == [True, False, False]
+        assert adapter.get_programs_by_ids([]) == []
+
+    def test_json_columns_decoded(self, shinka_db):
+        prog = ShinkaAdapter(shinka_db).get_program("p1")
+        assert prog.metadata["llm_result"] == {"model_name": "m1"}
+        assert prog.migration_history == []
+
+    def test_nan_literals_in_json_columns(self, shinka_db):
+        prog = ShinkaAdapter(shinka_db).get_program("p0")
+        assert prog.metrics["a"] == 0.1
+        assert math.isnan(prog.metrics["b"])
+
+    def test_pages_are_disjoint_on_ties(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        seen = []
+        for page in (1, 2, 3, 4):
+            progs, total = adapter.get_programs(page=page, page_size=1, sort_by="complexity")
+            seen += [p.id for p in progs]
+        assert total == 4
+        assert sorted(seen) == ["p0", "p1", "p2", "p3"]
+
+    def test_filters_and_order(self, shinka_db):
+        progs, total = ShinkaAdapter(shinka_db).get_programs(
+            sort_by="timestamp", sort_desc=False, island_id=0, generation_min=1)
+        assert total == 2
+        assert [p.id for p in progs] == ["p1", "p3"]
+
+
+def _walk(fetch, page_size):
+    """Concatenate every cursor page; also return how many pages it took."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        items, cursor = fetch(after=cursor, page_size=page_size)
+        ids += [getattr(i, "id", None) or i.program_id for i in items]
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+class TestCursorPaging:
+    def test_program_cursor_pages_match_offset_order(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        for desc in (True, False):
+            expected = [p.id for p in adapter.get_programs(sort_desc=desc)[0]]
+            ids, pages = _walk(
+                lambda **kw: adapter.get_programs_after(sort_desc=desc, **kw), 1,
+            )
+            assert ids == expected
+            assert pages == 4
+
+    def test_program_cursor_with_filters_and_other_sorts(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        ids, _ = _walk(lambda **kw: adapter.get_programs_after(generation_min=1, **kw), 2)
+        assert ids == [p.id for p in adapter.get_programs(generation_min=1)[0]]
+        # Sorts other than generation page by offset through get_programs
+        ids, _ = _walk(lambda **kw: adapter.get_programs_after(sort_by="score", **kw), 3)
+        assert ids == ["p3", "p1", "p2", "p0"]
+
+    def test_conversation_cursor_pages(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        ids, pages = _walk(adapter.get_conversations_after, 3)
+        assert ids == ["p3", "p2", "p1", "p0"]
+        assert pages == 2
+
+    def test_malformed_or_foreign_cursor_rejected(self, shinka_db):
+        from backend.adapters.base import encode_cursor
+
+        adapter = ShinkaAdapter(shinka_db)
+        with pytest.raises(ValueError):
+            adapter.get_programs_after(after="not-a-cursor")
+        with pytest.raises(ValueError):
+            adapter.get_conversations_after(after=encode_cursor("o", 2))
+
+
+class TestConversations:
+    def test_newest_first_with_parent_scores(self, shinka_db):
+        entries, total = ShinkaAdapter(shinka_db).get_conversations()
+        assert total == 4
+        assert [e.program_id for e in entries] == ["p3", "p2", "p1", "p0"]
+        assert entries[0].parent_score == pytest.approx(0.4)
+        assert entries[0].improvement_delta == pytest.approx(0.5)
+        assert entries[-1].parent_score == 0.0
+
+    def test_filters_and_pages_in_sql(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        insert_shinka_program(conn, "p4", parent_id="p3", generation=3, combined_score=0.5,
+                        timestamp=300.0)
+        conn.commit()
+        conn.close()
+        adapter = ShinkaAdapter(shinka_db)
+        entries, total = adapter.get_conversations(improvements_only=True, page_size=2)
+        assert total == 4
+        assert [e.program_id for e in entries] == ["p3", "p2"]
+        entries, total = adapter.get_conversations(improvements_only=True, page=2, page_size=2)
+        assert [e.program_id for e in entries] == ["p1", "p0"]
+
+        entries, total = adapter.get_conversations(island_id=1)
+        assert total == 1
+        assert entries[0].program_id == "p2"
+
+
+class TestAnalytics:
+    def test_costs_models_and_patches(self, shinka_db):
+        a = ShinkaAdapter(shinka_db).get_analytics()
+        assert a.total_api_cost == pytest.approx(1.75)
+        assert [(c.generation, c.cumulative_cost) for c in a.cost_time_series] == [
+            (0, 0), (1, 0.75), (2, 1.75)]
+        assert a.patch_type_distribution == {"diff": 2, "full": 1}
+        usage = {m.model_name: m for m in a.model_usage}
+        assert usage["m1"].total_uses == 2
+        assert usage["m1"].improvements == 2
+        assert usage["m1"].avg_score_delta == pytest.approx(0.4)
+        assert usage["m2"].avg_score_delta == pytest.approx(0.1)
+
+    def test_metadata_sqlite_cannot_parse(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        insert_shinka_program(conn, "p4", parent_id="p3", generation=3, combined_score=1.0,
+                        timestamp=300.0,
+                        metadata='{"api_costs": 2.0, "x": NaN, "model_name": "m2", '
+                                 '"llm_result": {"model_posteriors": {"m1": 0.25, "m2": 0.75}}}')
+        conn.commit()
+        conn.close()
+        a = ShinkaAdapter(shinka_db).get_analytics()
+        assert a.total_api_cost == pytest.approx(3.75)
+        assert {m.model_name: m.total_uses for m in a.model_usage} == {"m1": 2, "m2": 2}
+        assert a.model_posteriors_over_time[-1].posteriors == {"m1": 0.25, "m2": 0.75}
+
+
+class TestResultCache:
+    def test_reused_until_db_changes(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        metrics = adapter.get_metrics()
+        lineage = adapter.get_lineage()
+        assert adapter.get_metrics() is metrics
+        assert adapter.get_lineage() is lineage
+        assert adapter.get_lineage(program_id="p1") is not lineage
+
+        conn = sqlite3.connect(shinka_db)
+        insert_shinka_program(conn, "p4", parent_id="p3", generation=3, combined_score=1.0,
+                        timestamp=300.0)
+        conn.commit()
+        conn.close()
+        _bump_mtime(shinka_db)
+
+        assert adapter.get_metrics().total_programs == 5
+        assert "p4" in adapter.get_lineage().nodes
+
+
+class TestLineage:
+    def test_full_tree_and_best_path(self, shinka_db):
+        tree = ShinkaAdapter(shinka_db).get_lineage()
+        assert set(tree.nodes) == {"p0", "p1", "p2", "p3"}
+        assert tree.root_ids == ["p0"]
+        assert sorted(tree.nodes["p0"].children) == ["p1", "p2"]
+        assert tree.best_path == ["p0", "p1", "p3"]
+
+    def test_subtree(self, shinka_db):
+        tree = ShinkaAdapter(shinka_db).get_lineage(program_id="p1")
+        assert set(tree.nodes) == {"p1", "p3"}
+        assert tree.root_ids == ["p1"]
+        assert tree.nodes["p1"].children == ["p3"]
+        assert tree.best_path == ["p0", "p1", "p3"]
+
+    def test_unknown_program_returns_full_tree(self, shinka_db):
+        tree = ShinkaAdapter(shinka_db).get_lineage(program_id="nope")
+        assert len(tree.nodes) == 4
+        assert tree.root_ids == ["p0"]
+
+
+class TestBrief:
+    def test_brief_rows(self, shinka_db):
+        briefs = {b["id"]: b for b in ShinkaAdapter(shinka_db).get_all_programs_brief()}
+        assert briefs["p3"] == {
+            "id": "p3", "parent_id": "p1", "generation": 2, "island_id": 0,
+            "score": 0.9, "correct": True, "in_archive": True,
+            "children_count": 0, "complexity": 1.0,
+        }
+        assert briefs["p2"]["in_archive"] is False
+
+    def test_columns_match_brief(self, shinka_db):
+        adapter = ShinkaAdapter(shinka_db)
+        briefs = adapter.get_all_programs_brief()
+        columns = adapter.get_all_programs_columns()
+        assert columns == {key: [b[key] for b in briefs] for key in briefs[0]}
+        assert columns["in_archive"] == [False, False, False, True]
+
+    def test_brief_without_archive_table(self, shinka_db):
+        conn = sqlite3.connect(shinka_db)
+        conn.execute("DROP TABLE archive")
+        conn.commit()
+        conn.close()
+        briefs = ShinkaAdapter(shinka_db).get_all_programs_brief()
+        assert len(briefs) == 4
+        assert not any(b["in_archive"] for b in briefs)
+
+
+class TestSidecarFiles:
+    def test_config_reparsed_only_when_changed(self, shinka_db, tmp_path):
+        cfg = tmp_path / "config.yaml"
+        cfg.write_text("a: 1\n")
+        adapter = ShinkaAdapter(shinka_db)
+        first = adapter._load_config()
+        assert first in ({"a": 1}, {"raw": "a: 1\n"})
+        assert adapter._load_config() is first
+
+        cfg.write_text("a: 22\n")
+        assert adapter._load_config() is not first
+
+    def test_meta_files_track_new_files_and_sizes(self, shinka_db, tmp_path):
+        adapter = ShinkaAdapter(shinka_db)
+        (tmp_path / "meta_2.txt").write_text("")
+        assert [(m["generation"], m["size"]) for m in adapter.get_meta_files()] == [(2, 0)]
+
+        (tmp_path / "meta_2.txt").write_text("summary")
+        (tmp_path / "meta_10.txt").write_text("x")
+        _bump_mtime(str(tmp_path))
+        assert [(m["generation"], m["size"]) for m in adapter.get_meta_files()] == [
+            (10, 1), (2, 7)]
+
+
+class TestJsonColumns:
+    def test_short_values_decoded_once(self):
+        assert _json_loads_safe('{"k": [1, 2]}') is _json_loads_safe('{"k": [1, 2]}')
+
+    def test_bad_input_gives_default(self):
+        assert _json_loads_safe("{oops", []) == []
+        assert _json_loads_safe("{oops") == {}
+        assert _json_loads_safe(None, []) == []
@@ -0,0 +1,208 @@
+"""Tests for backend.api.websocket — ConnectionManager fan-out."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.api.websocket import ConnectionManager
+from backend.models.unified import EventType, UnifiedEvent
+
+
+class FakeSocket:
+    """Records sent frames; optionally stalls or fails on send."""
+
+    def __init__(self, fail=False, delay=0.0):
+        self.sent = []
+        self.sent_bytes = []
+        self.fail = fail
+        self.delay = delay
+
+    async def send_text(self, msg):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(msg)
+
+    async def send_bytes(self, data):
+        self.sent_bytes.append(data)
+
+
+async def _settle(mgr):
+    """Wait until every connection's writer has sent its queued frames."""
+    await asyncio.gather(*(queue.join() for queue, _ in list(mgr._outboxes.values())))
+
+
+def _event(eid="exp1"):
+    return UnifiedEvent(type=EventType.NEW_PROGRAM, experiment_id=eid,
+                        timestamp=1.0, data={"source": "test"})
+
+
+class TestBroadcast:
+    async def test_subscribers_and_wildcard_receive_one_frame(self):
+        mgr = ConnectionManager()
+        a, b, other = FakeSocket(), FakeSocket(), FakeSocket()
+        mgr.subscribe(a, "exp1")
+        mgr.subscribe(b, "*")
+        mgr.subscribe(other, "exp2")
+
+        await mgr.broadcast_immediate(_event())
+        await _settle(mgr)
+
+        assert len(a.sent) == len(b.sent) == 1
+        assert other.sent == []
+        assert json.loads(a.sent[0]) == {
+            "type": "new_program", "experiment_id": "exp1",
+            "timestamp": 1.0, "data": {"source": "test"},
+        }
+
+    async def test_failed_send_disconnects_only_that_socket(self):
+        mgr = ConnectionManager()
+        good, bad = FakeSocket(), FakeSocket(fail=True)
+        for ws in (good, bad):
+            mgr._all_connections.add(ws)
+            mgr.subscribe(ws, "exp1")
+
+        await mgr.broadcast_all(_event())
+        await _settle(mgr)
+
+        assert len(good.sent) == 1
+        assert bad not in mgr._all_connections
+        assert bad not in mgr._subscriptions["exp1"]
+
+    async def test_sends_overlap_across_slow_clients(self):
+        mgr = ConnectionManager()
+        socks = [FakeSocket(delay=0.05) for _ in range(10)]
+        for ws in socks:
+            mgr.subscribe(ws, "exp1")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await mgr.broadcast_immediate(_event())
+        await _settle(mgr)
+
+        assert loop.time() - start < 0.25
+        assert all(len(ws.sent) == 1 for ws in socks)
+
+
+class TestSendQueue:
+    async def test_stalled_client_drops_oldest_without_blocking_others(self):
+        mgr = ConnectionManager()
+        stalled, fast = FakeSocket(delay=60), FakeSocket()
+        mgr.subscribe(stalled, "exp1")
+        mgr.subscribe(fast, "exp1")
+
+        with patch("backend.api.websocket.WS_SEND_QUEUE_SIZE", 2):
+            for _ in range(5):
+                await mgr.broadcast_immediate(_event())
+                await asyncio.sleep(0)  # let the writers run
+            await mgr._outboxes[fast][0].join()
+
+        assert len(fast.sent) == 5
+        queue = mgr._outboxes[stalled][0]
+        # One frame is in flight; the queue keeps only the newest two
+        assert queue.qsize() == 2
+        assert mgr.dropped_events == 2
+
+        mgr.disconnect(stalled)
+        assert stalled not in mgr._outboxes
+        assert queue.empty()
+
+
+class TestBatching:
+    async def test_burst_is_coalesced_into_one_batch_frame(self):
+        mgr = ConnectionManager()
+        ws = FakeSocket()
+        mgr.subscribe(ws, "exp1")
+
+        for _ in range(3):
+            await mgr.broadcast(_event())
+        assert ws.sent == []
+        await mgr._flush_tasks["exp1"]
+        await _settle(mgr)
+
+        assert len(ws.sent) == 1
+        frame = json.loads(ws.sent[0])
+        assert frame["type"] == "batch"
+        assert frame["experiment_id"] == "exp1"
+        assert [e["type"] for e in frame["events"]] == ["new_program"] * 3
+        assert mgr._pending == {} and mgr._flush_tasks == {}
+
+    async def test_lone_event_goes_out_as_plain_frame(self):
+        mgr = ConnectionManager()
+        a, b = FakeSocket(), FakeSocket()
+        mgr.subscribe(a, "exp1")
+        mgr.subscribe(b, "exp2")
+
+        await mgr.broadcast(_event("exp1"))
+        await mgr.broadcast(_event("exp2"))
+        await asyncio.gather(*mgr._flush_tasks.values())
+        await _settle(mgr)
+
+        assert json.loads(a.sent[0])["experiment_id"] == "exp1"
+        assert json.loads(b.sent[0])["type"] == "new_program"
+
+
+class TestSubscriptions:
+    def test_fanout_snapshot_reused_until_subscriptions_change(self):
+        mgr = ConnectionManager()
+        a, b = FakeSocket(), FakeSocket()
+        mgr.subscribe(a, "exp1")
+        mgr.subscribe(a, "*")
+
+        first = mgr._subscribers("exp1")
+        assert first == (a,)
+        assert mgr._subscribers("exp1") is first
+
+        mgr.subscribe(b, "exp1")
+        assert set(mgr._subscribers("exp1")) == {a, b}
+
+        mgr.disconnect(b)
+        assert mgr._subscribers("exp1") == (a,)
+
+    def test_unsubscribe_drops_empty_experiments(self):
+        mgr = ConnectionManager()
+        ws = FakeSocket()
+        mgr.subscribe(ws, "exp1")
+        mgr.unsubscribe(ws, "exp1")
+        mgr.unsubscribe(ws, "never-subscribed")
+        assert mgr._subscriptions == {}
+        assert mgr._subscribers("exp1") == ()
+
+
+class TestFrameFormat:
+    def test_msgpack_request_falls_back_to_json_without_msgpack(self):
+        mgr = ConnectionManager()
+        ws = FakeSocket()
+        with patch("backend.api.websocket.HAS_MSGPACK", False):
+            assert mgr.subscribe(ws, "exp1", format="msgpack") == "json"
+        assert ws not in mgr._binary
+
+    async def test_msgpack_subscribers_get_binary_frames(self):
+        msgpack = pytest.importorskip("msgpack")
+        mgr = ConnectionManager()
+        text_ws, bin_ws = FakeSocket(), FakeSocket()
+        mgr.subscribe(text_ws, "exp1")
+        assert mgr.subscribe(bin_ws, "exp1", format="msgpack") == "msgpack"
+
+        await mgr.broadcast_immediate(_event())
+        await _settle(mgr)
+
+        assert text_ws.sent_bytes == [] and len(text_ws.sent) == 1
+        assert bin_ws.sent == []
+        assert msgpack.unpackb(bin_ws.sent_bytes[0])["experiment_id"] == "exp1"
+
+
+class TestControlFrames:
+    def test_templates_render_valid_json(self):
+        from backend.api import websocket as ws_mod
+
+        eid = 'odd "id"\\'
+        subscribed = json.loads(ws_mod._SUBSCRIBED_FRAME % (json.dumps(eid), "json", 1.5))
+        assert subscribed == {"type": "subscribed", "experiment_id": eid,
+                              "format": "json", "timestamp": 1.5}
+        now = 1700000000.123456
+        assert json.loads(ws_mod._PONG_FRAME % now) == {"type": "pong", "timestamp": now}
+        assert ws_mod._HEARTBEAT_FRAME % now == json.dumps({"type": "heartbeat", "timestamp": now})